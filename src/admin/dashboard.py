@@ -9,12 +9,15 @@ from src.common import (
     HeaderLabel, SubHeaderLabel, Card, StyledTable, 
     PrimaryButton, create_spacer, PCStatusWidget
 )
-from src.database import db, PC, Session, Order
+from src.database import db, PC, Session, Order, DashboardSnapshot, Heartbeat
 from src.utils.helpers import format_currency, format_time
 
 class DashboardTab(QWidget):
     """Dashboard tab for the admin panel."""
     
+    # Log a warning when the stats snapshot query takes longer than this
+    STATS_BUDGET_MS = 20
+    
     def __init__(self):
         """Initialize the dashboard tab."""
         super().__init__()
@@ -192,6 +195,12 @@ class DashboardTab(QWidget):
         self.pc_grid = QGridLayout()
         self.pc_grid.setSpacing(8)
         pc_sidebar_layout.addLayout(self.pc_grid)
+        self.pc_widgets = {}
+        
+        # Launchers that sent a heartbeat recently
+        self.launchers_label = QLabel("Launchers Online: -")
+        self.launchers_label.setAlignment(Qt.AlignCenter)
+        pc_sidebar_layout.addWidget(self.launchers_label)
         
         pc_sidebar_card.layout.addLayout(pc_sidebar_layout)
         right_sidebar.addWidget(pc_sidebar_card)
@@ -204,6 +213,16 @@ class DashboardTab(QWidget):
         main_content_layout.addLayout(right_sidebar, 3)  # 30% width
         
         main_layout.addLayout(main_content_layout)
+        
+        # Heartbeats are not change-tracked, so poll launcher liveness on its own
+        self.liveness_timer = QTimer(self)
+        self.liveness_timer.timeout.connect(self.refresh_launcher_status)
+        self.liveness_timer.start(Heartbeat.INTERVAL_SECONDS * 2000)
+    
+    def showEvent(self, event):
+        """Bring launcher liveness up to date when the dashboard is shown."""
+        super().showEvent(event)
+        self.refresh_launcher_status()
     
     def refresh_data(self):
         """Refresh all data in the dashboard."""
@@ -212,148 +231,56 @@ class DashboardTab(QWidget):
         self.refresh_activity_table()
     
     def refresh_stats(self):
-        """Refresh all statistics."""
-        self.refresh_pc_status()
-        self.refresh_sessions_data()
-        self.refresh_revenue_data()
-        self.refresh_registrations_data()
+        """Refresh all statistics from a single dashboard snapshot."""
+        try:
+            snapshot = DashboardSnapshot.get()
+        except Exception as e:
+            print(f"Error loading dashboard stats: {e}")
+            return
+        
+        if snapshot['query_ms'] > self.STATS_BUDGET_MS:
+            print(f"Dashboard stats took {snapshot['query_ms']:.1f} ms "
+                  f"(budget {self.STATS_BUDGET_MS} ms)")
+        
+        self.refresh_pc_status(snapshot)
+        self.refresh_sessions_data(snapshot)
+        self.refresh_revenue_data(snapshot)
+        self.refresh_registrations_data(snapshot)
     
-    def refresh_pc_status(self):
+    def refresh_pc_status(self, snapshot):
         """Refresh PC status statistics."""
-        cursor = db.get_cursor()
-        try:
-            # Get PC counts by status
-            query = """
-            SELECT 
-                SUM(CASE WHEN status = 'occupied' THEN 1 ELSE 0 END) as occupied,
-                SUM(CASE WHEN status = 'available' THEN 1 ELSE 0 END) as available,
-                SUM(CASE WHEN status = 'maintenance' THEN 1 ELSE 0 END) as maintenance
-            FROM pcs
-            """
-            cursor.execute(query)
-            result = cursor.fetchone()
-            
-            if result:
-                self.occupied_label.setText(f"Occupied: {result['occupied'] or 0}")
-                self.available_label.setText(f"Available: {result['available'] or 0}")
-                self.maintenance_label.setText(f"Maintenance: {result['maintenance'] or 0}")
-        finally:
-            cursor.close()
+        self.occupied_label.setText(f"Occupied: {snapshot['occupied_pcs']}")
+        self.available_label.setText(f"Available: {snapshot['available_pcs']}")
+        self.maintenance_label.setText(f"Maintenance: {snapshot['maintenance_pcs']}")
     
-    def refresh_sessions_data(self):
-        """Refresh active sessions data."""
-        cursor = db.get_cursor()
-        try:
-            # Get active sessions count (excluding walk-in customers)
-            query = """
-            SELECT COUNT(*) as count 
-            FROM sessions s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.status = 'active'
-            AND u.civil_id != 'WALK-IN'
-            """
-            cursor.execute(query)
-            result = cursor.fetchone()
-            
-            if result:
-                self.active_sessions_label.setText(f"Active Sessions: {result['count'] or 0}")
-            
-            # Get total play time (excluding walk-in customers)
-            query = """
-            SELECT SUM(s.duration_minutes) as total_minutes 
-            FROM sessions s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.status = 'active'
-            AND u.civil_id != 'WALK-IN'
-            """
-            cursor.execute(query)
-            result = cursor.fetchone()
-            
-            if result and result['total_minutes']:
-                hours = result['total_minutes'] // 60
-                minutes = result['total_minutes'] % 60
-                self.total_time_label.setText(f"Total Play Time: {hours}h {minutes}m")
-            else:
-                self.total_time_label.setText("Total Play Time: 0h 0m")
-        finally:
-            cursor.close()
+    def refresh_sessions_data(self, snapshot):
+        """Refresh active sessions data (walk-in customers excluded)."""
+        active_text = f"Active Sessions: {snapshot['active_sessions']}"
+        if snapshot['paused_sessions']:
+            active_text += f" ({snapshot['paused_sessions']} paused)"
+        self.active_sessions_label.setText(active_text)
+        
+        hours = snapshot['active_minutes'] // 60
+        minutes = snapshot['active_minutes'] % 60
+        self.total_time_label.setText(f"Total Play Time: {hours}h {minutes}m")
     
-    def refresh_revenue_data(self):
-        """Refresh revenue data."""
-        cursor = db.get_cursor()
-        try:
-            today = QDate.currentDate().toString(Qt.ISODate)
-            
-            # Get gaming revenue
-            query = """
-            SELECT SUM(payment_amount) as total 
-            FROM sessions 
-            WHERE DATE(start_time) = %s
-            """
-            cursor.execute(query, (today,))
-            result = cursor.fetchone()
-            
-            gaming_revenue = result['total'] or 0
-            self.gaming_revenue_label.setText(f"Gaming: {format_currency(gaming_revenue)}")
-            
-            # Get food & services revenue
-            query = """
-            SELECT SUM(total_amount) as total 
-            FROM orders 
-            WHERE DATE(order_time) = %s
-            """
-            cursor.execute(query, (today,))
-            result = cursor.fetchone()
-            
-            food_revenue = result['total'] or 0
-            self.food_revenue_label.setText(f"Food & Services: {format_currency(food_revenue)}")
-            
-            # Calculate total
-            total_revenue = gaming_revenue + food_revenue
-            self.total_revenue_label.setText(f"Total: {format_currency(total_revenue)}")
-        finally:
-            cursor.close()
+    def refresh_revenue_data(self, snapshot):
+        """Refresh today's revenue data."""
+        gaming_revenue = snapshot['gaming_revenue']
+        self.gaming_revenue_label.setText(f"Gaming: {format_currency(gaming_revenue)}")
+        
+        food_revenue = snapshot['food_revenue']
+        self.food_revenue_label.setText(f"Food & Services: {format_currency(food_revenue)}")
+        
+        # Calculate total
+        total_revenue = gaming_revenue + food_revenue
+        self.total_revenue_label.setText(f"Total: {format_currency(total_revenue)}")
     
-    def refresh_registrations_data(self):
+    def refresh_registrations_data(self, snapshot):
         """Refresh registrations data."""
-        cursor = db.get_cursor()
-        try:
-            today = QDate.currentDate().toString(Qt.ISODate)
-            
-            # Get today's registrations
-            query = """
-            SELECT COUNT(*) as count 
-            FROM users 
-            WHERE DATE(created_at) = %s
-            """
-            cursor.execute(query, (today,))
-            result = cursor.fetchone()
-            
-            self.today_registrations_label.setText(f"Today: {result['count'] or 0}")
-            
-            # Get this week's registrations
-            query = """
-            SELECT COUNT(*) as count 
-            FROM users 
-            WHERE YEARWEEK(created_at, 1) = YEARWEEK(CURDATE(), 1)
-            """
-            cursor.execute(query)
-            result = cursor.fetchone()
-            
-            self.week_registrations_label.setText(f"This Week: {result['count'] or 0}")
-            
-            # Get this month's registrations
-            query = """
-            SELECT COUNT(*) as count 
-            FROM users 
-            WHERE YEAR(created_at) = YEAR(CURDATE()) AND MONTH(created_at) = MONTH(CURDATE())
-            """
-            cursor.execute(query)
-            result = cursor.fetchone()
-            
-            self.month_registrations_label.setText(f"This Month: {result['count'] or 0}")
-        finally:
-            cursor.close()
+        self.today_registrations_label.setText(f"Today: {snapshot['registrations_today']}")
+        self.week_registrations_label.setText(f"This Week: {snapshot['registrations_week']}")
+        self.month_registrations_label.setText(f"This Month: {snapshot['registrations_month']}")
     
     def refresh_pc_grid(self):
         """Refresh PC grid."""
@@ -364,6 +291,8 @@ class DashboardTab(QWidget):
             if widget:
                 widget.deleteLater()
         
+        self.pc_widgets = {}
+        
         # Get all PCs
         pcs = PC.get_all()
         
@@ -390,6 +319,7 @@ class DashboardTab(QWidget):
             # Create a smaller PC status widget
             pc_widget = PCStatusWidget(pc.pc_number, pc.status, pc_users.get(pc.pc_number, ""))
             pc_widget.setFixedSize(60, 60)  # Smaller size for sidebar
+            self.pc_widgets[pc.pc_number] = pc_widget
             # pc_widget.clicked.connect(self.on_pc_clicked)
             
             self.pc_grid.addWidget(pc_widget, row, col)
@@ -398,6 +328,26 @@ class DashboardTab(QWidget):
             if col >= max_cols:
                 col = 0
                 row += 1
+        
+        self.refresh_launcher_status()
+    
+    def refresh_launcher_status(self):
+        """Mark each PC's launcher online or offline from its last heartbeat."""
+        if not self.pc_widgets or not self.isVisible():
+            return
+        try:
+            liveness = Heartbeat.get_liveness()
+        except Exception as e:
+            print(f"Error loading launcher status: {e}")
+            return
+        
+        online = 0
+        for pc_number, pc_widget in self.pc_widgets.items():
+            seconds_ago = liveness.get(pc_number)
+            is_online = seconds_ago is not None and seconds_ago <= Heartbeat.OFFLINE_AFTER_SECONDS
+            pc_widget.set_launcher_online(is_online, seconds_ago)
+            online += is_online
+        self.launchers_label.setText(f"Launchers Online: {online}/{len(self.pc_widgets)}")
     
     def refresh_activity_table(self):
         """Refresh recent activity table."""
@@ -9,6 +9,7 @@ from PyQt5.QtGui import QPixmap, QImage, QFont, QIcon, QPainter, QPen, QColor
 import os
 from datetime import datetime
 from src.database import Game, db
+from src.common import KeyedTableSync
 
 class GameDialog(QDialog):
     def __init__(self, parent=None, game_data=None):
@@ -218,6 +219,17 @@ class GamesTab(QWidget):
                 font-weight: bold;
             }
         """)
+        # Rows are diffed by game ID so refreshes only touch what changed
+        self.table_sync = KeyedTableSync(
+            self.table,
+            key=lambda game: game.id,
+            render=self.game_cells,
+            widgets={
+                0: (self.create_image_preview, lambda game: game.image_path),
+                5: (self.create_game_actions, lambda game: None),
+            }
+        )
+        
         layout.addWidget(self.table)
     
     
@@ -230,75 +242,76 @@ class GamesTab(QWidget):
             self.games = []
     
     def refresh_table(self):
-        self.table.setRowCount(len(self.games))
+        self.table_sync.update(self.games)
+    
+    def game_cells(self, game):
+        # Column 0 holds the image preview widget
+        return [
+            None,
+            game.name or "",
+            game.description or "",
+            game.category or "",
+            game.executable_path or "",
+        ]
+    
+    def create_image_preview(self, game):
+        image_label = QLabel()
+        if game.image_path and os.path.exists(game.image_path):
+            pixmap = QPixmap(game.image_path)
+            scaled_pixmap = pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            image_label.setPixmap(scaled_pixmap)
+        image_label.setAlignment(Qt.AlignCenter)
+        return image_label
+    
+    def create_game_actions(self, game):
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(5, 5, 5, 5)
+        actions_layout.setSpacing(10)
+        actions_layout.setAlignment(Qt.AlignCenter)
+        
+        edit_button = QPushButton("Edit")
+        edit_button.setMinimumWidth(70)
+        edit_button.setStyleSheet("""
+            QPushButton {
+                background-color: #00c3ff;
+                color: white;
+                border: none;
+                border-radius: 3px;
+                padding: 8px 15px;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background-color: #00a5eb;
+            }
+        """)
+        edit_button.clicked.connect(lambda checked, game_id=game.id: self.edit_game(game_id))
         
-        for row, game in enumerate(self.games):
-            # Image preview
-            image_label = QLabel()
-            if game.image_path and os.path.exists(game.image_path):
-                pixmap = QPixmap(game.image_path)
-                scaled_pixmap = pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label.setPixmap(scaled_pixmap)
-            image_label.setAlignment(Qt.AlignCenter)
-            self.table.setCellWidget(row, 0, image_label)
-            
-            # Game name
-            self.table.setItem(row, 1, QTableWidgetItem(game.name or ""))
-            
-            # Description
-            self.table.setItem(row, 2, QTableWidgetItem(game.description or ""))
-            
-            # Game type
-            self.table.setItem(row, 3, QTableWidgetItem(game.category or ""))
-            
-            # Path
-            self.table.setItem(row, 4, QTableWidgetItem(game.executable_path or ""))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(5, 5, 5, 5)
-            actions_layout.setSpacing(10)
-            actions_layout.setAlignment(Qt.AlignCenter)
-            
-            edit_button = QPushButton("Edit")
-            edit_button.setMinimumWidth(70)
-            edit_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #00c3ff;
-                    color: white;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 8px 15px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #00a5eb;
-                }
-            """)
-            edit_button.clicked.connect(lambda checked, r=row: self.edit_game(r))
-            
-            delete_button = QPushButton("Delete")
-            delete_button.setMinimumWidth(70)
-            delete_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #ff4444;
-                    color: white;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 8px 15px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #ff2222;
-                }
-            """)
-            delete_button.clicked.connect(lambda checked, r=row: self.delete_game(r))
-            
-            actions_layout.addWidget(edit_button)
-            actions_layout.addWidget(delete_button)
-            
-            self.table.setCellWidget(row, 5, actions_widget)
+        delete_button = QPushButton("Delete")
+        delete_button.setMinimumWidth(70)
+        delete_button.setStyleSheet("""
+            QPushButton {
+                background-color: #ff4444;
+                color: white;
+                border: none;
+                border-radius: 3px;
+                padding: 8px 15px;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background-color: #ff2222;
+            }
+        """)
+        delete_button.clicked.connect(lambda checked, game_id=game.id: self.delete_game(game_id))
+        
+        actions_layout.addWidget(edit_button)
+        actions_layout.addWidget(delete_button)
+        
+        return actions_widget
+    
+    def get_game(self, game_id):
+        """Find a loaded game by ID."""
+        return next((game for game in self.games if game.id == game_id), None)
     
     def add_game(self):
         dialog = GameDialog(self)
@@ -324,8 +337,10 @@ class GamesTab(QWidget):
                 db.rollback()
                 QMessageBox.warning(self, "Error", f"Failed to add game: {str(e)}")
     
-    def edit_game(self, row):
-        game = self.games[row]
+    def edit_game(self, game_id):
+        game = self.get_game(game_id)
+        if game is None:
+            return
         dialog = GameDialog(self, game)
         if dialog.exec_() == QDialog.Accepted:
             try:
@@ -352,7 +367,7 @@ class GamesTab(QWidget):
                 db.rollback()
                 QMessageBox.warning(self, "Error", f"Failed to update game: {str(e)}")
     
-    def delete_game(self, row):
+    def delete_game(self, game_id):
         reply = QMessageBox.question(
             self, "Confirm Delete",
             "Are you sure you want to delete this game?",
@@ -361,10 +376,9 @@ class GamesTab(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                game = self.games[row]
                 cursor = db.get_cursor()
                 query = "DELETE FROM games WHERE id = %s"
-                cursor.execute(query, (game.id,))
+                cursor.execute(query, (game_id,))
                 db.commit()
                 self.load_games()
             except Exception as e:
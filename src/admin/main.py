@@ -22,6 +22,8 @@ from .settings import SettingsTab
 from .games import GamesTab
 from .login import AdminLoginWindow
 from src.utils.helpers import set_background_image
+from src.database import ChangeTracker, DashboardSnapshot, DailyStats
+from src.utils.db_worker import get_db_worker
 from src.common import add_close_button
 
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
@@ -72,6 +74,12 @@ class AdminApp:
     
     def show_admin_panel(self):
         """Show the main admin panel after successful login."""
+        # Rebuild the recent daily stats in the background, so days missed
+        # while no sweeper ran are corrected without delaying the panel
+        get_db_worker().run(
+            DailyStats.catch_up,
+            on_error=lambda e: print(f"Error catching up daily stats: {str(e)}")
+        )
         self.admin_window = AdminMainWindow()
         self.admin_window.showFullScreen()
     
@@ -350,37 +358,87 @@ class AdminMainWindow(QMainWindow):
         self.tab_widget = self.tabs
     
     def setup_refresh_timer(self):
-        """Set up a timer to refresh data periodically."""
-        pass
-        # from PyQt5.QtCore import QTimer
-        
-        # self.refresh_timer = QTimer(self)
-        # self.refresh_timer.timeout.connect(lambda: self.refresh_data())
-        # self.refresh_timer.start(5000)  # Refresh every 5 seconds
+        """Set up a timer that refreshes tabs when their data changes."""
+        # Which refreshes each tracked table invalidates, per tab
+        self.change_handlers = {
+            'sessions': [
+                (self.dashboard_tab, self.dashboard_tab.refresh_data),
+                (self.sessions_tab, self.sessions_tab.refresh_data),
+                (self.registration_tab, self.registration_tab.refresh_recent_registrations),
+            ],
+            'orders': [
+                (self.dashboard_tab, self.dashboard_tab.refresh_data),
+                (self.orders_tab, self.orders_tab.refresh_data),
+            ],
+            'pcs': [
+                (self.dashboard_tab, self.dashboard_tab.refresh_data),
+                (self.registration_tab, self.registration_tab.refresh_pc_combo),
+                (self.registration_tab, self.registration_tab.refresh_pc_grid),
+            ],
+            'users': [
+                (self.dashboard_tab, self.dashboard_tab.refresh_stats),
+                (self.registration_tab, self.registration_tab.refresh_recent_registrations),
+            ],
+        }
+        # Refreshes owed to tabs that changed while hidden
+        self.pending_refreshes = {}
+        self.change_tracker = ChangeTracker()
+        
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.check_for_changes)
+        self.refresh_timer.start(3000)  # One version query every 3 seconds
+        self.check_for_changes()
+    
+    def check_for_changes(self):
+        """Refresh whatever the sessions, orders, PCs and users written since the last check affect."""
+        try:
+            changed = self.change_tracker.poll()
+        except Exception as e:
+            print(f"Error checking for changes: {e}")
+            return
+        
+        if not changed:
+            return
+        
+        DashboardSnapshot.invalidate()
+        current_tab = self.tabs.currentWidget()
+        due = []
+        for table in changed:
+            for tab, handler in self.change_handlers.get(table, []):
+                if tab is current_tab:
+                    if handler not in due:
+                        due.append(handler)
+                else:
+                    # Refresh hidden tabs when they are next shown
+                    self.pending_refreshes.setdefault(tab, [])
+                    if handler not in self.pending_refreshes[tab]:
+                        self.pending_refreshes[tab].append(handler)
+        
+        for handler in due:
+            handler()
+    
+    def on_tab_changed(self, index):
+        """Run any refreshes a tab missed while it was hidden."""
+        tab = self.tabs.widget(index)
+        for handler in self.pending_refreshes.pop(tab, []):
+            handler()
     
     def refresh_data(self):
         """Refresh data in all tabs."""
-        current_index = self.tab_widget.currentIndex()
+        current_tab = self.tab_widget.currentWidget()
+        DashboardSnapshot.invalidate()
         
         # Refresh the current tab
-        if current_index == 0:  # Dashboard
-            self.dashboard_tab.refresh_data()
-        elif current_index == 1:  # Registration
-            self.registration_tab.refresh_data()
-        elif current_index == 2:  # Sessions
-            self.sessions_tab.refresh_data()
-        elif current_index == 3:  # Orders
-            self.orders_tab.refresh_data()
-        elif current_index == 4:  # Menu
-            self.menu_tab.refresh_data()
-        elif current_index == 5:  # Games
-            self.games_tab.refresh_data()
-        elif current_index == 6:  # Reports
-            self.reports_tab.refresh_data()
+        if hasattr(current_tab, 'refresh_data'):
+            current_tab.refresh_data()
+        self.pending_refreshes.pop(current_tab, None)
         
         # Always refresh dashboard data for real-time stats
-        if current_index != 0:
+        if current_tab is not self.dashboard_tab:
             self.dashboard_tab.refresh_data()
+            self.pending_refreshes.pop(self.dashboard_tab, None)
             
     def showEvent(self, event):
         """Override show event to make window fullscreen and add close button."""
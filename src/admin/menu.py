@@ -10,7 +10,7 @@ from PyQt5.QtGui import QFont, QColor, QIcon, QPixmap
 from src.common import (
     HeaderLabel, SubHeaderLabel, Card, StyledTable, StyledLineEdit,
     StyledComboBox, PrimaryButton, SecondaryButton, DangerButton, SuccessButton,
-    show_message, confirm_action, create_spacer
+    show_message, confirm_action, create_spacer, TableCell, KeyedTableSync
 )
 from src.database import db, MenuItem, MenuItemExtra, MenuItemTakeout
 from src.utils.helpers import format_currency
@@ -666,6 +666,9 @@ class MenuTab(QWidget):
         """Initialize the menu tab."""
         super().__init__()
         
+        # One row differ per category table
+        self.table_syncs = {}
+        
         self.init_ui()
         self.refresh_data()
     
@@ -885,6 +888,14 @@ class MenuTab(QWidget):
         # Set other columns to stretch
         for i in range(4):
             table.horizontalHeader().setSectionResizeMode(i, QHeaderView.Stretch)
+        
+        # Rows are diffed by item ID so refreshes only touch what changed
+        self.table_syncs[table] = KeyedTableSync(
+            table,
+            key=lambda item: item.id,
+            render=self.menu_item_cells,
+            widgets={4: (self.create_menu_item_actions, lambda item: bool(item.available))}
+        )
     
     def refresh_data(self):
         """Refresh data in the tab."""
@@ -898,50 +909,40 @@ class MenuTab(QWidget):
         # Get items for the category
         items = MenuItem.get_by_category(category)
         
-        # Clear existing rows
-        table.setRowCount(0)
+        self.table_syncs[table].update(items)
+    
+    def menu_item_cells(self, item):
+        """Build the cells of a menu item row."""
+        return [
+            item.name,
+            item.description or "",
+            format_currency(item.price),
+            TableCell("Yes" if item.available else "No", None if item.available else '#e74c3c'),  # Red
+        ]
+    
+    def create_menu_item_actions(self, item):
+        """Build the action buttons of a menu item row."""
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(2, 0, 2, 0)  # Reduced horizontal margins
+        actions_layout.setSpacing(2)  # Reduced spacing between buttons
+        
+        # Edit button
+        edit_button = SecondaryButton("Edit")
+        edit_button.clicked.connect(lambda _, item_id=item.id: self.edit_menu_item(item_id))
+        actions_layout.addWidget(edit_button)
+        
+        # Toggle availability button
+        if item.available:
+            toggle_button = DangerButton("Disable")
+        else:
+            toggle_button = SuccessButton("Enable")
         
-        # Add to table
-        for i, item in enumerate(items):
-            table.insertRow(i)
-            
-            # Name
-            table.setItem(i, 0, QTableWidgetItem(item.name))
-            
-            # Description
-            table.setItem(i, 1, QTableWidgetItem(item.description or ""))
-            
-            # Price
-            table.setItem(i, 2, QTableWidgetItem(format_currency(item.price)))
-            
-            # Available
-            available_item = QTableWidgetItem("Yes" if item.available else "No")
-            if not item.available:
-                available_item.setForeground(QColor('#e74c3c'))  # Red
-            table.setItem(i, 3, available_item)
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(2, 0, 2, 0)  # Reduced horizontal margins
-            actions_layout.setSpacing(2)  # Reduced spacing between buttons
-            
-            # Edit button
-            edit_button = SecondaryButton("Edit")
-            edit_button.clicked.connect(lambda _, item_id=item.id: self.edit_menu_item(item_id))
-            actions_layout.addWidget(edit_button)
-            
-            # Toggle availability button
-            if item.available:
-                toggle_button = DangerButton("Disable")
-            else:
-                toggle_button = SuccessButton("Enable")
-            
-            toggle_button.clicked.connect(lambda _, item_id=item.id, available=item.available: 
-                                         self.toggle_availability(item_id, available))
-            actions_layout.addWidget(toggle_button)
-            
-            table.setCellWidget(i, 4, actions_widget)
+        toggle_button.clicked.connect(lambda _, item_id=item.id, available=item.available: 
+                                     self.toggle_availability(item_id, available))
+        actions_layout.addWidget(toggle_button)
+        
+        return actions_widget
     
     def add_menu_item(self):
         """Add a new menu item."""
@@ -10,7 +10,8 @@ from PyQt5.QtGui import QFont, QColor, QIcon
 from src.common import (
     HeaderLabel, SubHeaderLabel, Card, StyledTable, StyledLineEdit,
     StyledComboBox, PrimaryButton, SecondaryButton, DangerButton, SuccessButton,
-    show_message, confirm_action, create_spacer
+    show_message, confirm_action, create_spacer, TableCell, KeyedTableSync,
+    StyledTableView, KeysetTableModel, StyledLabel
 )
 from src.database import db, Order, MenuItem
 from src.utils.helpers import format_currency, format_datetime
@@ -296,6 +297,14 @@ class OrdersTab(QWidget):
         # Double-click to view details
         self.pending_table.cellDoubleClicked.connect(self.view_order_details)
         
+        # Rows are diffed by order ID so refreshes only touch what changed
+        self.pending_table.setWordWrap(True)
+        self.pending_sync = KeyedTableSync(
+            self.pending_table,
+            key=lambda order: order.id,
+            render=self.pending_order_cells
+        )
+        
         pending_layout.addWidget(self.pending_table)
         pending_card.layout.addLayout(pending_layout)
         
@@ -309,11 +318,30 @@ class OrdersTab(QWidget):
         history_header = SubHeaderLabel("Order History")
         history_layout.addWidget(history_header)
         
-        self.history_table = StyledTable()
-        self.history_table.setColumnCount(7)
-        self.history_table.setHorizontalHeaderLabels([
-            "Order #", "PC", "User", "Order Time", "Delivery Time", "Total", "Status"
-        ])
+        # Search is applied in SQL once typing pauses
+        self.history_search = StyledLineEdit(placeholder="Search by order #, user or PC number")
+        self.history_search_timer = QTimer(self)
+        self.history_search_timer.setSingleShot(True)
+        self.history_search_timer.setInterval(300)
+        self.history_search.textChanged.connect(self.history_search_timer.start)
+        self.history_search_timer.timeout.connect(
+            lambda: self.history_model.set_search(self.history_search.text())
+        )
+        history_layout.addWidget(self.history_search)
+        
+        # History pages in from SQL as the view scrolls
+        self.history_model = KeysetTableModel(
+            ["Order #", "PC", "User", "Order Time", "Delivery Time", "Total", "Status"],
+            fetch_page=lambda after, limit, descending, search: Order.get_history_page(
+                after, limit, descending, search
+            ),
+            render=self.history_order_cells,
+            sort_column=3,
+            parent=self
+        )
+        self.history_table = StyledTableView()
+        self.history_error = StyledLabel()
+        self.history_model.attach(self.history_table, self.history_error)
 
         self.history_table.horizontalHeader().setStyleSheet("""
             QHeaderView::section {
@@ -331,9 +359,10 @@ class OrdersTab(QWidget):
         self.history_table.horizontalHeader().setFixedHeight(50)
         
         # Double-click to view details
-        self.history_table.cellDoubleClicked.connect(self.view_order_details)
+        self.history_table.doubleClicked.connect(self.view_history_order_details)
         
         history_layout.addWidget(self.history_table)
+        history_layout.addWidget(self.history_error)
         history_card.layout.addLayout(history_layout)
         
         main_layout.addWidget(history_card)
@@ -351,134 +380,74 @@ class OrdersTab(QWidget):
         # Get pending orders
         orders = Order.get_pending_orders()
         
-        # Clear existing rows
-        self.pending_table.setRowCount(0)
-        
-        # Add to table
-        for i, order in enumerate(orders):
-            self.pending_table.insertRow(i)
-            
-            # Order #
-            order_id_item = QTableWidgetItem(str(order.id))
-            order_id_item.setData(Qt.UserRole, order.id)  # Store order ID for double-click
-            self.pending_table.setItem(i, 0, order_id_item)
-            
-            # PC
-            self.pending_table.setItem(i, 1, QTableWidgetItem(f"PC {order.pc_number}"))
-            
-            # User
-            self.pending_table.setItem(i, 2, QTableWidgetItem(order.user_name))
-            
-            # Time
-            order_time = order.order_time.strftime("%H:%M:%S")
-            self.pending_table.setItem(i, 3, QTableWidgetItem(order_time))
-            
-            # Items with extras and takeouts
-            items_text_parts = []
-            for item in order.items:
-                item_text = f"{item['quantity']} x {item['name']}"
-                
-                # Add extras summary if any
-                if 'extras' in item and item['extras']:
-                    extras_count = len(item['extras'])
-                    item_text += f" (+{extras_count} extras)"
-                
-                # Add takeouts summary if any
-                if 'takeouts' in item and item['takeouts']:
-                    takeouts_count = len(item['takeouts'])
-                    item_text += f" (-{takeouts_count} takeouts)"
-                
-                items_text_parts.append(item_text)
-            
-            items_text = ", ".join(items_text_parts)
-            items_item = QTableWidgetItem(items_text)
-            items_item.setToolTip(items_text)  # Add tooltip to show full text on hover
-            self.pending_table.setItem(i, 4, items_item)
+        if self.pending_sync.update(orders):
+            # Auto-adjust row heights for the wrapped item lists
+            self.pending_table.resizeRowsToContents()
+    
+    def pending_order_cells(self, order):
+        """Build the cells of a pending orders row."""
+        # Items with extras and takeouts
+        items_text_parts = []
+        for item in order.items:
+            item_text = f"{item['quantity']} x {item['name']}"
             
-            # Status
-            status_item = QTableWidgetItem(order.status.capitalize())
+            # Add extras summary if any
+            if 'extras' in item and item['extras']:
+                extras_count = len(item['extras'])
+                item_text += f" (+{extras_count} extras)"
             
-            # Color code status
-            if order.status == 'preparing':
-                status_item.setForeground(QColor('#f39c12'))  # Yellow
-            elif order.status == 'pending':
-                status_item.setForeground(QColor('#3498db'))  # Blue
-            elif order.status == 'ready':
-                status_item.setForeground(QColor('#e67e22'))  # Orange
+            # Add takeouts summary if any
+            if 'takeouts' in item and item['takeouts']:
+                takeouts_count = len(item['takeouts'])
+                item_text += f" (-{takeouts_count} takeouts)"
             
-            self.pending_table.setItem(i, 5, status_item)
+            items_text_parts.append(item_text)
         
-        # Enable text wrapping and auto-adjust row heights
-        self.pending_table.setWordWrap(True)
-        for i in range(self.pending_table.rowCount()):
-            self.pending_table.resizeRowToContents(i)
+        items_text = ", ".join(items_text_parts)
+        
+        # Color code status
+        status_color = None
+        if order.status == 'preparing':
+            status_color = '#f39c12'  # Yellow
+        elif order.status == 'pending':
+            status_color = '#3498db'  # Blue
+        elif order.status == 'ready':
+            status_color = '#e67e22'  # Orange
+        
+        return [
+            TableCell(str(order.id), data=order.id),  # Order ID for double-click
+            f"PC {order.pc_number}",
+            order.user_name,
+            order.order_time.strftime("%H:%M:%S"),
+            TableCell(items_text, tooltip=items_text),  # Tooltip shows full text on hover
+            TableCell(order.status.capitalize(), status_color),
+        ]
     
     def refresh_order_history(self):
         """Refresh order history table."""
-        cursor = db.get_cursor()
-        try:
-            # Clear existing rows
-            self.history_table.setRowCount(0)
-            
-            # Get completed orders
-            query = """
-            SELECT 
-                o.id,
-                p.pc_number,
-                u.name as user_name,
-                o.order_time,
-                o.delivery_time,
-                o.total_amount,
-                o.status
-            FROM orders o
-            JOIN sessions s ON o.session_id = s.id
-            JOIN users u ON s.user_id = u.id
-            JOIN pcs p ON s.pc_id = p.id
-            WHERE o.status IN ('delivered', 'cancelled')
-            ORDER BY o.order_time DESC
-            LIMIT 20
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-            
-            # Add to table
-            for i, result in enumerate(results):
-                self.history_table.insertRow(i)
-                
-                # Order #
-                order_id_item = QTableWidgetItem(str(result['id']))
-                order_id_item.setData(Qt.UserRole, result['id'])  # Store order ID for double-click
-                self.history_table.setItem(i, 0, order_id_item)
-                
-                # PC
-                self.history_table.setItem(i, 1, QTableWidgetItem(f"PC {result['pc_number']}"))
-                
-                # User
-                self.history_table.setItem(i, 2, QTableWidgetItem(result['user_name']))
-                
-                # Order Time
-                order_time = result['order_time'].strftime("%H:%M:%S")
-                self.history_table.setItem(i, 3, QTableWidgetItem(order_time))
-                
-                # Delivery Time
-                delivery_time = result['delivery_time'].strftime("%H:%M:%S") if result['delivery_time'] else "-"
-                self.history_table.setItem(i, 4, QTableWidgetItem(delivery_time))
-                
-                # Total
-                self.history_table.setItem(i, 5, QTableWidgetItem(format_currency(result['total_amount'])))
-                
-                # Status
-                status_item = QTableWidgetItem(result['status'].capitalize())
-                
-                # Color code status
-                if result['status'] == 'delivered':
-                    status_item.setForeground(QColor('#2ecc71'))  # Green
-                elif result['status'] == 'cancelled':
-                    status_item.setForeground(QColor('#e74c3c'))  # Red
-                
-                self.history_table.setItem(i, 6, status_item)
-        finally:
-            cursor.close()
+        # Leave the view alone while staff are scrolled back through history
+        if self.history_table.verticalScrollBar().value() > 0:
+            return
+        self.history_model.reload()
+    
+    def history_order_cells(self, result):
+        """Build the cells of an order history row."""
+        # Color code status
+        status_color = None
+        if result['status'] == 'delivered':
+            status_color = '#2ecc71'  # Green
+        elif result['status'] == 'cancelled':
+            status_color = '#e74c3c'  # Red
+        
+        return [
+            TableCell(str(result['id']), data=result['id']),
+            f"PC {result['pc_number']}",
+            result['user_name'],
+            format_datetime(result['order_time']),
+            format_datetime(result['delivery_time']) if result['delivery_time'] else "-",
+            format_currency(result['total_amount']),
+            TableCell(result['status'].capitalize(), status_color),
+        ]
     
     def view_order_details(self, row, column):
         """View order details when a row is double-clicked."""
@@ -493,4 +462,14 @@ class OrdersTab(QWidget):
             dialog = OrderDetailsDialog(order_id, self)
             if dialog.exec_():
                 # Refresh data if order was updated
-                self.refresh_data() 
\ No newline at end of file
+                self.refresh_data()
+    
+    def view_history_order_details(self, index):
+        """View order details when a history row is double-clicked."""
+        order_id = self.history_model.row_at(index.row())['id']
+        
+        # Show order details dialog
+        dialog = OrderDetailsDialog(order_id, self)
+        if dialog.exec_():
+            # Refresh data if order was updated
+            self.refresh_data()
\ No newline at end of file
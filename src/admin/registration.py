@@ -10,7 +10,7 @@ from src.common import (
     StyledComboBox, PrimaryButton, SecondaryButton, DangerButton, SuccessButton,
     show_message, confirm_action, create_spacer, PCStatusWidget
 )
-from src.database import db, User, PC, Session
+from src.database import db, User, PC, Session, PCUnavailableError
 from src.utils.helpers import (
     format_currency, format_time, get_duration_options, 
     get_payment_methods, calculate_price_for_duration
@@ -383,8 +383,24 @@ class RegistrationTab(QWidget):
         
         
             
-            # Create session
-            session_id = Session.create(user_id, pc_id, duration, payment_method, price)
+            # Create session; the PC may have been taken since the combo box was filled
+            try:
+                session_id = Session.create(user_id, pc_id, duration, payment_method, price)
+            except PCUnavailableError as e:
+                if e.status is None:
+                    reason = "no longer exists"
+                elif e.status == 'occupied':
+                    reason = "was just assigned to someone else"
+                else:
+                    reason = f"is not available (status: {e.status})"
+                show_message(
+                    self, "PC Unavailable",
+                    f"{self.pc_combo.currentText()} {reason}. Please choose another PC.",
+                    QMessageBox.Warning
+                )
+                self.refresh_pc_combo()
+                self.refresh_pc_grid()
+                return
             
             # Show success message
             show_message(
@@ -12,7 +12,7 @@ from src.common import (
     StyledComboBox, PrimaryButton, SecondaryButton, DangerButton, SuccessButton,
     show_message, confirm_action, create_spacer
 )
-from src.database import db
+from src.database import DailyStats
 from src.utils.helpers import format_currency, format_time, format_datetime
 
 class ReportsTab(QWidget):
@@ -399,95 +399,55 @@ class ReportsTab(QWidget):
             show_message(self, "Error", "Start date cannot be after end date.", QMessageBox.Warning)
             return
         
+        # Both panels read the same handful of daily_stats rows
+        try:
+            totals = DailyStats.get_totals(start_date, end_date)
+        except Exception as e:
+            print(f"Error loading report totals: {e}")
+            return
+        
         # Generate reports
-        self.generate_revenue_summary(start_date, end_date)
-        self.generate_usage_statistics(start_date, end_date)
+        self.generate_revenue_summary(start_date, end_date, totals)
+        self.generate_usage_statistics(start_date, end_date, totals)
     
-    def generate_revenue_summary(self, start_date, end_date):
+    def generate_revenue_summary(self, start_date, end_date, totals=None):
         """Generate revenue summary for the selected date range."""
-        cursor = db.get_cursor()
-        try:
-            # Get gaming revenue
-            query = """
-            SELECT SUM(payment_amount) as total 
-            FROM sessions 
-            WHERE DATE(start_time) BETWEEN %s AND %s
-            """
-            cursor.execute(query, (start_date, end_date))
-            result = cursor.fetchone()
-            
-            gaming_revenue = result['total'] or 0
-            self.gaming_revenue_label.setText(format_currency(gaming_revenue))
-            
-            # Get food & services revenue
-            query = """
-            SELECT SUM(total_amount) as total 
-            FROM orders 
-            WHERE DATE(order_time) BETWEEN %s AND %s
-            """
-            cursor.execute(query, (start_date, end_date))
-            result = cursor.fetchone()
-            
-            food_revenue = result['total'] or 0
-            self.food_revenue_label.setText(format_currency(food_revenue))
-            
-            # Calculate total
-            total_revenue = gaming_revenue + food_revenue
-            self.total_revenue_label.setText(format_currency(total_revenue))
-        finally:
-            cursor.close()
+        if totals is None:
+            totals = DailyStats.get_totals(start_date, end_date)
+        
+        gaming_revenue = totals['gaming_revenue'] or 0
+        self.gaming_revenue_label.setText(format_currency(gaming_revenue))
+        
+        food_revenue = totals['food_revenue'] or 0
+        self.food_revenue_label.setText(format_currency(food_revenue))
+        
+        # Calculate total
+        total_revenue = gaming_revenue + food_revenue
+        self.total_revenue_label.setText(format_currency(total_revenue))
     
-    def generate_usage_statistics(self, start_date, end_date):
+    def generate_usage_statistics(self, start_date, end_date, totals=None):
         """Generate usage statistics for the selected date range."""
-        cursor = db.get_cursor()
-        try:
-            # Get total sessions
-            query = """
-            SELECT COUNT(*) as count 
-            FROM sessions 
-            WHERE DATE(start_time) BETWEEN %s AND %s
-            """
-            cursor.execute(query, (start_date, end_date))
-            result = cursor.fetchone()
-            
-            total_sessions = result['count'] or 0
-            self.total_sessions_label.setText(str(total_sessions))
-            
-            # Get total users
-            query = """
-            SELECT COUNT(DISTINCT user_id) as count 
-            FROM sessions 
-            WHERE DATE(start_time) BETWEEN %s AND %s
-            """
-            cursor.execute(query, (start_date, end_date))
-            result = cursor.fetchone()
-            
-            total_users = result['count'] or 0
-            self.total_users_label.setText(str(total_users))
-            
-            # Get total hours
-            query = """
-            SELECT SUM(duration_minutes) as total_minutes 
-            FROM sessions 
-            WHERE DATE(start_time) BETWEEN %s AND %s
-            """
-            cursor.execute(query, (start_date, end_date))
-            result = cursor.fetchone()
-            
-            total_minutes = result['total_minutes'] or 0
-            total_hours = total_minutes / 60
-            self.total_hours_label.setText(f"{total_hours:.1f}h")
-            
-            # Calculate average session duration
-            if total_sessions > 0:
-                avg_minutes = total_minutes / total_sessions
-                avg_hours = int(avg_minutes // 60)
-                avg_mins = int(avg_minutes % 60)
-                self.avg_duration_label.setText(f"{avg_hours}h {avg_mins}m")
-            else:
-                self.avg_duration_label.setText("0h 0m")
-        finally:
-            cursor.close()
+        if totals is None:
+            totals = DailyStats.get_totals(start_date, end_date)
+        
+        total_sessions = int(totals['session_count'] or 0)
+        self.total_sessions_label.setText(str(total_sessions))
+        
+        total_users = int(totals['distinct_users'] or 0)
+        self.total_users_label.setText(str(total_users))
+        
+        total_minutes = int(totals['total_minutes'] or 0)
+        total_hours = total_minutes / 60
+        self.total_hours_label.setText(f"{total_hours:.1f}h")
+        
+        # Calculate average session duration
+        if total_sessions > 0:
+            avg_minutes = total_minutes / total_sessions
+            avg_hours = int(avg_minutes // 60)
+            avg_mins = int(avg_minutes % 60)
+            self.avg_duration_label.setText(f"{avg_hours}h {avg_mins}m")
+        else:
+            self.avg_duration_label.setText("0h 0m")
     
     def export_reports(self):
         """Export reports to CSV files."""
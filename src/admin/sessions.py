@@ -1,23 +1,60 @@
+from datetime import datetime
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, 
     QFrame, QSizePolicy, QSpacerItem, QTableWidgetItem, QMessageBox,
     QDialog, QComboBox, QLineEdit, QPushButton, QHeaderView
 )
-from PyQt5.QtCore import Qt, QTimer, QDateTime
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QColor
 
 from src.common import (
     HeaderLabel, SubHeaderLabel, Card, StyledTable, StyledLineEdit,
     StyledComboBox, PrimaryButton, SecondaryButton, DangerButton, SuccessButton,
-    show_message, confirm_action, create_spacer, PCStatusWidget, CountdownTimer
+    show_message, confirm_action, create_spacer, PCStatusWidget, CountdownTimer,
+    TableCell, KeyedTableSync, StyledTableView, KeysetTableModel, StyledLabel
 )
 from src.database import db, User, PC, Session
 from src.utils.helpers import (
     format_currency, format_time, get_duration_options, 
     get_payment_methods, calculate_price_for_duration,
-    calculate_time_left, format_time_left, format_datetime
+    format_datetime
 )
 
+def time_left_cell(end_time, now=None):
+    """Return the (text, colour) of a countdown cell for a session ending at ``end_time``."""
+    if not end_time:
+        return "", None
+    secs_left = int((end_time - (now or datetime.now())).total_seconds())
+    if secs_left <= 0:
+        return "Time's up!", '#e74c3c'  # Red
+    
+    hours = secs_left // 3600
+    minutes = (secs_left % 3600) // 60
+    seconds = secs_left % 60
+    text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    
+    # Color code time left
+    if secs_left < 300:  # Less than 5 minutes
+        return text, '#e74c3c'  # Red
+    if secs_left < 900:  # Less than 15 minutes
+        return text, '#f39c12'  # Yellow
+    return text, '#2ecc71'  # Green
+
+class SessionCountdown:
+    """Countdown state of one row of the active sessions table."""
+    
+    __slots__ = ('session_id', 'end_time', 'status', 'color', 'expired')
+    
+    def __init__(self, session_id, end_time, status):
+        self.session_id = session_id
+        self.end_time = end_time
+        self.status = status
+        # Colour last applied to the Time Left item, so ticks only set it on change
+        self.color = None
+        # Set once the session has been handed over for completion
+        self.expired = False
+
 class ExtendSessionDialog(QDialog):
     """Dialog for extending a session."""
     
@@ -111,6 +148,9 @@ class SessionsTab(QWidget):
         """Initialize the sessions tab."""
         super().__init__()
         
+        # Countdown state of the active sessions table, by session ID
+        self.countdowns = {}
+        
         self.init_ui()
         self.refresh_data()
         
@@ -151,7 +191,38 @@ class SessionsTab(QWidget):
         active_header = SubHeaderLabel("Active Sessions")
         active_layout.addWidget(active_header)
         
+        # Bulk actions on the selected rows, each applied in one transaction
+        bulk_layout = QHBoxLayout()
+        
+        select_all_button = SecondaryButton("Select All")
+        select_all_button.clicked.connect(lambda: self.active_table.selectAll())
+        bulk_layout.addWidget(select_all_button)
+        
+        pause_selected_button = SecondaryButton("Pause Selected")
+        pause_selected_button.clicked.connect(self.pause_selected_sessions)
+        bulk_layout.addWidget(pause_selected_button)
+        
+        resume_selected_button = SuccessButton("Resume Selected")
+        resume_selected_button.clicked.connect(self.resume_selected_sessions)
+        bulk_layout.addWidget(resume_selected_button)
+        
+        extend_selected_button = PrimaryButton("Extend Selected")
+        extend_selected_button.clicked.connect(self.extend_selected_sessions)
+        bulk_layout.addWidget(extend_selected_button)
+        
+        terminate_selected_button = DangerButton("Terminate Selected")
+        terminate_selected_button.clicked.connect(self.terminate_selected_sessions)
+        bulk_layout.addWidget(terminate_selected_button)
+        
+        complete_overdue_button = SecondaryButton("Complete Overdue")
+        complete_overdue_button.clicked.connect(self.complete_overdue_sessions)
+        bulk_layout.addWidget(complete_overdue_button)
+        
+        bulk_layout.addStretch()
+        active_layout.addLayout(bulk_layout)
+        
         self.active_table = StyledTable()
+        self.active_table.setSelectionMode(StyledTable.ExtendedSelection)
         self.active_table.setColumnCount(8)
         self.active_table.setHorizontalHeaderLabels([
             "User", "PC", "Start Time", "End Time", "Duration", "Time Left", "Status", "Actions"
@@ -181,6 +252,14 @@ class SessionsTab(QWidget):
         for i in range(7):
             self.active_table.horizontalHeader().setSectionResizeMode(i, QHeaderView.Stretch)
         
+        # Rows are diffed by session ID so refreshes only touch what changed
+        self.active_sync = KeyedTableSync(
+            self.active_table,
+            key=lambda result: result['id'],
+            render=self.active_session_cells,
+            widgets={7: (self.create_session_actions, lambda result: result['status'])}
+        )
+        
         active_layout.addWidget(self.active_table)
         active_card.layout.addLayout(active_layout)
         
@@ -194,11 +273,30 @@ class SessionsTab(QWidget):
         history_header = SubHeaderLabel("Session History")
         history_layout.addWidget(history_header)
         
-        self.history_table = StyledTable()
-        self.history_table.setColumnCount(7)
-        self.history_table.setHorizontalHeaderLabels([
-            "User", "PC", "Start Time", "End Time", "Duration", "Payment", "Status"
-        ])
+        # Search is applied in SQL once typing pauses
+        self.history_search = StyledLineEdit(placeholder="Search by user or PC number")
+        self.history_search_timer = QTimer(self)
+        self.history_search_timer.setSingleShot(True)
+        self.history_search_timer.setInterval(300)
+        self.history_search.textChanged.connect(self.history_search_timer.start)
+        self.history_search_timer.timeout.connect(
+            lambda: self.history_model.set_search(self.history_search.text())
+        )
+        history_layout.addWidget(self.history_search)
+        
+        # History pages in from SQL as the view scrolls
+        self.history_model = KeysetTableModel(
+            ["User", "PC", "Start Time", "End Time", "Duration", "Payment", "Status"],
+            fetch_page=lambda after, limit, descending, search: Session.get_history_page(
+                after, limit, descending, search
+            ),
+            render=self.history_session_cells,
+            sort_column=2,
+            parent=self
+        )
+        self.history_table = StyledTableView()
+        self.history_error = StyledLabel()
+        self.history_model.attach(self.history_table, self.history_error)
 
         self.history_table.horizontalHeader().setStyleSheet("""
             QHeaderView::section {
@@ -216,6 +314,7 @@ class SessionsTab(QWidget):
         self.history_table.horizontalHeader().setFixedHeight(50)
         
         history_layout.addWidget(self.history_table)
+        history_layout.addWidget(self.history_error)
         history_card.layout.addLayout(history_layout)
         
         main_layout.addWidget(history_card)
@@ -232,9 +331,6 @@ class SessionsTab(QWidget):
         """Refresh active sessions table."""
         cursor = db.get_cursor()
         try:
-            # Clear existing rows
-            self.active_table.setRowCount(0)
-            
             # Get active sessions (excluding walk-in customers)
             query = """
             SELECT 
@@ -243,6 +339,7 @@ class SessionsTab(QWidget):
                 p.pc_number,
                 s.start_time,
                 s.end_time,
+                s.paused_at,
                 s.duration_minutes,
                 s.status,
                 s.payment_method,
@@ -257,207 +354,137 @@ class SessionsTab(QWidget):
             cursor.execute(query)
             results = cursor.fetchall()
             
-            # Add to table
-            for i, result in enumerate(results):
-                self.active_table.insertRow(i)
-                
-                # User
-                self.active_table.setItem(i, 0, QTableWidgetItem(result['user_name']))
-                
-                # PC
-                self.active_table.setItem(i, 1, QTableWidgetItem(f"PC {result['pc_number']}"))
-                
-                # Start Time
-                start_time = result['start_time'].strftime("%H:%M:%S")
-                self.active_table.setItem(i, 2, QTableWidgetItem(start_time))
-                
-                # End Time
-                end_time = result['end_time'].strftime("%H:%M:%S") if result['end_time'] else ""
-                self.active_table.setItem(i, 3, QTableWidgetItem(end_time))
-                
-                # Duration
-                duration = format_time(result['duration_minutes'])
-                self.active_table.setItem(i, 4, QTableWidgetItem(duration))
-                
-                # Time Left
-                time_left = format_time_left(result['end_time'])
-                time_left_item = QTableWidgetItem(time_left)
-                
-                # Color code time left
-                minutes_left = calculate_time_left(result['end_time'])
-                if minutes_left < 5:
-                    time_left_item.setForeground(QColor('#e74c3c'))  # Red
-                elif minutes_left < 15:
-                    time_left_item.setForeground(QColor('#f39c12'))  # Yellow
-                else:
-                    time_left_item.setForeground(QColor('#2ecc71'))  # Green
-                
-                self.active_table.setItem(i, 5, time_left_item)
-                
-                # Status
-                status_item = QTableWidgetItem(result['status'].capitalize())
-                
-                # Color code status
-                if result['status'] == 'active':
-                    status_item.setForeground(QColor('#2ecc71'))  # Green
-                elif result['status'] == 'paused':
-                    status_item.setForeground(QColor('#3498db'))  # Blue
-                
-                self.active_table.setItem(i, 6, status_item)
-                
-                # Actions
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(2, 0, 2, 0)  # Reduced horizontal margins
-                actions_layout.setSpacing(2)  # Reduced spacing between buttons
-                
-                # Store session ID in the widget
-                actions_widget.setProperty("session_id", result['id'])
-                
-                if result['status'] == 'active':
-                    # Pause button
-                    pause_button = SecondaryButton("Pause")
-                    pause_button.clicked.connect(lambda _, sid=result['id']: self.pause_session(sid))
-                    actions_layout.addWidget(pause_button)
-                else:
-                    # Resume button
-                    resume_button = SuccessButton("Resume")
-                    resume_button.clicked.connect(lambda _, sid=result['id']: self.resume_session(sid))
-                    actions_layout.addWidget(resume_button)
-                
-                # Extend button
-                extend_button = PrimaryButton("Extend")
-                extend_button.clicked.connect(lambda _, sid=result['id']: self.extend_session(sid))
-                actions_layout.addWidget(extend_button)
-                
-                # Terminate button
-                terminate_button = DangerButton("Terminate")
-                terminate_button.clicked.connect(lambda _, sid=result['id']: self.terminate_session(sid))
-                actions_layout.addWidget(terminate_button)
-                
-                self.active_table.setCellWidget(i, 7, actions_widget)
+            self.active_sync.update(results)
+            
+            countdowns = {}
+            for result in results:
+                countdown = SessionCountdown(result['id'], result['end_time'], result['status'])
+                previous = self.countdowns.get(result['id'])
+                if previous and previous.end_time == countdown.end_time:
+                    # Do not hand the same session over for completion twice
+                    countdown.expired = previous.expired
+                countdowns[result['id']] = countdown
+            self.countdowns = countdowns
         finally:
             cursor.close()
     
+    def active_session_cells(self, result):
+        """Build the cells of an active sessions row."""
+        # Start and end time
+        start_time = result['start_time'].strftime("%H:%M:%S")
+        end_time = result['end_time'].strftime("%H:%M:%S") if result['end_time'] else ""
+        
+        # Same text and colour as the per-second countdown; a paused
+        # session's clock stopped when it was paused
+        time_left, time_left_color = time_left_cell(result['end_time'], result['paused_at'])
+        
+        # Color code status
+        status_color = None
+        if result['status'] == 'active':
+            status_color = '#2ecc71'  # Green
+        elif result['status'] == 'paused':
+            status_color = '#3498db'  # Blue
+        
+        return [
+            result['user_name'],
+            f"PC {result['pc_number']}",
+            start_time,
+            end_time,
+            format_time(result['duration_minutes']),
+            TableCell(time_left, time_left_color),
+            TableCell(result['status'].capitalize(), status_color),
+        ]
+    
+    def create_session_actions(self, result):
+        """Build the action buttons of an active sessions row."""
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(2, 0, 2, 0)  # Reduced horizontal margins
+        actions_layout.setSpacing(2)  # Reduced spacing between buttons
+        
+        # Store session ID in the widget
+        actions_widget.setProperty("session_id", result['id'])
+        
+        if result['status'] == 'active':
+            # Pause button
+            pause_button = SecondaryButton("Pause")
+            pause_button.clicked.connect(lambda _, sid=result['id']: self.pause_session(sid))
+            actions_layout.addWidget(pause_button)
+        else:
+            # Resume button
+            resume_button = SuccessButton("Resume")
+            resume_button.clicked.connect(lambda _, sid=result['id']: self.resume_session(sid))
+            actions_layout.addWidget(resume_button)
+        
+        # Extend button
+        extend_button = PrimaryButton("Extend")
+        extend_button.clicked.connect(lambda _, sid=result['id']: self.extend_session(sid))
+        actions_layout.addWidget(extend_button)
+        
+        # Terminate button
+        terminate_button = DangerButton("Terminate")
+        terminate_button.clicked.connect(lambda _, sid=result['id']: self.terminate_session(sid))
+        actions_layout.addWidget(terminate_button)
+        
+        return actions_widget
+    
     def refresh_session_history(self):
         """Refresh session history table."""
-        cursor = db.get_cursor()
-        try:
-            # Clear existing rows
-            self.history_table.setRowCount(0)
-            
-            # Get completed/terminated sessions
-            query = """
-            SELECT 
-                s.id,
-                u.name as user_name,
-                p.pc_number,
-                s.start_time,
-                s.end_time,
-                s.duration_minutes,
-                s.status,
-                s.payment_method,
-                s.payment_amount
-            FROM sessions s
-            JOIN users u ON s.user_id = u.id
-            JOIN pcs p ON s.pc_id = p.id
-            WHERE s.status IN ('completed', 'terminated')
-            ORDER BY s.start_time DESC
-            LIMIT 20
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-            
-            # Add to table
-            for i, result in enumerate(results):
-                self.history_table.insertRow(i)
-                
-                # User
-                self.history_table.setItem(i, 0, QTableWidgetItem(result['user_name']))
-                
-                # PC
-                self.history_table.setItem(i, 1, QTableWidgetItem(f"PC {result['pc_number']}"))
-                
-                # Start Time
-                start_time = result['start_time'].strftime("%H:%M:%S")
-                self.history_table.setItem(i, 2, QTableWidgetItem(start_time))
-                
-                # End Time
-                end_time = result['end_time'].strftime("%H:%M:%S") if result['end_time'] else ""
-                self.history_table.setItem(i, 3, QTableWidgetItem(end_time))
-                
-                # Duration
-                duration = format_time(result['duration_minutes'])
-                self.history_table.setItem(i, 4, QTableWidgetItem(duration))
-                
-                # Payment
-                payment = f"{result['payment_method']} - {format_currency(result['payment_amount'])}"
-                self.history_table.setItem(i, 5, QTableWidgetItem(payment))
-                
-                # Status
-                status_item = QTableWidgetItem(result['status'].capitalize())
-                
-                # Color code status
-                if result['status'] == 'completed':
-                    status_item.setForeground(QColor('#2ecc71'))  # Green
-                elif result['status'] == 'terminated':
-                    status_item.setForeground(QColor('#e74c3c'))  # Red
-                
-                self.history_table.setItem(i, 6, status_item)
-        finally:
-            cursor.close()
+        # Leave the view alone while staff are scrolled back through history
+        if self.history_table.verticalScrollBar().value() > 0:
+            return
+        self.history_model.reload()
+    
+    def history_session_cells(self, result):
+        """Build the cells of a session history row."""
+        # Color code status
+        status_color = None
+        if result['status'] == 'completed':
+            status_color = '#2ecc71'  # Green
+        elif result['status'] == 'terminated':
+            status_color = '#e74c3c'  # Red
+        
+        return [
+            result['user_name'],
+            f"PC {result['pc_number']}",
+            format_datetime(result['start_time']),
+            format_datetime(result['end_time']) if result['end_time'] else "",
+            format_time(result['duration_minutes']),
+            f"{result['payment_method']} - {format_currency(result['payment_amount'])}",
+            TableCell(result['status'].capitalize(), status_color),
+        ]
     
     def update_countdowns(self):
-        """Update countdown timers in the active sessions table."""
-        for i in range(self.active_table.rowCount()):
-            # Get end time from the table
-            end_time_item = self.active_table.item(i, 3)
-            if not end_time_item or not end_time_item.text():
+        """
+        Update the Time Left column of the active sessions table.
+        
+        Works from the end times kept in ``self.countdowns`` and only changes
+        the text (and, when it changes, the colour) of the existing items.
+        Sessions that ran out during this tick are completed together.
+        """
+        now = datetime.now()
+        expired = []
+        for row, session_id in enumerate(self.active_sync.keys()):
+            countdown = self.countdowns.get(session_id)
+            if countdown is None or countdown.status != 'active' or countdown.expired:
                 continue
-            
-            # Get status from the table
-            status_item = self.active_table.item(i, 6)
-            if not status_item or status_item.text().lower() != "active":
+            item = self.active_table.item(row, 5)
+            if item is None:
                 continue
             
-            # Parse end time
-            end_time_str = end_time_item.text()
-            today = QDateTime.currentDateTime().date().toString(Qt.ISODate)
-            end_time = QDateTime.fromString(f"{today} {end_time_str}", "yyyy-MM-dd HH:mm:ss")
+            text, color = time_left_cell(countdown.end_time, now)
+            if item.text() != text:
+                item.setText(text)
+            if countdown.color != color:
+                item.setForeground(QColor(color))
+                countdown.color = color
             
-            # Calculate time left
-            now = QDateTime.currentDateTime()
-            if now >= end_time:
-                # Session has ended
-                time_left_item = QTableWidgetItem("Time's up!")
-                time_left_item.setForeground(QColor('#e74c3c'))  # Red
-                self.active_table.setItem(i, 5, time_left_item)
-                
-                # Get session ID and auto-terminate
-                actions_widget = self.active_table.cellWidget(i, 7)
-                if actions_widget:
-                    session_id = actions_widget.property("session_id")
-                    if session_id:
-                        self.complete_session(session_id)
-            else:
-                # Update time left
-                secs_left = now.secsTo(end_time)
-                hours = secs_left // 3600
-                minutes = (secs_left % 3600) // 60
-                seconds = secs_left % 60
-                
-                time_left = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                time_left_item = QTableWidgetItem(time_left)
-                
-                # Color code time left
-                if secs_left < 300:  # Less than 5 minutes
-                    time_left_item.setForeground(QColor('#e74c3c'))  # Red
-                elif secs_left < 900:  # Less than 15 minutes
-                    time_left_item.setForeground(QColor('#f39c12'))  # Yellow
-                else:
-                    time_left_item.setForeground(QColor('#2ecc71'))  # Green
-                
-                self.active_table.setItem(i, 5, time_left_item)
+            if countdown.end_time <= now:
+                countdown.expired = True
+                expired.append(session_id)
+        
+        if expired:
+            self.complete_sessions(expired)
     
     def pause_session(self, session_id):
         """Pause a session."""
@@ -517,13 +544,98 @@ class SessionsTab(QWidget):
     
     def complete_session(self, session_id):
         """Complete a session (automatically called when time is up)."""
+        self.complete_sessions([session_id])
+    
+    def complete_sessions(self, session_ids):
+        """Complete sessions whose time is up, with one update and one refresh."""
+        completed = set()
         try:
-            session = Session.get_by_id(session_id)
-            if session:
-                session.update_status('completed')
-                self.refresh_data()
+            completed = set(Session.complete_many(session_ids))
+            self.refresh_data()
         except Exception as e:
-            print(f"Failed to complete session: {str(e)}")
+            print(f"Failed to complete sessions: {str(e)}")
+        # Sessions the server did not complete (an error, or its clock is
+        # behind ours) are tried again on the next tick
+        for session_id in session_ids:
+            countdown = self.countdowns.get(session_id)
+            if countdown and session_id not in completed:
+                countdown.expired = False
+    
+    def selected_session_ids(self):
+        """Return the IDs of the sessions selected in the active sessions table."""
+        keys = self.active_sync.keys()
+        rows = sorted(index.row() for index in self.active_table.selectionModel().selectedRows())
+        return [keys[row] for row in rows if row < len(keys)]
+    
+    def run_bulk_action(self, action, *args, confirm=None):
+        """
+        Apply a bulk Session operation to the selected sessions and refresh once.
+        
+        Args:
+            action (callable): Takes the arguments followed by ``session_ids``
+                and returns the number of sessions changed
+            confirm (str, optional): Confirmation question; ``{count}`` is
+                replaced with the number of selected sessions
+        
+        Returns:
+            int: The number of sessions changed, or None if nothing was done
+        """
+        session_ids = self.selected_session_ids()
+        if not session_ids:
+            show_message(self, "No Sessions Selected", "Select one or more sessions first.")
+            return None
+        if confirm and not confirm_action("Confirm", confirm.format(count=len(session_ids)), self):
+            return None
+        
+        try:
+            changed = action(*args, session_ids=session_ids)
+        except Exception as e:
+            show_message(self, "Error", f"Failed to update sessions: {str(e)}", QMessageBox.Critical)
+            return None
+        self.refresh_data()
+        return changed
+    
+    def pause_selected_sessions(self):
+        """Pause every selected active session."""
+        self.run_bulk_action(Session.pause_all)
+    
+    def resume_selected_sessions(self):
+        """Resume every selected paused session."""
+        self.run_bulk_action(Session.resume_all)
+    
+    def extend_selected_sessions(self):
+        """Extend every selected session by the same time and charge."""
+        if not self.selected_session_ids():
+            show_message(self, "No Sessions Selected", "Select one or more sessions first.")
+            return
+        dialog = ExtendSessionDialog(self)
+        if dialog.exec_():
+            values = dialog.get_values()
+            extended = self.run_bulk_action(Session.extend_all, values['duration'], values['price'])
+            if extended:
+                show_message(
+                    self,
+                    "Success",
+                    f"{extended} session(s) extended by {format_time(values['duration'])}.\n"
+                    f"Additional charge: {format_currency(values['price'])} each"
+                )
+    
+    def terminate_selected_sessions(self):
+        """Terminate every selected session."""
+        self.run_bulk_action(
+            Session.terminate_all,
+            confirm="Are you sure you want to terminate {count} session(s)?"
+        )
+    
+    def complete_overdue_sessions(self):
+        """Complete every active session whose time is up."""
+        try:
+            completed = Session.expire_overdue()
+        except Exception as e:
+            show_message(self, "Error", f"Failed to complete sessions: {str(e)}", QMessageBox.Critical)
+            return
+        self.refresh_data()
+        show_message(self, "Overdue Sessions", f"{completed} overdue session(s) completed.")
     
     def select_pc(self, pc_number):
         """Select a PC in the active sessions table."""
@@ -0,0 +1,12 @@
+"""
+Stress tests and benchmarks that run against the configured MySQL database.
+
+Each module is a standalone script, like src.sweeper:
+
+    python -m src.benchmarks.pc_assignment_stress   # no PC is ever double-booked
+    python -m src.benchmarks.order_loading          # order readers use constant round-trips
+    python -m src.benchmarks.report_ranges          # reports stay fast over a year of data
+
+They seed tagged rows, measure, and remove the rows again, so point .env at a
+test database rather than the lounge's live one.
+"""
@@ -0,0 +1,134 @@
+"""
+Seeding and clean-up shared by the benchmark scripts.
+
+Every row a benchmark creates is tagged so cleanup() can find it again:
+users have civil IDs starting with BENCH-, PCs are numbered from
+BENCH_PC_BASE, and menu items are named BENCH_MENU_ITEM. Sessions, orders and
+their child rows go with them through the ON DELETE CASCADE foreign keys.
+"""
+import os
+
+from src.database import db, DailyStats
+
+BENCH_PREFIX = 'BENCH-'
+BENCH_PC_BASE = 90000
+BENCH_MENU_ITEM = 'Benchmark item'
+
+
+def add_common_arguments(parser):
+    parser.add_argument('--yes', action='store_true',
+                        help='Write to the configured database without asking first')
+    parser.add_argument('--keep', action='store_true',
+                        help='Leave the seeded rows in place afterwards')
+
+
+def confirm_database(assume_yes):
+    """Ask before writing benchmark rows to the configured database."""
+    target = f"{os.getenv('DB_NAME', 'gaming_lounge_system')} on {os.getenv('DB_HOST', 'localhost')}"
+    if assume_yes:
+        print(f"Using database {target}")
+        return True
+    answer = input(f"This writes (and then removes) test rows in {target}. Continue? [y/N] ")
+    return answer.strip().lower() == 'y'
+
+
+def create_users(cursor, count, tag):
+    """Create ``count`` tagged users and return their IDs."""
+    cursor.executemany(
+        "INSERT INTO users (name, civil_id, phone) VALUES (%s, %s, %s)",
+        [(f"Benchmark user {i}", f"{BENCH_PREFIX}{tag}{i}", f"{BENCH_PREFIX}{i}")
+         for i in range(count)]
+    )
+    cursor.execute("SELECT id FROM users WHERE civil_id LIKE %s ORDER BY id",
+                   (f"{BENCH_PREFIX}{tag}%",))
+    return [row['id'] for row in cursor.fetchall()]
+
+
+def create_pcs(cursor, count):
+    """Create ``count`` available tagged PCs and return their IDs."""
+    cursor.executemany(
+        "INSERT INTO pcs (pc_number, status, is_occupied) VALUES (%s, 'available', FALSE)",
+        [(BENCH_PC_BASE + i,) for i in range(count)]
+    )
+    cursor.execute("SELECT id FROM pcs WHERE pc_number >= %s ORDER BY id", (BENCH_PC_BASE,))
+    return [row['id'] for row in cursor.fetchall()]
+
+
+def create_menu_item(cursor):
+    """
+    Create a tagged menu item with one extra and one takeout.
+
+    Returns:
+        tuple: (menu_item_id, extra_id, takeout_id)
+    """
+    cursor.execute(
+        "INSERT INTO menu_items (name, description, price, category) VALUES (%s, '', 1.50, 'food')",
+        (BENCH_MENU_ITEM,)
+    )
+    menu_item_id = cursor.lastrowid
+    cursor.execute(
+        "INSERT INTO item_extras (menu_item_id, name, price) VALUES (%s, 'Benchmark extra', 0.25)",
+        (menu_item_id,)
+    )
+    extra_id = cursor.lastrowid
+    cursor.execute(
+        "INSERT INTO item_takeouts (menu_item_id, name) VALUES (%s, 'Benchmark takeout')",
+        (menu_item_id,)
+    )
+    return menu_item_id, extra_id, cursor.lastrowid
+
+
+def has_leftovers():
+    """Whether rows from an earlier, interrupted benchmark are still there."""
+    cursor = db.get_cursor()
+    try:
+        cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM users WHERE civil_id LIKE %s)
+             + (SELECT COUNT(*) FROM pcs WHERE pc_number >= %s) as leftovers
+        """, (f"{BENCH_PREFIX}%", BENCH_PC_BASE))
+        return cursor.fetchone()['leftovers'] > 0
+    finally:
+        cursor.close()
+
+
+def cleanup():
+    """Delete every tagged row and rebuild the daily_stats days they touched."""
+    with db.transaction() as cursor:
+        cursor.execute("""
+        SELECT MIN(first_day) as first_day, MAX(last_day) as last_day FROM (
+            SELECT DATE(MIN(s.start_time)) as first_day, DATE(MAX(s.start_time)) as last_day
+            FROM sessions s
+            JOIN users u ON s.user_id = u.id
+            WHERE u.civil_id LIKE %s
+            UNION ALL
+            SELECT DATE(MIN(o.order_time)), DATE(MAX(o.order_time))
+            FROM orders o
+            JOIN sessions s ON o.session_id = s.id
+            JOIN users u ON s.user_id = u.id
+            WHERE u.civil_id LIKE %s
+        ) spans
+        """, (f"{BENCH_PREFIX}%", f"{BENCH_PREFIX}%"))
+        span = cursor.fetchone()
+
+        cursor.execute("DELETE FROM users WHERE civil_id LIKE %s", (f"{BENCH_PREFIX}%",))
+        cursor.execute("DELETE FROM pcs WHERE pc_number >= %s", (BENCH_PC_BASE,))
+        cursor.execute("DELETE FROM menu_items WHERE name = %s", (BENCH_MENU_ITEM,))
+
+        if span and span['first_day']:
+            DailyStats.rebuild_range(cursor, span['first_day'], span['last_day'])
+    print("Removed the benchmark rows.")
+
+
+def statement_count():
+    """
+    Number of statements this thread's connection has sent so far.
+
+    Read from the server's per-session Questions counter, so it counts real
+    round-trips without instrumenting the models.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute("SHOW SESSION STATUS LIKE 'Questions'")
+        return int(cursor.fetchone()['Value'])
+    finally:
+        cursor.close()
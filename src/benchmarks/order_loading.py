@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Round-trip benchmark for the order readers.
+
+Seeds a session with a growing number of orders, each with two lines that
+carry an extra and a takeout, and measures how many statements and how much
+time Order.get_by_session, Order.get_pending_orders and Order.get_by_id
+need at each size. The readers load all child rows with a fixed number of
+bulk queries, so the statement counts must not grow with the order count.
+
+    python -m src.benchmarks.order_loading
+    python -m src.benchmarks.order_loading --sizes 10 100 500 --repeat 10
+"""
+import argparse
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from src.database import db, Session, Order
+from src.benchmarks import fixtures
+
+# Load environment variables
+load_dotenv()
+
+
+def measure(reader, overhead, repeat):
+    """
+    Run ``reader`` ``repeat`` times.
+
+    Returns:
+        tuple: (statements per call, best time in ms)
+    """
+    statements = None
+    best_ms = None
+    for _ in range(repeat):
+        before = fixtures.statement_count()
+        started = time.perf_counter()
+        reader()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        statements = fixtures.statement_count() - before - overhead
+        best_ms = elapsed_ms if best_ms is None else min(best_ms, elapsed_ms)
+    return statements, best_ms
+
+
+def run(sizes, repeat):
+    """Run the benchmark; return True when the statement counts stay flat."""
+    with db.transaction() as cursor:
+        user_id = fixtures.create_users(cursor, 1, 'O')[0]
+        pc_id = fixtures.create_pcs(cursor, 1)[0]
+        menu_item_id, extra_id, takeout_id = fixtures.create_menu_item(cursor)
+    session_id = Session.create(user_id, pc_id, 60, 'Cash', 0).id
+
+    line = {'menu_item_id': menu_item_id, 'quantity': 1,
+            'extras': [extra_id], 'takeouts': [takeout_id]}
+
+    # Statements counted by one statement_count() call itself
+    before = fixtures.statement_count()
+    overhead = fixtures.statement_count() - before
+
+    readers = (
+        ('get_by_session', lambda: Order.get_by_session(session_id)),
+        ('get_pending_orders', Order.get_pending_orders),
+    )
+
+    print(f"{'orders':>8} {'reader':<20} {'statements':>10} {'best ms':>9}")
+    counts = {}
+    created = 0
+    for size in sorted(sizes):
+        while created < size:
+            order_id = Order.create(session_id, [line, dict(line, quantity=2)])
+            created += 1
+
+        for name, reader in readers + (('get_by_id', lambda: Order.get_by_id(order_id)),):
+            statements, best_ms = measure(reader, overhead, repeat)
+            counts.setdefault(name, set()).add(statements)
+            print(f"{size:>8} {name:<20} {statements:>10} {best_ms:>9.2f}")
+        # Let the next size's reads see a fresh snapshot
+        db.release()
+
+    growing = [name for name, seen in counts.items() if len(seen) > 1]
+    for name in growing:
+        print(f"{name} issued a different number of statements as orders grew: {sorted(counts[name])}")
+    return not growing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the round-trips the order readers need')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200],
+                        help='Order counts to measure at (default 10 50 200)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (default 5)')
+    fixtures.add_common_arguments(parser)
+    args = parser.parse_args()
+
+    if not fixtures.confirm_database(args.yes):
+        return 1
+    if fixtures.has_leftovers():
+        print("Removing rows left by an earlier run...")
+        fixtures.cleanup()
+
+    try:
+        passed = run(args.sizes, args.repeat)
+    finally:
+        if not args.keep:
+            fixtures.cleanup()
+        db.close()
+    print("PASS" if passed else "FAIL")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
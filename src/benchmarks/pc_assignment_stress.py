@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for PC assignment.
+
+Many threads race to start sessions on a handful of PCs through
+Session.create, the same call the registration tab makes. Each round every
+thread tries the PCs in its own random order until one accepts it, then the
+round is checked: no PC may have more than one active session, and exactly
+one session per PC must have succeeded. The sessions are then terminated and
+the next round starts.
+
+    python -m src.benchmarks.pc_assignment_stress
+    python -m src.benchmarks.pc_assignment_stress --threads 32 --pcs 4 --rounds 50
+
+Concurrency is bounded by the connection pool, so raise DB_POOL_SIZE to let
+more threads hit the server at the same moment.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from src.database import db, Session, PCUnavailableError
+from src.benchmarks import fixtures
+
+# Load environment variables
+load_dotenv()
+
+
+def race(user_ids, pc_ids, barrier, results, index):
+    """One thread's attempts in one round (runs on its own thread)."""
+    user_id = user_ids[index]
+    order = list(pc_ids)
+    random.shuffle(order)
+    outcome = {'assigned': None, 'conflicts': 0, 'errors': []}
+    try:
+        barrier.wait()
+        for pc_id in order:
+            try:
+                Session.create(user_id, pc_id, 60, 'Cash', 0)
+            except PCUnavailableError:
+                outcome['conflicts'] += 1
+                continue
+            outcome['assigned'] = pc_id
+            break
+    except Exception as e:
+        outcome['errors'].append(str(e))
+    finally:
+        db.release()
+    results[index] = outcome
+
+
+def double_booked(pc_ids):
+    """Return the PCs that have more than one active session, with their counts."""
+    placeholders = ", ".join(["%s"] * len(pc_ids))
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(f"""
+        SELECT pc_id, COUNT(*) as sessions FROM sessions
+        WHERE pc_id IN ({placeholders}) AND status IN ('active', 'paused')
+        GROUP BY pc_id
+        HAVING COUNT(*) > 1
+        """, tuple(pc_ids))
+        return {row['pc_id']: row['sessions'] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+        db.release()
+
+
+def active_sessions(pc_ids):
+    """Return the IDs of the active sessions on ``pc_ids``."""
+    placeholders = ", ".join(["%s"] * len(pc_ids))
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(f"""
+        SELECT id FROM sessions WHERE pc_id IN ({placeholders}) AND status IN ('active', 'paused')
+        """, tuple(pc_ids))
+        return [row['id'] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        db.release()
+
+
+def run(threads, pcs, rounds):
+    """Run the stress test; return True when no round double-assigned a PC."""
+    with db.transaction() as cursor:
+        user_ids = fixtures.create_users(cursor, threads, 'S')
+        pc_ids = fixtures.create_pcs(cursor, pcs)
+
+    failures = 0
+    assigned_total = conflicts_total = 0
+    started = time.monotonic()
+    for round_number in range(1, rounds + 1):
+        barrier = threading.Barrier(threads)
+        results = [None] * threads
+        workers = [threading.Thread(target=race, args=(user_ids, pc_ids, barrier, results, i))
+                   for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assigned = [result['assigned'] for result in results if result['assigned'] is not None]
+        errors = [error for result in results for error in result['errors']]
+        conflicts_total += sum(result['conflicts'] for result in results)
+        assigned_total += len(assigned)
+
+        problems = []
+        booked = double_booked(pc_ids)
+        if booked:
+            problems.append(f"PCs with several active sessions: {booked}")
+        if len(assigned) != len(set(assigned)):
+            problems.append("two threads were told they got the same PC")
+        if len(assigned) != min(threads, pcs):
+            problems.append(f"{len(assigned)} assignments for {min(threads, pcs)} free PCs")
+        if errors:
+            problems.append(f"unexpected errors: {errors[:3]}")
+        if problems:
+            failures += 1
+            print(f"Round {round_number}: FAIL - {'; '.join(problems)}")
+
+        # Free the PCs for the next round
+        Session.terminate_all(active_sessions(pc_ids))
+        db.release()
+
+    elapsed = time.monotonic() - started
+    print(f"{rounds} rounds, {threads} threads, {pcs} PCs: {assigned_total} assignments, "
+          f"{conflicts_total} conflicts refused, {failures} failed rounds ({elapsed:.1f} s)")
+    return failures == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that concurrent registrations never double-book a PC')
+    parser.add_argument('--threads', type=int, default=16, help='Threads racing per round (default 16)')
+    parser.add_argument('--pcs', type=int, default=4, help='PCs they race for (default 4)')
+    parser.add_argument('--rounds', type=int, default=20, help='Rounds to run (default 20)')
+    fixtures.add_common_arguments(parser)
+    args = parser.parse_args()
+
+    if not fixtures.confirm_database(args.yes):
+        return 1
+    if fixtures.has_leftovers():
+        print("Removing rows left by an earlier run...")
+        fixtures.cleanup()
+
+    try:
+        passed = run(args.threads, args.pcs, args.rounds)
+    finally:
+        if not args.keep:
+            fixtures.cleanup()
+        db.close()
+    print("PASS" if passed else "FAIL")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the report and dashboard queries.
+
+Seeds a year of completed sessions and orders, rebuilds their daily_stats
+rows, then times DailyStats.get_totals and DailyStats.get_range for the
+report tab's periods (today, this week, this month, this year) and one
+DashboardSnapshot query. Every query must finish within the budget, and the
+hot queries must still use an index (see migrations.check_query_plans).
+
+    python -m src.benchmarks.report_ranges
+    python -m src.benchmarks.report_ranges --days 730 --per-day 80 --budget-ms 500
+"""
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+
+from src.database import db, DailyStats, DashboardSnapshot
+from src.database.migrations import check_query_plans
+from src.benchmarks import fixtures
+
+# Load environment variables
+load_dotenv()
+
+# Rows per executemany batch while seeding
+BATCH_SIZE = 1000
+
+
+def seed(days, per_day, users, pcs):
+    """Insert ``days`` days of completed sessions, half of them with an order."""
+    with db.transaction() as cursor:
+        user_ids = fixtures.create_users(cursor, users, 'R')
+        pc_ids = fixtures.create_pcs(cursor, pcs)
+
+    first_day = date.today() - timedelta(days=days - 1)
+    sessions = []
+    for day_offset in range(days):
+        opening = datetime.combine(first_day + timedelta(days=day_offset), datetime.min.time())
+        for i in range(per_day):
+            start = opening + timedelta(hours=10, minutes=(i * 13) % 720)
+            sessions.append((
+                user_ids[(day_offset * per_day + i) % len(user_ids)],
+                pc_ids[i % len(pc_ids)],
+                start, start + timedelta(minutes=60), 60, 'completed', 'Cash', 2.00
+            ))
+
+    for batch_start in range(0, len(sessions), BATCH_SIZE):
+        with db.transaction() as cursor:
+            cursor.executemany("""
+            INSERT INTO sessions (user_id, pc_id, start_time, end_time, duration_minutes,
+                                  status, payment_method, payment_amount)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, sessions[batch_start:batch_start + BATCH_SIZE])
+
+    cursor = db.get_cursor()
+    try:
+        cursor.execute("""
+        SELECT s.id, s.start_time FROM sessions s
+        JOIN users u ON s.user_id = u.id
+        WHERE u.civil_id LIKE %s
+        """, (f"{fixtures.BENCH_PREFIX}R%",))
+        orders = [(row['id'], 'delivered', row['start_time'] + timedelta(minutes=10), 1.50)
+                  for index, row in enumerate(cursor.fetchall()) if index % 2 == 0]
+    finally:
+        cursor.close()
+
+    for batch_start in range(0, len(orders), BATCH_SIZE):
+        with db.transaction() as cursor:
+            cursor.executemany("""
+            INSERT INTO orders (session_id, status, order_time, total_amount)
+            VALUES (%s, %s, %s, %s)
+            """, orders[batch_start:batch_start + BATCH_SIZE])
+
+    with db.transaction() as cursor:
+        DailyStats.rebuild_range(cursor, first_day, date.today())
+    db.release()
+    return len(sessions), len(orders)
+
+
+def best_ms(query, repeat):
+    """Best wall time of ``repeat`` runs of ``query``, in ms."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(days, per_day, users, pcs, repeat, budget_ms):
+    """Run the benchmark; return True when every query meets the budget."""
+    started = time.monotonic()
+    session_count, order_count = seed(days, per_day, users, pcs)
+    print(f"Seeded {session_count} sessions and {order_count} orders over {days} days "
+          f"({time.monotonic() - started:.1f} s)")
+
+    today = date.today()
+    periods = (
+        ('today', today),
+        ('this week', today - timedelta(days=today.weekday())),
+        ('this month', today.replace(day=1)),
+        ('this year', today.replace(month=1, day=1)),
+        (f'last {days} days', today - timedelta(days=days - 1)),
+    )
+    timings = []
+    for label, start in periods:
+        timings.append((f"get_totals {label}", best_ms(lambda: DailyStats.get_totals(start, today), repeat)))
+        timings.append((f"get_range {label}", best_ms(lambda: DailyStats.get_range(start, today), repeat)))
+    timings.append(("dashboard snapshot", best_ms(DashboardSnapshot._fetch, repeat)))
+
+    slow = []
+    for label, elapsed in timings:
+        print(f"{label:<32} {elapsed:>9.2f} ms")
+        if elapsed > budget_ms:
+            slow.append(label)
+    for label in slow:
+        print(f"{label} took longer than {budget_ms:.0f} ms")
+
+    full_scans = check_query_plans()
+    db.release()
+    return not slow and not full_scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the report and dashboard queries over a year of data')
+    parser.add_argument('--days', type=int, default=365, help='Days of history to seed (default 365)')
+    parser.add_argument('--per-day', type=int, default=40, help='Sessions per day (default 40)')
+    parser.add_argument('--users', type=int, default=200, help='Distinct customers (default 200)')
+    parser.add_argument('--pcs', type=int, default=10, help='PCs the sessions run on (default 10)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query (default 5)')
+    parser.add_argument('--budget-ms', type=float, default=1000, help='Slowest acceptable query (default 1000)')
+    fixtures.add_common_arguments(parser)
+    args = parser.parse_args()
+
+    if not fixtures.confirm_database(args.yes):
+        return 1
+    if fixtures.has_leftovers():
+        print("Removing rows left by an earlier run...")
+        fixtures.cleanup()
+
+    try:
+        passed = run(args.days, args.per_day, args.users, args.pcs, args.repeat, args.budget_ms)
+    finally:
+        if not args.keep:
+            fixtures.cleanup()
+        db.close()
+    print("PASS" if passed else "FAIL")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 from .ui_components import (
     PrimaryButton, SecondaryButton, DangerButton, SuccessButton,
     StyledLineEdit, StyledComboBox, StyledLabel, HeaderLabel, SubHeaderLabel,
-    Card, StyledTable, ConfirmDialog, CountdownTimer, PCStatusWidget,
+    Card, StyledTable, TableCell, KeyedTableSync, StyledTableView, KeysetTableModel,
+    ConfirmDialog, CountdownTimer, PCStatusWidget,
     show_message, confirm_action, create_spacer, CloseButton, add_close_button,
     apply_dark_theme, apply_light_theme
 )
@@ -9,7 +10,8 @@ from .ui_components import (
 __all__ = [
     'PrimaryButton', 'SecondaryButton', 'DangerButton', 'SuccessButton',
     'StyledLineEdit', 'StyledComboBox', 'StyledLabel', 'HeaderLabel', 'SubHeaderLabel',
-    'Card', 'StyledTable', 'ConfirmDialog', 'CountdownTimer', 'PCStatusWidget',
+    'Card', 'StyledTable', 'TableCell', 'KeyedTableSync', 'StyledTableView', 'KeysetTableModel',
+    'ConfirmDialog', 'CountdownTimer', 'PCStatusWidget',
     'show_message', 'confirm_action', 'create_spacer', 'CloseButton', 'add_close_button',
     'apply_dark_theme', 'apply_light_theme'
 ] 
\ No newline at end of file
@@ -2,9 +2,11 @@ from PyQt5.QtWidgets import (
     QWidget, QPushButton, QLabel, QLineEdit, QComboBox, 
     QVBoxLayout, QHBoxLayout, QGridLayout, QFrame, QMessageBox,
     QTableWidget, QTableWidgetItem, QHeaderView, QSpacerItem,
-    QSizePolicy, QScrollArea, QDialog, QApplication
+    QSizePolicy, QScrollArea, QDialog, QApplication, QTableView
+)
+from PyQt5.QtCore import (
+    Qt, QSize, pyqtSignal, QTimer, QDateTime, QAbstractTableModel, QModelIndex, QVariant
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QTimer, QDateTime
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor, QPalette
 
 class PrimaryButton(QPushButton):
@@ -269,6 +271,352 @@ class StyledTable(QTableWidget):
         self.setSelectionBehavior(QTableWidget.SelectRows)
         self.setEditTriggers(QTableWidget.NoEditTriggers)
 
+class TableCell:
+    """The text, colour and extras of one QTableWidget cell."""
+    
+    __slots__ = ('text', 'color', 'data', 'tooltip')
+    
+    def __init__(self, text, color=None, data=None, tooltip=None):
+        self.text = text
+        self.color = color
+        self.data = data
+        self.tooltip = tooltip
+    
+    def _state(self):
+        return (self.text, self.color, self.data, self.tooltip)
+    
+    def __eq__(self, other):
+        return isinstance(other, TableCell) and self._state() == other._state()
+    
+    def __ne__(self, other):
+        return not self == other
+
+class KeyedTableSync:
+    """
+    Keeps a QTableWidget in step with a list of rows keyed by primary key.
+    
+    Each update() diffs the new rows against what the table already shows:
+    rows whose key disappeared are removed, new keys are inserted in place,
+    and for existing rows only cells whose content changed are touched.
+    Cell widgets (action buttons, previews) are reused for as long as the
+    state their factory reports for the row stays the same, so a refresh
+    with no changes creates no items and no widgets.
+    
+    Usage:
+        sync = KeyedTableSync(table, key=lambda row: row['id'],
+                              render=lambda row: [row['name'], TableCell(...)],
+                              widgets={4: (make_actions, lambda row: row['status'])})
+        sync.update(rows)
+    """
+    
+    def __init__(self, table, key, render, widgets=None):
+        """
+        Args:
+            table (QTableWidget): The table to keep in sync
+            key (callable): Returns the unique key of a row
+            render (callable): Returns the cells of a row, one per item column,
+                each a string or a TableCell
+            widgets (dict, optional): Maps a column to a (factory, state) pair;
+                factory(row) builds the cell widget and state(row) returns a
+                hashable value that must change for the widget to be rebuilt
+        """
+        self.table = table
+        self.key = key
+        self.render = render
+        self.widgets = widgets or {}
+        self._keys = []
+        self._cells = {}
+        self._widget_states = {}
+    
+    def keys(self):
+        """Return the keys of the displayed rows, in table order."""
+        return list(self._keys)
+    
+    def row_of(self, key):
+        """Return the table row showing ``key``, or -1."""
+        try:
+            return self._keys.index(key)
+        except ValueError:
+            return -1
+    
+    def clear(self):
+        """Remove every row."""
+        self.table.setRowCount(0)
+        self._keys = []
+        self._cells = {}
+        self._widget_states = {}
+    
+    def update(self, rows):
+        """
+        Show ``rows``, in order, changing as little of the table as possible.
+        
+        Returns:
+            bool: Whether anything in the table changed
+        """
+        keyed = [(self.key(row), row) for row in rows]
+        wanted = {key for key, _ in keyed}
+        changed = False
+        
+        self.table.setUpdatesEnabled(False)
+        try:
+            for index in reversed(range(len(self._keys))):
+                if self._keys[index] not in wanted:
+                    self._remove_row(index)
+                    changed = True
+            
+            for index, (key, row) in enumerate(keyed):
+                if index >= len(self._keys) or self._keys[index] != key:
+                    if key in self._cells:
+                        # The row moved; take it out and put it back in place
+                        self._remove_row(self._keys.index(key))
+                    self.table.insertRow(index)
+                    self._keys.insert(index, key)
+                    self._cells[key] = {}
+                    changed = True
+                if self._update_row(index, key, row):
+                    changed = True
+        finally:
+            self.table.setUpdatesEnabled(True)
+        return changed
+    
+    def _remove_row(self, index):
+        key = self._keys.pop(index)
+        self._cells.pop(key, None)
+        self._widget_states.pop(key, None)
+        self.table.removeRow(index)
+    
+    def _update_row(self, index, key, row):
+        changed = False
+        cached = self._cells[key]
+        
+        for column, cell in enumerate(self.render(row)):
+            if column in self.widgets:
+                continue
+            if not isinstance(cell, TableCell):
+                cell = TableCell(cell)
+            item = self.table.item(index, column)
+            # Compare against the live text too, in case something else wrote to the cell
+            if item is not None and cached.get(column) == cell and item.text() == cell.text:
+                continue
+            if item is None:
+                item = QTableWidgetItem()
+                self.table.setItem(index, column, item)
+            item.setText(cell.text)
+            item.setForeground(QColor(cell.color) if cell.color else self.table.palette().text())
+            item.setData(Qt.UserRole, cell.data)
+            item.setToolTip(cell.tooltip or "")
+            cached[column] = cell
+            changed = True
+        
+        states = self._widget_states.setdefault(key, {})
+        for column, (factory, state) in self.widgets.items():
+            new_state = state(row)
+            if column in states and states[column] == new_state and self.table.cellWidget(index, column):
+                continue
+            self.table.setCellWidget(index, column, factory(row))
+            states[column] = new_state
+            changed = True
+        
+        return changed
+
+class StyledTableView(QTableView):
+    """A styled table view with gaming theme, for use with a table model."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setAlternatingRowColors(True)
+        self.setStyleSheet("""
+            QTableView {
+                background-color: #1a1a2e;
+                alternate-background-color: #2a2a3e;
+                color: white;
+                border: none;
+                gridline-color: #444;
+            }
+            QHeaderView::section {
+                background-color: #333;
+                color: white;
+                padding: 4px;
+                border: none;
+            }
+        """)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.verticalHeader().setVisible(False)
+        self.setSelectionBehavior(QTableView.SelectRows)
+        self.setEditTriggers(QTableView.NoEditTriggers)
+
+class KeysetTableModel(QAbstractTableModel):
+    """
+    A read-only table model that loads rows page by page as the view scrolls.
+    
+    Pages come from ``fetch_page(after, limit, descending, search)``, where
+    ``after`` is the last row already loaded (None for the first page). The
+    fetcher is expected to continue from that row with keyset pagination
+    (e.g. ``WHERE (start_time, id) < (last start_time, last id)``), so every
+    page costs the same however far the user has scrolled. Sorting and
+    filtering are passed through to the fetcher rather than done in Python.
+    
+    Rows are rendered to cells once, when their page arrives, using the same
+    ``render`` convention as KeyedTableSync (strings or TableCells).
+    
+    A page that fails to load stops further loading until the next reload()
+    and emits ``fetch_failed`` with the error text; it is never raised into
+    Qt, which calls fetchMore() from inside its own event handling.
+    """
+    
+    fetch_failed = pyqtSignal(str)
+    
+    def __init__(self, headers, fetch_page, render, sort_column=None, page_size=50, parent=None):
+        """
+        Args:
+            headers (list): Column titles
+            fetch_page (callable): Loads the page after a row, see above
+            render (callable): Returns the cells of a row
+            sort_column (int, optional): The column whose header toggles the
+                keyset order between newest and oldest first
+            page_size (int): Rows per query
+        """
+        super().__init__(parent)
+        self.headers = headers
+        self.fetch_page = fetch_page
+        self.render = render
+        self.sort_column = sort_column
+        self.page_size = page_size
+        self.descending = True
+        self.search = ""
+        self._rows = []
+        self._cells = []
+        self._exhausted = False
+        self.error = None
+    
+    def attach(self, view, error_label=None):
+        """
+        Show this model in ``view``.
+        
+        Only the ``sort_column`` header shows a sort indicator and reacts to
+        clicks; clicking any other header leaves the indicator where it is.
+        ``error_label``, if given, is shown with the error while loading is
+        stopped by a failed page and hidden again once rows load.
+        """
+        view.setModel(self)
+        header = view.horizontalHeader()
+        if self.sort_column is None:
+            header.setSortIndicatorShown(False)
+            header.setSectionsClickable(False)
+        else:
+            header.setSectionsClickable(True)
+            header.setSortIndicatorShown(True)
+            header.setSortIndicator(self.sort_column, self._sort_order())
+            header.sortIndicatorChanged.connect(
+                lambda column, order: self._header_clicked(header, column, order)
+            )
+        
+        if error_label is not None:
+            error_label.setVisible(False)
+            self.fetch_failed.connect(lambda message: (
+                error_label.setText(f"Could not load rows: {message}"),
+                error_label.setVisible(True)
+            ))
+            self.modelReset.connect(lambda: error_label.setVisible(False))
+    
+    def _sort_order(self):
+        return Qt.DescendingOrder if self.descending else Qt.AscendingOrder
+    
+    def _header_clicked(self, header, column, order):
+        if column != self.sort_column:
+            # Not sortable: put the indicator back without re-sorting
+            header.blockSignals(True)
+            header.setSortIndicator(self.sort_column, self._sort_order())
+            header.blockSignals(False)
+            return
+        self.sort(column, order)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        cell = self._cells[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return cell.text
+        if role == Qt.ForegroundRole and cell.color:
+            return QColor(cell.color)
+        if role == Qt.ToolTipRole and cell.tooltip:
+            return cell.tooltip
+        if role == Qt.UserRole:
+            return cell.data
+        return QVariant()
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after = self._rows[-1] if self._rows else None
+        try:
+            rows = self.fetch_page(after, self.page_size, self.descending, self.search)
+        except Exception as e:
+            print(f"Error loading rows: {str(e)}")
+            self._exhausted = True
+            self.error = str(e)
+            self.fetch_failed.emit(self.error)
+            return
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        
+        cells = []
+        for row in rows:
+            cells.append([cell if isinstance(cell, TableCell) else TableCell(cell)
+                          for cell in self.render(row)])
+        
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._cells.extend(cells)
+        self.endInsertRows()
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Switch the keyset order; only the ``sort_column`` header is sortable."""
+        if column != self.sort_column:
+            return
+        descending = order == Qt.DescendingOrder
+        if descending != self.descending:
+            self.descending = descending
+            self.reload()
+    
+    def set_search(self, search):
+        """Filter rows by a search string, handled by the fetcher's SQL."""
+        search = search.strip()
+        if search != self.search:
+            self.search = search
+            self.reload()
+    
+    def row_at(self, row):
+        """Return the raw row shown at a view row."""
+        return self._rows[row]
+    
+    def reload(self):
+        """Drop every loaded row and start again from the first page."""
+        self.beginResetModel()
+        self._rows = []
+        self._cells = []
+        self._exhausted = False
+        self.error = None
+        self.endResetModel()
+        self.fetchMore()
+
 class ConfirmDialog(QDialog):
     """A confirmation dialog with gaming theme."""
     
@@ -408,6 +756,12 @@ class PCStatusWidget(QWidget):
         layout.addWidget(self.pc_label)
         layout.addStretch()
         
+        # Launcher liveness dot, shown once heartbeat data is known
+        self.launcher_label = QLabel("\u25cf")
+        self.launcher_label.setAlignment(Qt.AlignCenter)
+        self.launcher_label.hide()
+        layout.addWidget(self.launcher_label)
+        
         self.setLayout(layout)
         self.update_style()
         
@@ -435,6 +789,19 @@ class PCStatusWidget(QWidget):
         self.status = status
         self.update_style()
     
+    def set_launcher_online(self, online, seconds_ago=None):
+        """Show whether the launcher on this PC is sending heartbeats."""
+        color = "white" if online else "rgba(0, 0, 0, 0.5)"
+        self.launcher_label.setStyleSheet(f"color: {color}; font-size: 10px; padding: 0px;")
+        if seconds_ago is None:
+            launcher_text = "Launcher never connected"
+        elif online:
+            launcher_text = "Launcher online"
+        else:
+            launcher_text = f"Launcher offline (last seen {seconds_ago // 60}m {seconds_ago % 60}s ago)"
+        self.setToolTip(f"{self.user_name}\n{launcher_text}" if self.user_name else launcher_text)
+        self.launcher_label.show()
+    
     def update_style(self):
         """Update the widget style based on status."""
         if self.status == "available":
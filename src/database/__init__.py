@@ -1,7 +1,8 @@
-from .db_connection import db
-from .models import User, PC, Session, MenuItem, Order, Game, MenuItemTakeout, MenuItemExtra
+from .db_connection import db, PoolTimeoutError
+from .schema_info import schema_info
+from .models import PCUnavailableError, User, PC, Session, MenuItem, Order, Game, MenuItemTakeout, MenuItemExtra, DailyStats, DashboardSnapshot, ChangeTracker, Heartbeat
 
-__all__ = ['db', 'User', 'PC', 'Session', 'MenuItem', 'Order', 'Game', 'MenuItemTakeout', 'MenuItemExtra']
+__all__ = ['db', 'PoolTimeoutError', 'schema_info', 'PCUnavailableError', 'User', 'PC', 'Session', 'MenuItem', 'Order', 'Game', 'MenuItemTakeout', 'MenuItemExtra', 'DailyStats', 'DashboardSnapshot', 'ChangeTracker', 'Heartbeat']
 
 def init_db():
     """Initialize the database with required tables."""
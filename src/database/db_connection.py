@@ -1,59 +1,356 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 import mysql.connector
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the checkout timeout."""
+
+
+class PooledConnection:
+    """A MySQL connection together with the bookkeeping the pool needs."""
+
+    __slots__ = ('raw', 'created_at', 'last_used', 'owner')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.owner = None
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of MySQL connections.
+
+    At most ``size`` connections are ever open. A checkout waits up to
+    ``timeout`` seconds for a free connection before raising PoolTimeoutError.
+    Connections are only pinged when they have been idle longer than
+    ``ping_after`` seconds, and are replaced once older than ``recycle_after``
+    seconds, so a busy connection never pays a health-check round-trip.
+    """
+
+    def __init__(self, size=5, timeout=10, ping_after=30, recycle_after=3600, **connect_kwargs):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self.recycle_after = recycle_after
+        self._connect_kwargs = connect_kwargs
+        self._idle = []
+        self._in_use = set()
+        self._open = 0
+        self._cond = threading.Condition()
+        self._metrics = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'recycled': 0,
+        }
+
+    def acquire(self, timeout=None):
+        """Check a connection out of the pool for the calling thread."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        orphans = []
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    # Reserve the slot now, open the socket outside the lock
+                    self._open += 1
+                    conn = None
+                    break
+                orphans = self._reclaim_orphans()
+                if orphans:
+                    continue
+                if not waited:
+                    self._metrics['waits'] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection became free within {timeout} seconds"
+                    )
+                self._cond.wait(remaining)
+            self._metrics['checkouts'] += 1
+
+        for orphan in orphans:
+            self._close_quietly(orphan)
+
+        try:
+            if conn is None:
+                conn = PooledConnection(self._connect())
+            else:
+                self.check(conn)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        conn.owner = threading.current_thread()
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._in_use.add(conn)
+        return conn
+
+    def release(self, conn):
+        """Return a checked-out connection to the pool."""
+        conn.owner = None
+        try:
+            # Never hand an open transaction (or its snapshot) to the next borrower
+            if conn.raw.in_transaction:
+                conn.raw.rollback()
+        except mysql.connector.Error:
+            self._discard(conn)
+            return
+
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._in_use.discard(conn)
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def check(self, conn):
+        """
+        Make sure a connection is usable before handing it out.
+
+        The server is only contacted when the connection has been idle for
+        longer than ``ping_after``. A plain SELECT leaves a transaction open
+        (autocommit is off), so a connection idle inside a transaction is
+        almost always holding a stale read snapshot: once it is also older
+        than ``recycle_after`` it is rolled back and replaced like any other,
+        and one that fails its ping is replaced either way, since after a
+        server restart or wait_timeout there is nothing left to preserve.
+        A connection in active use is never recycled from under its owner.
+        """
+        now = time.monotonic()
+        if conn.raw.in_transaction:
+            if now - conn.last_used > self.ping_after:
+                if now - conn.created_at > self.recycle_after:
+                    try:
+                        conn.raw.rollback()
+                    except mysql.connector.Error:
+                        pass
+                    self._replace(conn)
+                else:
+                    try:
+                        conn.raw.ping(reconnect=False)
+                    except mysql.connector.Error:
+                        self._replace(conn)
+            conn.last_used = time.monotonic()
+            return conn
+
+        if now - conn.created_at > self.recycle_after:
+            self._replace(conn)
+        elif now - conn.last_used > self.ping_after:
+            try:
+                conn.raw.ping(reconnect=False)
+            except mysql.connector.Error:
+                self._replace(conn)
+
+        conn.last_used = time.monotonic()
+        return conn
+
+    def close_all(self):
+        """
+        Close every idle connection.
+
+        Checked-out connections stay with their threads and return to the
+        pool as usual when released.
+        """
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def metrics(self):
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            snapshot = dict(self._metrics)
+            snapshot.update({
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+            })
+        return snapshot
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self._connect_kwargs)
+        with self._cond:
+            self._metrics['created'] += 1
+        return raw
+
+    def _replace(self, conn):
+        """Swap the raw connection behind ``conn`` for a fresh one."""
+        self._close_quietly(conn)
+        conn.raw = self._connect()
+        conn.created_at = time.monotonic()
+        with self._cond:
+            self._metrics['recycled'] += 1
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        with self._cond:
+            self._in_use.discard(conn)
+            self._open -= 1
+            self._cond.notify()
+
+    def _reclaim_orphans(self):
+        """Take back connections whose owning thread has exited. Caller holds the lock."""
+        orphans = [conn for conn in self._in_use
+                   if conn.owner is not None and not conn.owner.is_alive()]
+        for conn in orphans:
+            self._in_use.discard(conn)
+            self._open -= 1
+        return orphans
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+
+
 class DatabaseConnection:
     """
     A singleton class to manage database connections.
+
+    Connections come from a bounded ConnectionPool. Each thread checks out its
+    own connection the first time it needs one and keeps it until release() is
+    called, so get_cursor(), commit() and rollback() behave as before for every
+    caller while separate threads never share a connection.
     """
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
-            cls._instance._connection = None
+            cls._instance._pool = None
+            cls._instance._pool_lock = threading.Lock()
+            cls._instance._local = threading.local()
         return cls._instance
-    
+
+    @property
+    def pool(self):
+        """The process-wide connection pool, created on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        size=int(os.getenv('DB_POOL_SIZE', 5)),
+                        timeout=float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                        ping_after=float(os.getenv('DB_POOL_PING_SECONDS', 30)),
+                        recycle_after=float(os.getenv('DB_POOL_RECYCLE_SECONDS', 3600)),
+                        host=os.getenv('DB_HOST', 'localhost'),
+                        port=int(os.getenv('DB_PORT', 3306)),
+                        user=os.getenv('DB_USER', 'root'),
+                        password=os.getenv('DB_PASSWORD', ''),
+                        database=os.getenv('DB_NAME', 'gaming_lounge_system')
+                    )
+        return self._pool
+
     def connect(self):
-        """Establish a connection to the MySQL database."""
-        if self._connection is None or not self._connection.is_connected():
-            try:
-                self._connection = mysql.connector.connect(
-                    host=os.getenv('DB_HOST', 'localhost'),
-                    port=int(os.getenv('DB_PORT', 3306)),
-                    user=os.getenv('DB_USER', 'root'),
-                    password=os.getenv('DB_PASSWORD', ''),
-                    database=os.getenv('DB_NAME', 'gaming_lounge_system')
-                )
-                return self._connection
-            except mysql.connector.Error as err:
-                print(f"Error connecting to MySQL: {err}")
-                raise
-        return self._connection
-    
+        """Return the calling thread's connection, checking one out of the pool if needed."""
+        lease = getattr(self._local, 'lease', None)
+        try:
+            if lease is None:
+                lease = self.pool.acquire()
+                self._local.lease = lease
+            else:
+                self.pool.check(lease)
+        except mysql.connector.Error as err:
+            print(f"Error connecting to MySQL: {err}")
+            raise
+        return lease.raw
+
     def get_cursor(self):
-        """Get a cursor from the connection."""
+        """Get a cursor from the calling thread's connection."""
         connection = self.connect()
         return connection.cursor(dictionary=True)
-    
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of statements as one transaction.
+
+        Usage:
+            with db.transaction() as cursor:
+                cursor.execute(...)
+
+        Commits when the block exits normally and rolls back if it raises.
+        Nested blocks join the outermost transaction. A connection checked out
+        just for this block is returned to the pool afterwards.
+
+        The outermost block starts a fresh transaction, so its reads do not
+        see the snapshot left open by the thread's earlier plain reads
+        (autocommit is off). Anything the thread left uncommitted is
+        committed first, as the block's own commit would have done.
+        """
+        owns_lease = getattr(self._local, 'lease', None) is None
+        depth = getattr(self._local, 'depth', 0)
+        connection = self.connect()
+        if depth == 0 and connection.in_transaction:
+            connection.commit()
+        cursor = connection.cursor(dictionary=True)
+        self._local.depth = depth + 1
+        try:
+            yield cursor
+            if depth == 0:
+                connection.commit()
+        except Exception:
+            if depth == 0:
+                connection.rollback()
+            raise
+        finally:
+            self._local.depth = depth
+            cursor.close()
+            if owns_lease:
+                self.release()
+
+    def release(self):
+        """Return the calling thread's connection to the pool."""
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            self._local.lease = None
+            self.pool.release(lease)
+
     def close(self):
-        """Close the database connection."""
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
-            self._connection = None
-    
+        """Release this thread's connection and close all idle pooled connections."""
+        self.release()
+        if self._pool is not None:
+            self._pool.close_all()
+
     def commit(self):
         """Commit the current transaction."""
-        if self._connection and self._connection.is_connected():
-            self._connection.commit()
-    
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            lease.raw.commit()
+
     def rollback(self):
         """Rollback the current transaction."""
-        if self._connection and self._connection.is_connected():
-            self._connection.rollback()
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            lease.raw.rollback()
+
+    def metrics(self):
+        """Return connection pool metrics (checkouts, waits, created, recycled, ...)."""
+        return self.pool.metrics()
 
 # Create a global instance
-db = DatabaseConnection() 
\ No newline at end of file
+db = DatabaseConnection()
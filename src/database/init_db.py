@@ -7,6 +7,8 @@ from dotenv import load_dotenv
 # Add the parent directory to the path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.database.migrations import apply_migrations
+
 # Load environment variables
 load_dotenv()
 
@@ -77,6 +79,13 @@ def create_database():
             # Create tables
             create_tables(cursor)
             
+            # Bring the schema up to the latest migration (indexes etc.)
+            migration_cursor = connection.cursor(dictionary=True)
+            try:
+                apply_migrations(migration_cursor, connection.commit)
+            finally:
+                migration_cursor.close()
+            
             # Insert sample data if needed
             insert_sample_data(cursor)
             
@@ -0,0 +1,391 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once and is recorded in the schema_migrations table, so
+running this module repeatedly is safe. MySQL commits DDL implicitly, so a
+migration cannot be rolled back as a whole; instead every migration is
+idempotent on its own (CREATE ... IF NOT EXISTS, information_schema checks
+before ALTER TABLE, and an index is only added when no existing index already
+starts with the same columns), and its version is committed as soon as it
+finishes. A migration that fails halfway is simply run again in full.
+
+Usage:
+    python -m src.database.migrations                 # apply pending migrations
+    python -m src.database.migrations --check-plans   # EXPLAIN the hot queries
+"""
+import sys
+from .db_connection import db
+from .schema_info import schema_info
+
+
+def _has_index(cursor, table, columns):
+    """Check whether an index on ``table`` already starts with ``columns``."""
+    cursor.execute("""
+        SELECT INDEX_NAME, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table,))
+    indexes = {}
+    for row in cursor.fetchall():
+        indexes.setdefault(row['INDEX_NAME'], []).append(row['COLUMN_NAME'].lower())
+    wanted = [column.lower() for column in columns]
+    return any(existing[:len(wanted)] == wanted for existing in indexes.values())
+
+
+def ensure_index(cursor, table, name, columns):
+    """Create an index unless an equivalent one already exists."""
+    if _has_index(cursor, table, columns):
+        return False
+    print(f"Adding index {name} on {table}({', '.join(columns)})...")
+    cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    return True
+
+
+def add_secondary_indexes(cursor):
+    """Index the columns the hot session, order, user and PC lookups filter on."""
+    ensure_index(cursor, 'sessions', 'idx_sessions_status_start', ['status', 'start_time'])
+    ensure_index(cursor, 'sessions', 'idx_sessions_user_status', ['user_id', 'status'])
+    ensure_index(cursor, 'sessions', 'idx_sessions_pc_status', ['pc_id', 'status'])
+    ensure_index(cursor, 'orders', 'idx_orders_status_time', ['status', 'order_time'])
+    ensure_index(cursor, 'orders', 'idx_orders_order_time', ['order_time'])
+    ensure_index(cursor, 'users', 'idx_users_civil_id', ['civil_id'])
+    ensure_index(cursor, 'users', 'idx_users_phone', ['phone'])
+    ensure_index(cursor, 'pcs', 'idx_pcs_pc_number', ['pc_number'])
+
+
+def add_time_range_indexes(cursor):
+    """Index sessions.start_time for report and dashboard date ranges (orders.order_time is in 1)."""
+    ensure_index(cursor, 'sessions', 'idx_sessions_start_time', ['start_time'])
+
+
+def _create_daily_user_activity(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_user_activity (
+        stat_date DATE NOT NULL,
+        user_id INT NOT NULL,
+        PRIMARY KEY (stat_date, user_id),
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    )
+    """)
+
+
+def create_daily_stats(cursor):
+    """Create the per-day revenue/usage rollup and backfill it from existing history."""
+    from .models import DailyStats
+
+    # The backfill below fills daily_user_activity as well
+    _create_daily_user_activity(cursor)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        stat_date DATE PRIMARY KEY,
+        gaming_revenue DECIMAL(10, 2) NOT NULL DEFAULT 0,
+        food_revenue DECIMAL(10, 2) NOT NULL DEFAULT 0,
+        session_count INT NOT NULL DEFAULT 0,
+        distinct_users INT NOT NULL DEFAULT 0,
+        total_minutes INT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """)
+
+    cursor.execute("""
+    SELECT MIN(first_day) as first_day, MAX(last_day) as last_day FROM (
+        SELECT DATE(MIN(start_time)) as first_day, DATE(MAX(start_time)) as last_day FROM sessions
+        UNION ALL
+        SELECT DATE(MIN(order_time)), DATE(MAX(order_time)) FROM orders
+    ) spans
+    """)
+    span = cursor.fetchone()
+    if span and span['first_day']:
+        print(f"Backfilling daily_stats from {span['first_day']} to {span['last_day']}...")
+        DailyStats.rebuild_range(cursor, span['first_day'], span['last_day'])
+
+
+def add_registration_date_index(cursor):
+    """Index users.created_at for the dashboard registration counters."""
+    ensure_index(cursor, 'users', 'idx_users_created_at', ['created_at'])
+
+
+def create_change_versions(cursor):
+    """Track a version counter per table, bumped by triggers on every write."""
+    from .models import ChangeTracker
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS change_versions (
+        table_name VARCHAR(64) PRIMARY KEY,
+        version BIGINT UNSIGNED NOT NULL DEFAULT 0
+    )
+    """)
+
+    for table in ChangeTracker.TABLES:
+        cursor.execute(
+            "INSERT IGNORE INTO change_versions (table_name, version) VALUES (%s, 0)",
+            (table,)
+        )
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            trigger = f"trg_{table}_{event.lower()}_version"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"""
+            CREATE TRIGGER {trigger} AFTER {event} ON {table}
+            FOR EACH ROW
+                UPDATE change_versions SET version = version + 1
+                WHERE table_name = '{table}'
+            """)
+
+
+def add_menu_category_key(cursor):
+    """Store each menu item's canonical category in an indexed generated column."""
+    from .models import MenuItem
+
+    cursor.execute("""
+        SELECT COUNT(*) as count FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'menu_items'
+        AND COLUMN_NAME = 'category_key'
+    """)
+    if cursor.fetchone()['count'] == 0:
+        print("Adding category_key column to menu_items...")
+        cursor.execute(f"""
+            ALTER TABLE menu_items
+            ADD COLUMN category_key VARCHAR(20)
+            AS ({MenuItem.category_key_sql()}) STORED
+        """)
+    ensure_index(cursor, 'menu_items', 'idx_menu_items_category_key', ['category_key', 'name'])
+
+
+def create_launcher_heartbeats(cursor):
+    """Create the table launchers write their heartbeat to (no change-tracking triggers)."""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS launcher_heartbeats (
+        pc_number INT PRIMARY KEY,
+        session_id INT NULL,
+        last_seen DATETIME NOT NULL
+    )
+    """)
+
+
+def add_order_client_token(cursor):
+    """Let clients tag orders with a unique token so a replayed order is never duplicated."""
+    cursor.execute("""
+        SELECT COUNT(*) as count FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'orders'
+        AND COLUMN_NAME = 'client_token'
+    """)
+    if cursor.fetchone()['count'] == 0:
+        print("Adding client_token column to orders...")
+        cursor.execute("ALTER TABLE orders ADD COLUMN client_token VARCHAR(36) NULL")
+    if not _has_index(cursor, 'orders', ['client_token']):
+        print("Adding unique index uq_orders_client_token on orders(client_token)...")
+        cursor.execute("CREATE UNIQUE INDEX uq_orders_client_token ON orders (client_token)")
+
+
+def add_session_expiry_index(cursor):
+    """Index sessions by (status, end_time) for the expiry sweeper."""
+    ensure_index(cursor, 'sessions', 'idx_sessions_status_end', ['status', 'end_time'])
+
+
+def add_session_pause_tracking(cursor):
+    """Record when a session was paused and how long it has been paused in total."""
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'sessions'
+        AND COLUMN_NAME IN ('paused_at', 'paused_seconds_total')
+    """)
+    existing = {row['COLUMN_NAME'] for row in cursor.fetchall()}
+    if 'paused_at' not in existing:
+        print("Adding paused_at column to sessions...")
+        cursor.execute("ALTER TABLE sessions ADD COLUMN paused_at TIMESTAMP NULL DEFAULT NULL")
+    if 'paused_seconds_total' not in existing:
+        print("Adding paused_seconds_total column to sessions...")
+        cursor.execute("ALTER TABLE sessions ADD COLUMN paused_seconds_total INT NOT NULL DEFAULT 0")
+    # Sessions paused before the clock was tracked start their pause now
+    cursor.execute("UPDATE sessions SET paused_at = NOW() WHERE status = 'paused' AND paused_at IS NULL")
+
+
+def replace_change_triggers(cursor):
+    """
+    Replace the change_versions triggers with an indexed updated_at column.
+
+    Every write used to bump one shared counter row per table, which
+    serialized all writers to that table until they committed. ChangeTracker
+    now reads MAX(id) and MAX(updated_at) instead, both answered from an index.
+    """
+    from .models import ChangeTracker
+
+    for table in ChangeTracker.TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{event.lower()}_version")
+
+        cursor.execute("""
+            SELECT COUNT(*) as count FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            AND COLUMN_NAME = 'updated_at'
+        """, (table,))
+        if cursor.fetchone()['count'] == 0:
+            print(f"Adding updated_at column to {table}...")
+            cursor.execute(f"""
+                ALTER TABLE {table}
+                ADD COLUMN updated_at TIMESTAMP(6) NOT NULL
+                DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+            """)
+        ensure_index(cursor, table, f"idx_{table}_updated_at", ['updated_at'])
+
+    cursor.execute("DROP TABLE IF EXISTS change_versions")
+
+
+def create_daily_user_activity(cursor):
+    """Record which users were active on each day, for distinct-user counts over long ranges."""
+    _create_daily_user_activity(cursor)
+    print("Backfilling daily_user_activity from sessions...")
+    cursor.execute("""
+    INSERT IGNORE INTO daily_user_activity (stat_date, user_id)
+    SELECT DISTINCT DATE(start_time), user_id FROM sessions
+    """)
+
+
+# (version, name, function) - append new migrations, never reorder or renumber
+MIGRATIONS = [
+    (1, 'add_secondary_indexes', add_secondary_indexes),
+    (2, 'add_time_range_indexes', add_time_range_indexes),
+    (3, 'create_daily_stats', create_daily_stats),
+    (4, 'add_registration_date_index', add_registration_date_index),
+    (5, 'create_change_versions', create_change_versions),
+    (6, 'add_menu_category_key', add_menu_category_key),
+    (7, 'create_launcher_heartbeats', create_launcher_heartbeats),
+    (8, 'add_order_client_token', add_order_client_token),
+    (9, 'add_session_expiry_index', add_session_expiry_index),
+    (10, 'add_session_pause_tracking', add_session_pause_tracking),
+    (11, 'replace_change_triggers', replace_change_triggers),
+    (12, 'create_daily_user_activity', create_daily_user_activity),
+]
+
+
+def apply_migrations(cursor, commit):
+    """
+    Apply every migration that has not run yet.
+
+    Args:
+        cursor: A dictionary cursor on the application database
+        commit: Commits the cursor's connection; called after each
+            migration so its version is recorded as soon as it is applied
+
+    Returns:
+        list: The versions that were applied
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    applied = {row['version'] for row in cursor.fetchall()}
+
+    newly_applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        print(f"Applying migration {version}: {name}...")
+        migrate(cursor)
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+            (version, name)
+        )
+        commit()
+        newly_applied.append(version)
+    return newly_applied
+
+
+def run_migrations():
+    """Apply pending migrations using the application's database connection."""
+    cursor = db.get_cursor()
+    try:
+        applied = apply_migrations(cursor, db.commit)
+        if applied:
+            print(f"Applied migrations: {', '.join(str(v) for v in applied)}")
+        else:
+            print("Schema is up to date.")
+        return True
+    except Exception as e:
+        # Migrations committed before the failure stay recorded
+        db.rollback()
+        print(f"Error applying migrations: {str(e)}")
+        return False
+    finally:
+        cursor.close()
+        schema_info.invalidate()
+
+
+def hot_queries():
+    """
+    The hot queries issued by the models, with representative parameters.
+
+    Built from the models' own query constants and builders, so the plans
+    checked are the plans the application actually gets.
+
+    Returns:
+        list: (label, query, params) tuples
+    """
+    from .models import User, PC, Session, MenuItem, Order, DailyStats, DashboardSnapshot
+
+    session_page, session_page_params = Session.history_page_query(
+        after={'start_time': '2024-01-01', 'id': 1000})
+    order_page, order_page_params = Order.history_page_query(
+        after={'order_time': '2024-01-01', 'id': 1000})
+    two_ids = ", ".join(["%s"] * 2)
+    month = ('2024-01-01', '2024-02-01')
+    return [
+        ("active sessions", Session.ACTIVE_QUERY, ()),
+        ("active session by user", Session.ACTIVE_BY_USER_QUERY, (1,)),
+        ("overdue sessions", Session.OVERDUE_QUERY, ('2024-01-01 12:00:00',)),
+        ("active session by PC", Session.ACTIVE_BY_PC_QUERY, (1,)),
+        ("pending orders", Order.PENDING_QUERY, ()),
+        ("order history page", order_page, tuple(order_page_params)),
+        ("session history page", session_page, tuple(session_page_params)),
+        ("orders by session", Order.BY_SESSION_QUERY, (1,)),
+        ("order items by order", Order.ITEMS_QUERY.format(placeholders=two_ids), (1, 2)),
+        ("order item extras", Order.EXTRAS_QUERY.format(placeholders=two_ids), (1, 2)),
+        ("order item takeouts", Order.TAKEOUTS_QUERY.format(placeholders=two_ids), (1, 2)),
+        ("sessions by day", DailyStats.SESSIONS_BY_DAY_QUERY, month),
+        ("orders by day", DailyStats.ORDERS_BY_DAY_QUERY, month),
+        ("user by civil ID", User.BY_CIVIL_ID_QUERY, ('ADMIN',)),
+        ("user by phone", User.BY_PHONE_QUERY, ('0000000000',)),
+        ("PC by number", PC.BY_NUMBER_QUERY, (1,)),
+        ("registrations since", DashboardSnapshot.REGISTRATIONS_QUERY,
+         ('2024-01-31', '2024-02-01', '2024-01-29', '2024-01-01') + month),
+        ("menu items by category", MenuItem.BY_CATEGORY_KEY_QUERY, ('food',)),
+        ("daily stats range", DailyStats.RANGE_QUERY, month),
+        ("distinct users in date range", DailyStats.DISTINCT_USERS_QUERY, month),
+    ]
+
+
+def check_query_plans():
+    """
+    EXPLAIN each hot query and report any that scan a whole table.
+
+    Returns:
+        list: (label, table) pairs for every full scan found
+    """
+    queries = hot_queries()
+    full_scans = []
+    cursor = db.get_cursor()
+    try:
+        for label, query, params in queries:
+            cursor.execute(f"EXPLAIN {query}", params)
+            for row in cursor.fetchall():
+                if row.get('type') == 'ALL':
+                    full_scans.append((label, row.get('table')))
+                    print(f"FULL SCAN: {label} (table {row.get('table')})")
+    finally:
+        cursor.close()
+
+    if not full_scans:
+        print(f"All {len(queries)} hot queries use an index.")
+    return full_scans
+
+
+if __name__ == "__main__":
+    if '--check-plans' in sys.argv:
+        sys.exit(1 if check_query_plans() else 0)
+    sys.exit(0 if run_migrations() else 1)
@@ -1,12 +1,50 @@
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, date, timedelta
 from .db_connection import db
-from src.utils.helpers import check_password
+from .schema_info import schema_info
+from src.utils.helpers import check_password, day_range
+
+
+class PCUnavailableError(Exception):
+    """Raised when a session is assigned to a PC that is missing, occupied or in maintenance."""
+
+    def __init__(self, pc_id, status=None):
+        self.pc_id = pc_id
+        self.status = status
+        if status is None:
+            message = f"PC {pc_id} does not exist"
+        else:
+            message = f"PC {pc_id} is not available (status: {status})"
+        super().__init__(message)
+
+
+def _keyset_clause(time_column, id_column, after, descending):
+    """
+    Build the WHERE fragment that continues a (time, id) keyset page after a row.
+    
+    Args:
+        after (tuple): (time, id) of the last row already shown, or None
+    
+    Returns:
+        tuple: (sql, params, order by sql)
+    """
+    direction = "DESC" if descending else "ASC"
+    order_by = f"{time_column} {direction}, {id_column} {direction}"
+    if after is None:
+        return "", (), order_by
+    op = "<" if descending else ">"
+    sql = f" AND ({time_column} {op} %s OR ({time_column} = %s AND {id_column} {op} %s))"
+    return sql, (after[0], after[0], after[1]), order_by
 
 class User:
     """User model for the gaming lounge system."""
     
+    BY_CIVIL_ID_QUERY = "SELECT * FROM users WHERE civil_id = %s"
+    BY_PHONE_QUERY = "SELECT * FROM users WHERE phone = %s"
+    
     def __init__(self, id=None, name=None, civil_id=None, phone=None, created_at=None, 
-                 username=None, password_hash=None, email=None, is_admin=0):
+                 username=None, password_hash=None, email=None, is_admin=0, updated_at=None):
         self.id = id
         self.name = name
         self.civil_id = civil_id
@@ -20,20 +58,13 @@ class User:
     @staticmethod
     def create(name, civil_id, phone, username=None, password_hash=None, email=None, is_admin=0):
         """Create a new user in the database."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             INSERT INTO users (name, civil_id, phone, username, password_hash, email, is_admin)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
             """
             cursor.execute(query, (name, civil_id, phone, username, password_hash, email, is_admin))
-            db.commit()
             return cursor.lastrowid
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     @staticmethod
     def get_by_id(user_id):
@@ -54,8 +85,7 @@ class User:
         """Get a user by civil ID."""
         cursor = db.get_cursor()
         try:
-            query = "SELECT * FROM users WHERE civil_id = %s"
-            cursor.execute(query, (civil_id,))
+            cursor.execute(User.BY_CIVIL_ID_QUERY, (civil_id,))
             result = cursor.fetchone()
             if result:
                 return User(**result)
@@ -68,8 +98,7 @@ class User:
         """Get a user by phone number."""
         cursor = db.get_cursor()
         try:
-            query = "SELECT * FROM users WHERE phone = %s"
-            cursor.execute(query, (phone,))
+            cursor.execute(User.BY_PHONE_QUERY, (phone,))
             result = cursor.fetchone()
             if result:
                 return User(**result)
@@ -113,8 +142,7 @@ class User:
     
     def save(self):
         """Save changes to the user."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             UPDATE users 
             SET name = %s, civil_id = %s, phone = %s, username = %s, 
@@ -125,20 +153,16 @@ class User:
                 self.name, self.civil_id, self.phone, self.username,
                 self.password_hash, self.email, self.is_admin, self.id
             ))
-            db.commit()
             return True
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class PC:
     """PC model for the gaming lounge system."""
     
+    BY_NUMBER_QUERY = "SELECT * FROM pcs WHERE pc_number = %s"
+    
     def __init__(self, id=None, pc_number=None, is_occupied=False, 
-                 status='available', specs=None):
+                 status='available', specs=None, updated_at=None):
         self.id = id
         self.pc_number = pc_number
         self.is_occupied = is_occupied
@@ -176,8 +200,7 @@ class PC:
         """Get a PC by number."""
         cursor = db.get_cursor()
         try:
-            query = "SELECT * FROM pcs WHERE pc_number = %s"
-            cursor.execute(query, (pc_number,))
+            cursor.execute(PC.BY_NUMBER_QUERY, (pc_number,))
             result = cursor.fetchone()
             if result:
                 return PC(**result)
@@ -231,49 +254,69 @@ class PC:
     
     def update_status(self, status, is_occupied=None):
         """Update the status of a PC."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             if is_occupied is not None:
                 query = "UPDATE pcs SET status = %s, is_occupied = %s WHERE id = %s"
                 cursor.execute(query, (status, is_occupied, self.id))
             else:
                 query = "UPDATE pcs SET status = %s WHERE id = %s"
                 cursor.execute(query, (status, self.id))
-            db.commit()
             self.status = status
             if is_occupied is not None:
                 self.is_occupied = is_occupied
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     @staticmethod
     def create(pc_number, specs=None):
         """Create a new PC in the database."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             INSERT INTO pcs (pc_number, is_occupied, status, specs)
             VALUES (%s, %s, %s, %s)
             """
             cursor.execute(query, (pc_number, False, 'available', specs))
-            db.commit()
             return cursor.lastrowid
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class Session:
     """Session model for the gaming lounge system."""
     
+    # SET clauses for the status changes, shared by the single and bulk
+    # operations. MySQL applies single-table SET assignments left to right,
+    # so paused_at is still set while the end time and total are shifted.
+    PAUSE_SET = "status = 'paused', paused_at = COALESCE(paused_at, NOW())"
+    RESUME_SET = """
+        end_time = DATE_ADD(end_time, INTERVAL COALESCE(TIMESTAMPDIFF(SECOND, paused_at, NOW()), 0) SECOND),
+        paused_seconds_total = paused_seconds_total + COALESCE(TIMESTAMPDIFF(SECOND, paused_at, NOW()), 0),
+        paused_at = NULL,
+        status = 'active'
+    """
+    END_SET = """
+        paused_seconds_total = paused_seconds_total + COALESCE(TIMESTAMPDIFF(SECOND, paused_at, NOW()), 0),
+        paused_at = NULL,
+        status = %s
+    """
+    
+    # Hot lookups, also EXPLAINed by migrations.check_query_plans
+    ACTIVE_QUERY = """
+    SELECT s.*, u.name as user_name, p.pc_number 
+    FROM sessions s
+    JOIN users u ON s.user_id = u.id
+    JOIN pcs p ON s.pc_id = p.id
+    WHERE s.status = 'active'
+    ORDER BY s.start_time DESC
+    """
+    ACTIVE_BY_PC_QUERY = "SELECT * FROM sessions WHERE pc_id = %s AND status = 'active'"
+    ACTIVE_BY_USER_QUERY = "SELECT * FROM sessions WHERE user_id = %s AND status = 'active'"
+    OVERDUE_QUERY = """
+    SELECT COUNT(*) as overdue FROM sessions
+    WHERE status = 'active' AND end_time <= %s
+    FOR UPDATE
+    """
+    
     def __init__(self, id=None, user_id=None, pc_id=None, start_time=None, 
                  end_time=None, duration_minutes=None, status='active', 
-                 payment_method=None, payment_amount=None):
+                 payment_method=None, payment_amount=None, paused_at=None,
+                 paused_seconds_total=0, updated_at=None):
         self.id = id
         self.user_id = user_id
         self.pc_id = pc_id
@@ -283,40 +326,75 @@ class Session:
         self.status = status
         self.payment_method = payment_method
         self.payment_amount = payment_amount
+        self.paused_at = paused_at
+        self.paused_seconds_total = paused_seconds_total
+    
+    @staticmethod
+    def remaining_seconds_sql():
+        """
+        SQL expression for the seconds a session has left.
+        
+        A paused session's clock is stopped at ``paused_at``, so its remaining
+        time holds still until it is resumed.
+        """
+        return "TIMESTAMPDIFF(SECOND, COALESCE(paused_at, NOW()), end_time)"
     
     @staticmethod
     def create(user_id, pc_id, duration_minutes, payment_method, payment_amount):
-        """Create a new session."""
-        cursor = db.get_cursor()
-        try:
+        """
+        Create a new session on a free PC.
+        
+        The PC row is locked for the rest of the transaction, so concurrent
+        assignments to the same PC are serialized and only the first one
+        succeeds.
+        
+        Raises:
+            PCUnavailableError: If the PC does not exist, is not available
+                or already has an active session
+        """
+        with db.transaction() as cursor:
+            cursor.execute(
+                "SELECT status, is_occupied FROM pcs WHERE id = %s FOR UPDATE",
+                (pc_id,)
+            )
+            pc = cursor.fetchone()
+            if pc is None:
+                raise PCUnavailableError(pc_id)
+            if pc['is_occupied'] or pc['status'] != 'available':
+                raise PCUnavailableError(pc_id, pc['status'])
+            
+            # A session left running on a PC marked available still blocks it
+            cursor.execute(
+                "SELECT id FROM sessions WHERE pc_id = %s AND status IN ('active', 'paused') LIMIT 1",
+                (pc_id,)
+            )
+            if cursor.fetchone():
+                raise PCUnavailableError(pc_id, 'occupied')
+            
             # Calculate end time based on duration
             query = """
             INSERT INTO sessions (user_id, pc_id, duration_minutes, payment_method, payment_amount, 
                                  start_time, end_time, status)
             VALUES (%s, %s, %s, %s, %s, %s, DATE_ADD(%s, INTERVAL %s MINUTE), 'active')
             """
+            started = datetime.now()
             cursor.execute(query, (user_id, pc_id, duration_minutes, payment_method, 
-                                  payment_amount, datetime.now(), datetime.now(), duration_minutes))
+                                  payment_amount, started, started, duration_minutes))
             session_id = cursor.lastrowid
             
             # Update PC status
             query = "UPDATE pcs SET status = 'occupied', is_occupied = TRUE WHERE id = %s"
             cursor.execute(query, (pc_id,))
-            
-            db.commit()
-            
-            # After commit
+
+            DailyStats.record_session(cursor, user_id, started, payment_amount, duration_minutes)
+
+            # Read back the new row (same transaction, so it is visible)
             query = "SELECT * FROM sessions WHERE id = %s"
             cursor.execute(query, (session_id,))
             session_data = cursor.fetchone()
             if session_data:
                 return Session(**session_data)
             return session_id  # Fallback
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     @staticmethod
     def get_by_id(session_id):
@@ -337,29 +415,77 @@ class Session:
         """Get all active sessions."""
         cursor = db.get_cursor()
         try:
-            query = """
-            SELECT s.*, u.name as user_name, p.pc_number 
-            FROM sessions s
-            JOIN users u ON s.user_id = u.id
-            JOIN pcs p ON s.pc_id = p.id
-            WHERE s.status = 'active'
-            ORDER BY s.start_time DESC
-            """
-            cursor.execute(query)
+            cursor.execute(Session.ACTIVE_QUERY)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def get_history_page(after=None, limit=50, descending=True, search=None):
+        """
+        Get one page of completed and terminated sessions.
+        
+        Pages are keyed on (start_time, id) so later pages cost the same as
+        the first.
+        
+        Args:
+            after (dict, optional): The last row of the previous page
+            limit (int): Page size
+            descending (bool): Newest first when True
+            search (str, optional): Match a user name or PC number
+        
+        Returns:
+            list: Rows as dictionaries
+        """
+        query, params = Session.history_page_query(after, limit, descending, search)
+        cursor = db.get_cursor()
+        try:
+            cursor.execute(query, params)
             return cursor.fetchall()
         finally:
             cursor.close()
     
+    @staticmethod
+    def history_page_query(after=None, limit=50, descending=True, search=None):
+        """Build the query behind get_history_page; returns (query, params)."""
+        keyset, keyset_params, order_by = _keyset_clause(
+            's.start_time', 's.id',
+            (after['start_time'], after['id']) if after else None,
+            descending
+        )
+        params = list(keyset_params)
+        search_sql = ""
+        if search:
+            search_sql = " AND (u.name LIKE %s OR p.pc_number = %s)"
+            params.extend([f"%{search}%", search])
+        params.append(limit)
+        
+        query = f"""
+        SELECT 
+            s.id,
+            u.name as user_name,
+            p.pc_number,
+            s.start_time,
+            s.end_time,
+            s.duration_minutes,
+            s.status,
+            s.payment_method,
+            s.payment_amount
+        FROM sessions s
+        JOIN users u ON s.user_id = u.id
+        JOIN pcs p ON s.pc_id = p.id
+        WHERE s.status IN ('completed', 'terminated'){keyset}{search_sql}
+        ORDER BY {order_by}
+        LIMIT %s
+        """
+        return query, params
+    
     @staticmethod
     def get_active_by_pc(pc_id):
         """Get active session for a PC."""
         cursor = db.get_cursor()
         try:
-            query = """
-            SELECT * FROM sessions 
-            WHERE pc_id = %s AND status = 'active'
-            """
-            cursor.execute(query, (pc_id,))
+            cursor.execute(Session.ACTIVE_BY_PC_QUERY, (pc_id,))
             result = cursor.fetchone()
             if result:
                 return Session(**result)
@@ -372,11 +498,7 @@ class Session:
         """Get active session for a user."""
         cursor = db.get_cursor()
         try:
-            query = """
-            SELECT * FROM sessions 
-            WHERE user_id = %s AND status = 'active'
-            """
-            cursor.execute(query, (user_id,))
+            cursor.execute(Session.ACTIVE_BY_USER_QUERY, (user_id,))
             result = cursor.fetchone()
             if result:
                 return Session(**result)
@@ -384,30 +506,246 @@ class Session:
         finally:
             cursor.close()
     
-    def update_status(self, status):
-        """Update the status of a session."""
+    @staticmethod
+    def expire_overdue():
+        """
+        Complete every active session past its end time and free its PC.
+        
+        Runs as one transaction: an indexed count locks the overdue rows, and
+        when there are any, a single multi-table UPDATE completes them and
+        frees their PCs together.
+        
+        Returns:
+            int: The number of sessions completed
+        """
+        with db.transaction() as cursor:
+            cursor.execute("SELECT NOW() as cutoff")
+            cutoff = cursor.fetchone()['cutoff']
+            cursor.execute(Session.OVERDUE_QUERY, (cutoff,))
+            overdue = cursor.fetchone()['overdue']
+            if overdue:
+                cursor.execute("""
+                UPDATE sessions s
+                JOIN pcs p ON p.id = s.pc_id
+                SET s.status = 'completed', p.status = 'available', p.is_occupied = FALSE
+                WHERE s.status = 'active' AND s.end_time <= %s
+                """, (cutoff,))
+            return overdue
+    
+    @staticmethod
+    def complete_many(session_ids):
+        """
+        Complete the given active sessions and free their PCs in one statement.
+        
+        Sessions that are no longer active (ended elsewhere, paused) or whose
+        end time has not passed on the server clock (extended elsewhere since
+        the caller read them) are left alone, so a stale caller cannot end a
+        session early.
+        
+        Returns:
+            list: The IDs of the sessions actually completed
+        """
+        if not session_ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(session_ids))
+        with db.transaction() as cursor:
+            cursor.execute(f"""
+            SELECT id FROM sessions
+            WHERE id IN ({placeholders}) AND status = 'active' AND end_time <= NOW()
+            FOR UPDATE
+            """, tuple(session_ids))
+            ending = [row['id'] for row in cursor.fetchall()]
+            if ending:
+                placeholders = ", ".join(["%s"] * len(ending))
+                cursor.execute(f"""
+                UPDATE sessions s
+                JOIN pcs p ON p.id = s.pc_id
+                SET s.status = 'completed', p.status = 'available', p.is_occupied = FALSE
+                WHERE s.id IN ({placeholders})
+                """, tuple(ending))
+            return ending
+    
+    @staticmethod
+    def _bulk_filter(session_ids, statuses):
+        """
+        WHERE clause selecting sessions in ``statuses``, limited to
+        ``session_ids`` unless it is None.
+        
+        Returns:
+            tuple: (clause, params), or None when ``session_ids`` is empty
+        """
+        clause = "status IN ({})".format(", ".join(f"'{status}'" for status in statuses))
+        if session_ids is None:
+            return clause, ()
+        if not session_ids:
+            return None
+        clause += " AND id IN ({})".format(", ".join(["%s"] * len(session_ids)))
+        return clause, tuple(session_ids)
+    
+    @staticmethod
+    def terminate_all(session_ids=None):
+        """
+        Terminate active and paused sessions and free their PCs, in one transaction.
+        
+        Args:
+            session_ids (list, optional): Only these sessions; all when None
+        
+        Returns:
+            int: The number of sessions terminated
+        """
+        selected = Session._bulk_filter(session_ids, ('active', 'paused'))
+        if selected is None:
+            return 0
+        where, params = selected
+        with db.transaction() as cursor:
+            # Free the PCs while the sessions still match the filter
+            cursor.execute(f"""
+            UPDATE pcs SET status = 'available', is_occupied = FALSE
+            WHERE id IN (SELECT pc_id FROM sessions WHERE {where})
+            """, params)
+            cursor.execute(f"UPDATE sessions SET {Session.END_SET} WHERE {where}",
+                           ('terminated',) + params)
+            return cursor.rowcount
+    
+    @staticmethod
+    def extend_all(additional_minutes, payment_amount=0, session_ids=None):
+        """
+        Extend active and paused sessions by the same time, in one transaction.
+        
+        Args:
+            additional_minutes (int): Minutes added to each session
+            payment_amount (float): Amount charged to each session
+            session_ids (list, optional): Only these sessions; all when None
+        
+        Returns:
+            int: The number of sessions extended
+        """
+        selected = Session._bulk_filter(session_ids, ('active', 'paused'))
+        if selected is None:
+            return 0
+        where, params = selected
+        with db.transaction() as cursor:
+            cursor.execute(f"""
+            SELECT DATE(start_time) as day, COUNT(*) as sessions
+            FROM sessions WHERE {where}
+            GROUP BY DATE(start_time)
+            FOR UPDATE
+            """, params)
+            days = cursor.fetchall()
+            if not days:
+                return 0
+            cursor.execute(f"""
+            UPDATE sessions
+            SET end_time = DATE_ADD(end_time, INTERVAL %s MINUTE),
+                duration_minutes = duration_minutes + %s,
+                payment_amount = payment_amount + %s
+            WHERE {where}
+            """, (additional_minutes, additional_minutes, payment_amount) + params)
+            for day in days:
+                DailyStats.add(cursor, day['day'],
+                               gaming_revenue=payment_amount * day['sessions'],
+                               total_minutes=additional_minutes * day['sessions'])
+            return sum(day['sessions'] for day in days)
+    
+    @staticmethod
+    def pause_all(session_ids=None):
+        """
+        Pause active sessions, in one statement.
+        
+        Args:
+            session_ids (list, optional): Only these sessions; all when None
+        
+        Returns:
+            int: The number of sessions paused
+        """
+        selected = Session._bulk_filter(session_ids, ('active',))
+        if selected is None:
+            return 0
+        where, params = selected
+        with db.transaction() as cursor:
+            cursor.execute(f"UPDATE sessions SET {Session.PAUSE_SET} WHERE {where}", params)
+            return cursor.rowcount
+    
+    @staticmethod
+    def resume_all(session_ids=None):
+        """
+        Resume paused sessions, each getting back the time it was paused, in one statement.
+        
+        Args:
+            session_ids (list, optional): Only these sessions; all when None
+        
+        Returns:
+            int: The number of sessions resumed
+        """
+        selected = Session._bulk_filter(session_ids, ('paused',))
+        if selected is None:
+            return 0
+        where, params = selected
+        with db.transaction() as cursor:
+            cursor.execute(f"UPDATE sessions SET {Session.RESUME_SET} WHERE {where}", params)
+            return cursor.rowcount
+    
+    @staticmethod
+    def get_countdown(session_id):
+        """
+        Get a session's status and seconds left, measured on the server clock.
+        
+        Cheap enough (a primary key lookup) for clients to poll, so they pick
+        up extensions, pauses and terminations made elsewhere.
+        
+        Returns:
+            dict: status, end_time and remaining_seconds, or None if not found
+        """
         cursor = db.get_cursor()
         try:
-            query = "UPDATE sessions SET status = %s WHERE id = %s"
-            cursor.execute(query, (status, self.id))
+            query = f"""
+            SELECT status, end_time, {Session.remaining_seconds_sql()} as remaining_seconds
+            FROM sessions WHERE id = %s
+            """
+            cursor.execute(query, (session_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+    
+    def update_status(self, status):
+        """
+        Update the status of a session.
+        
+        Pausing stops the session's clock; resuming moves the end time back by
+        however long it was paused, so paused customers lose no time. Ending a
+        paused session adds the interval to ``paused_seconds_total`` without
+        moving the end time. All of it is computed in SQL against the server
+        clock.
+        """
+        with db.transaction() as cursor:
+            if status == 'paused':
+                cursor.execute(f"UPDATE sessions SET {Session.PAUSE_SET} WHERE id = %s", (self.id,))
+            elif status == 'active':
+                cursor.execute(f"UPDATE sessions SET {Session.RESUME_SET} WHERE id = %s", (self.id,))
+            else:
+                cursor.execute(f"UPDATE sessions SET {Session.END_SET} WHERE id = %s", (status, self.id))
             
             # If session is completed or terminated, free up the PC
             if status in ('completed', 'terminated'):
                 query = "UPDATE pcs SET status = 'available', is_occupied = FALSE WHERE id = %s"
                 cursor.execute(query, (self.pc_id,))
             
-            db.commit()
+            # Read back the clock columns the statements above changed
+            cursor.execute(
+                "SELECT end_time, paused_at, paused_seconds_total FROM sessions WHERE id = %s",
+                (self.id,)
+            )
+            row = cursor.fetchone()
+            if row:
+                self.end_time = row['end_time']
+                self.paused_at = row['paused_at']
+                self.paused_seconds_total = row['paused_seconds_total']
+            
             self.status = status
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     def extend_time(self, additional_minutes, payment_amount, payment_method):
         """Extend the session time."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             UPDATE sessions 
             SET end_time = DATE_ADD(end_time, INTERVAL %s MINUTE),
@@ -417,21 +755,28 @@ class Session:
             """
             cursor.execute(query, (additional_minutes, additional_minutes, 
                                   payment_amount, self.id))
-            db.commit()
+            DailyStats.add(cursor, self.start_time, gaming_revenue=payment_amount,
+                           total_minutes=additional_minutes)
             self.duration_minutes += additional_minutes
             self.payment_amount += payment_amount
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class MenuItem:
     """Menu item model for the gaming lounge system."""
     
+    # Canonical categories and the free-text category names that map to them,
+    # checked in this order. The category_key column is generated from these.
+    CATEGORY_ALIASES = (
+        ('food', ('food',)),
+        ('drink', ('drink', 'beverage')),
+        ('accessory', ('accessory', 'accessories')),
+        ('service', ('service', 'services')),
+    )
+    
+    BY_CATEGORY_KEY_QUERY = "SELECT * FROM menu_items WHERE category_key = %s AND available = TRUE ORDER BY name"
+    
     def __init__(self, id=None, name=None, description=None, price=None, 
-                 category=None, available=True, image_path=None):
+                 category=None, available=True, image_path=None, category_key=None):
         self.id = id
         self.name = name
         self.description = description
@@ -439,6 +784,73 @@ class MenuItem:
         self.category = category
         self.available = available
         self.image_path = image_path
+        self.category_key = category_key or MenuItem.normalize_category(category)
+    
+    @staticmethod
+    def normalize_category(category):
+        """Map a free-text category to its canonical name, or None."""
+        category = (category or '').strip().lower()
+        for key, _ in MenuItem.CATEGORY_ALIASES:
+            if category == key:
+                return key
+        for key, aliases in MenuItem.CATEGORY_ALIASES:
+            if any(alias in category for alias in aliases):
+                return key
+        return None
+    
+    @staticmethod
+    def category_key_sql(column='category'):
+        """SQL expression equivalent to normalize_category() on ``column``."""
+        keys = ", ".join(f"'{key}'" for key, _ in MenuItem.CATEGORY_ALIASES)
+        cases = [f"WHEN LOWER(TRIM({column})) IN ({keys}) THEN LOWER(TRIM({column}))"]
+        for key, aliases in MenuItem.CATEGORY_ALIASES:
+            matches = " OR ".join(f"LOWER({column}) LIKE '%{alias}%'" for alias in aliases)
+            cases.append(f"WHEN {matches} THEN '{key}'")
+        return f"CASE {' '.join(cases)} ELSE NULL END"
+    
+    @staticmethod
+    def get_menu_by_category():
+        """
+        Get every orderable menu item, grouped by canonical category, in one query.
+        
+        Adapts to older schemas that name the availability or image column
+        differently. Image paths are returned under ``image_path``.
+        
+        Returns:
+            dict: Canonical category -> list of row dictionaries, ordered by name
+        """
+        availability_column = schema_info.first_column(
+            'menu_items', 'available', 'is_active', 'is_available'
+        )
+        image_column = schema_info.first_column('menu_items', 'image_path', 'image')
+        has_category_key = schema_info.has_column('menu_items', 'category_key')
+        
+        query = "SELECT id, name, price, description, category"
+        if image_column:
+            query += f", {image_column} as image_path"
+        if has_category_key:
+            query += ", category_key"
+        query += " FROM menu_items WHERE 1=1"
+        if has_category_key:
+            query += " AND category_key IS NOT NULL"
+        if availability_column:
+            query += f" AND {availability_column} = TRUE"
+        query += " ORDER BY name"
+        
+        cursor = db.get_cursor()
+        try:
+            cursor.execute(query)
+            results = cursor.fetchall()
+        finally:
+            cursor.close()
+        
+        menu = {key: [] for key, _ in MenuItem.CATEGORY_ALIASES}
+        for result in results:
+            # Databases not yet migrated have no category_key column
+            key = result.get('category_key') or MenuItem.normalize_category(result['category'])
+            if key:
+                menu[key].append(result)
+        return menu
     
     @staticmethod
     def get_all():
@@ -457,7 +869,10 @@ class MenuItem:
         """Get menu items by category."""
         cursor = db.get_cursor()
         try:
-            query = "SELECT * FROM menu_items WHERE category = %s AND available = TRUE ORDER BY name"
+            if schema_info.has_column('menu_items', 'category_key'):
+                query = MenuItem.BY_CATEGORY_KEY_QUERY
+            else:
+                query = "SELECT * FROM menu_items WHERE category = %s AND available = TRUE ORDER BY name"
             cursor.execute(query, (category,))
             results = cursor.fetchall()
             return [MenuItem(**result) for result in results]
@@ -481,25 +896,17 @@ class MenuItem:
     @staticmethod
     def create(name, description, price, category, image_path=None):
         """Create a new menu item."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             INSERT INTO menu_items (name, description, price, category, image_path)
             VALUES (%s, %s, %s, %s, %s)
             """
             cursor.execute(query, (name, description, price, category, image_path))
-            db.commit()
             return cursor.lastrowid
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     def update(self):
         """Update a menu item."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             UPDATE menu_items 
             SET name = %s, description = %s, price = %s, category = %s, 
@@ -509,12 +916,6 @@ class MenuItem:
             cursor.execute(query, (self.name, self.description, self.price, 
                                   self.category, self.available, 
                                   self.image_path, self.id))
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class MenuItemExtra:
@@ -556,50 +957,29 @@ class MenuItemExtra:
     @staticmethod
     def create(menu_item_id, name, price):
         """Create a new menu item extra."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             INSERT INTO item_extras (menu_item_id, name, price)
             VALUES (%s, %s, %s)
             """
             cursor.execute(query, (menu_item_id, name, price))
-            db.commit()
             return cursor.lastrowid
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     def update(self):
         """Update a menu item extra."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             UPDATE item_extras 
             SET name = %s, price = %s, available = %s
             WHERE id = %s
             """
             cursor.execute(query, (self.name, self.price, self.available, self.id))
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     def delete(self):
         """Delete a menu item extra."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = "DELETE FROM item_extras WHERE id = %s"
             cursor.execute(query, (self.id,))
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class MenuItemTakeout:
@@ -640,67 +1020,82 @@ class MenuItemTakeout:
     @staticmethod
     def create(menu_item_id, name):
         """Create a new menu item takeout."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             INSERT INTO item_takeouts (menu_item_id, name)
             VALUES (%s, %s)
             """
             cursor.execute(query, (menu_item_id, name))
-            db.commit()
             return cursor.lastrowid
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     def update(self):
         """Update a menu item takeout."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = """
             UPDATE item_takeouts 
             SET name = %s, available = %s
             WHERE id = %s
             """
             cursor.execute(query, (self.name, self.available, self.id))
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
     def delete(self):
         """Delete a menu item takeout."""
-        cursor = db.get_cursor()
-        try:
+        with db.transaction() as cursor:
             query = "DELETE FROM item_takeouts WHERE id = %s"
             cursor.execute(query, (self.id,))
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class Order:
     """Order model for the gaming lounge system."""
     
+    # Hot lookups, also EXPLAINed by migrations.check_query_plans
+    BY_SESSION_QUERY = "SELECT * FROM orders WHERE session_id = %s ORDER BY order_time DESC"
+    PENDING_QUERY = """
+    SELECT o.*, s.id as session_id, u.name as user_name, p.pc_number
+    FROM orders o
+    JOIN sessions s ON o.session_id = s.id
+    JOIN users u ON s.user_id = u.id
+    JOIN pcs p ON s.pc_id = p.id
+    WHERE o.status = 'pending' OR o.status = 'preparing' OR o.status = 'ready'
+    ORDER BY o.order_time
+    """
+    # Child rows of a batch of orders; format {placeholders} with one %s per ID
+    ITEMS_QUERY = """
+    SELECT oi.*, mi.name, mi.category
+    FROM order_items oi
+    JOIN menu_items mi ON oi.menu_item_id = mi.id
+    WHERE oi.order_id IN ({placeholders})
+    ORDER BY oi.id
+    """
+    EXTRAS_QUERY = """
+    SELECT oie.*, ie.name, ie.price
+    FROM order_item_extras oie
+    JOIN item_extras ie ON oie.extra_id = ie.id
+    WHERE oie.order_item_id IN ({placeholders})
+    ORDER BY oie.id
+    """
+    TAKEOUTS_QUERY = """
+    SELECT oit.*, it.name
+    FROM order_item_takeouts oit
+    JOIN item_takeouts it ON oit.takeout_id = it.id
+    WHERE oit.order_item_id IN ({placeholders})
+    ORDER BY oit.id
+    """
+    
     def __init__(self, id=None, session_id=None, status='pending', 
-                 order_time=None, delivery_time=None, total_amount=0):
+                 order_time=None, delivery_time=None, total_amount=0, client_token=None,
+                 updated_at=None):
         self.id = id
         self.session_id = session_id
         self.status = status
         self.order_time = order_time or datetime.now()
         self.delivery_time = delivery_time
         self.total_amount = total_amount
+        self.client_token = client_token
         self.items = []
     
     @staticmethod
-    def create(session_id, items):
+    def create(session_id, items, client_token=None, order_time=None):
         """
         Create a new order.
         
@@ -711,87 +1106,179 @@ class Order:
                 - quantity: The quantity
                 - extras: List of extra IDs (optional)
                 - takeouts: List of takeout IDs (optional)
+            client_token (str, optional): Unique token chosen by the client;
+                creating an order with a token that already exists returns
+                the existing order's ID, so retries never duplicate an order
+            order_time (datetime, optional): When the customer placed the
+                order, for orders replayed from the launcher's queue;
+                defaults to now
+
+        Prices are resolved with one bulk query per table and child rows are
+        written with executemany, so the number of round-trips does not grow
+        with the size of the basket.
         """
-        cursor = db.get_cursor()
-        try:
+        order_time = order_time or datetime.now()
+        with db.transaction() as cursor:
+            if client_token and schema_info.has_column('orders', 'client_token'):
+                cursor.execute("SELECT id FROM orders WHERE client_token = %s", (client_token,))
+                existing = cursor.fetchone()
+                if existing:
+                    return existing['id']
+            else:
+                client_token = None
+
+            # Snapshot every price the order needs with one query per table,
+            # so the total and the stored line prices come from the same read
+            menu_item_ids = list({item['menu_item_id'] for item in items})
+            extra_ids = list({extra_id for item in items for extra_id in item.get('extras', [])})
+
+            item_prices = {}
+            if menu_item_ids:
+                placeholders = ", ".join(["%s"] * len(menu_item_ids))
+                cursor.execute(
+                    f"SELECT id, price FROM menu_items WHERE id IN ({placeholders})",
+                    menu_item_ids
+                )
+                item_prices = {row['id']: row['price'] for row in cursor.fetchall()}
+
+            extra_prices = {}
+            if extra_ids:
+                placeholders = ", ".join(["%s"] * len(extra_ids))
+                cursor.execute(
+                    f"SELECT id, price FROM item_extras WHERE id IN ({placeholders})",
+                    extra_ids
+                )
+                extra_prices = {row['id']: row['price'] for row in cursor.fetchall()}
+
+            # Items whose menu item no longer exists are skipped, as are unknown extras
+            lines = [item for item in items if item['menu_item_id'] in item_prices]
+
             # Calculate total amount
             total_amount = 0
-            for item in items:
-                menu_item_id = item['menu_item_id']
+            for item in lines:
                 quantity = item['quantity']
-                extras = item.get('extras', [])
-                
-                # Get menu item price
-                cursor.execute("SELECT price FROM menu_items WHERE id = %s", (menu_item_id,))
-                result = cursor.fetchone()
-                if result:
-                    item_price = result['price']
-                    item_total = item_price * quantity
-                    
-                    # Add extras cost
-                    for extra_id in extras:
-                        cursor.execute("SELECT price FROM item_extras WHERE id = %s", (extra_id,))
-                        extra_result = cursor.fetchone()
-                        if extra_result:
-                            item_total += extra_result['price'] * quantity
-                    
-                    total_amount += item_total
+                item_total = item_prices[item['menu_item_id']] * quantity
+                for extra_id in item.get('extras', []):
+                    if extra_id in extra_prices:
+                        item_total += extra_prices[extra_id] * quantity
+                total_amount += item_total
             
             # Create order
-            cursor.execute("""
-            INSERT INTO orders (session_id, order_time, total_amount)
-            VALUES (%s, %s, %s)
-            """, (session_id, datetime.now(), total_amount))
+            if client_token:
+                cursor.execute("""
+                INSERT INTO orders (session_id, order_time, total_amount, client_token)
+                VALUES (%s, %s, %s, %s)
+                """, (session_id, order_time, total_amount, client_token))
+            else:
+                cursor.execute("""
+                INSERT INTO orders (session_id, order_time, total_amount)
+                VALUES (%s, %s, %s)
+                """, (session_id, order_time, total_amount))
             
             order_id = cursor.lastrowid
+            DailyStats.add(cursor, order_time, food_revenue=total_amount)
+            if not lines:
+                return order_id
             
-            # Add order items with extras and takeouts
-            for item in items:
-                menu_item_id = item['menu_item_id']
-                quantity = item['quantity']
-                extras = item.get('extras', [])
-                takeouts = item.get('takeouts', [])
-                
-                # Get menu item price
-                cursor.execute("SELECT price FROM menu_items WHERE id = %s", (menu_item_id,))
-                result = cursor.fetchone()
-                if result:
-                    price = result['price']
-                    
-                    # Insert order item
-                    cursor.execute("""
-                    INSERT INTO order_items (order_id, menu_item_id, quantity, price)
-                    VALUES (%s, %s, %s, %s)
-                    """, (order_id, menu_item_id, quantity, price))
-                    
-                    order_item_id = cursor.lastrowid
-                    
-                    # Add extras
-                    for extra_id in extras:
-                        cursor.execute("SELECT price FROM item_extras WHERE id = %s", (extra_id,))
-                        extra_result = cursor.fetchone()
-                        if extra_result:
-                            extra_price = extra_result['price']
-                            cursor.execute("""
-                            INSERT INTO order_item_extras (order_item_id, extra_id, price)
-                            VALUES (%s, %s, %s)
-                            """, (order_item_id, extra_id, extra_price))
-                    
-                    # Add takeouts
-                    for takeout_id in takeouts:
-                        cursor.execute("""
-                        INSERT INTO order_item_takeouts (order_item_id, takeout_id)
-                        VALUES (%s, %s)
-                        """, (order_item_id, takeout_id))
+            # Add order items
+            cursor.executemany("""
+            INSERT INTO order_items (order_id, menu_item_id, quantity, price)
+            VALUES (%s, %s, %s, %s)
+            """, [
+                (order_id, item['menu_item_id'], item['quantity'], item_prices[item['menu_item_id']])
+                for item in lines
+            ])
+
+            # Rows were inserted in order, so ascending IDs line up with `lines`
+            cursor.execute("SELECT id FROM order_items WHERE order_id = %s ORDER BY id", (order_id,))
+            order_item_ids = [row['id'] for row in cursor.fetchall()]
+
+            extra_rows = []
+            takeout_rows = []
+            for order_item_id, item in zip(order_item_ids, lines):
+                for extra_id in item.get('extras', []):
+                    if extra_id in extra_prices:
+                        extra_rows.append((order_item_id, extra_id, extra_prices[extra_id]))
+                for takeout_id in item.get('takeouts', []):
+                    takeout_rows.append((order_item_id, takeout_id))
+
+            # Add extras
+            if extra_rows:
+                cursor.executemany("""
+                INSERT INTO order_item_extras (order_item_id, extra_id, price)
+                VALUES (%s, %s, %s)
+                """, extra_rows)
+
+            # Add takeouts
+            if takeout_rows:
+                cursor.executemany("""
+                INSERT INTO order_item_takeouts (order_item_id, takeout_id)
+                VALUES (%s, %s)
+                """, takeout_rows)
             
-            db.commit()
             return order_id
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
     
+    @staticmethod
+    def _load_items(cursor, orders):
+        """
+        Attach items, extras and takeouts to a list of orders.
+
+        Uses three IN (...) queries no matter how many orders or items there
+        are, then stitches the rows together in memory.
+        """
+        for order in orders:
+            order.items = []
+        if not orders:
+            return orders
+
+        orders_by_id = {order.id: order for order in orders}
+        order_ids = list(orders_by_id)
+        placeholders = ", ".join(["%s"] * len(order_ids))
+        cursor.execute(Order.ITEMS_QUERY.format(placeholders=placeholders), order_ids)
+        order_items = cursor.fetchall()
+        if not order_items:
+            return orders
+
+        items_by_id = {}
+        for item in order_items:
+            item_dict = dict(item)
+            item_dict['extras'] = []
+            item_dict['takeouts'] = []
+            items_by_id[item_dict['id']] = item_dict
+            orders_by_id[item_dict['order_id']].items.append(item_dict)
+
+        item_ids = list(items_by_id)
+        placeholders = ", ".join(["%s"] * len(item_ids))
+
+        # Get extras for all order items
+        cursor.execute(Order.EXTRAS_QUERY.format(placeholders=placeholders), item_ids)
+        for extra in cursor.fetchall():
+            items_by_id[extra['order_item_id']]['extras'].append(extra)
+
+        # Get takeouts for all order items
+        cursor.execute(Order.TAKEOUTS_QUERY.format(placeholders=placeholders), item_ids)
+        for takeout in cursor.fetchall():
+            items_by_id[takeout['order_item_id']]['takeouts'].append(takeout)
+
+        return orders
+
+    @staticmethod
+    def _from_joined_row(result):
+        """Build an Order from a row joined with its session's user and PC."""
+        order = Order(
+            id=result['id'],
+            session_id=result['session_id'],
+            status=result['status'],
+            order_time=result['order_time'],
+            delivery_time=result['delivery_time'],
+            total_amount=result['total_amount']
+        )
+
+        # Add additional info
+        order.user_name = result['user_name']
+        order.pc_number = result['pc_number']
+        return order
+
     @staticmethod
     def get_by_id(order_id):
         """Get an order by ID with additional details."""
@@ -810,56 +1297,8 @@ class Order:
             if not result:
                 return None
 
-            order = Order(
-                id=result['id'],
-                session_id=result['session_id'],
-                status=result['status'],
-                order_time=result['order_time'],
-                delivery_time=result['delivery_time'],
-                total_amount=result['total_amount']
-            )
-
-            # Add additional info
-            order.user_name = result['user_name']
-            order.pc_number = result['pc_number']
-
-            # Get order items with extras and takeouts
-            query = """
-            SELECT oi.*, mi.name, mi.category
-            FROM order_items oi
-            JOIN menu_items mi ON oi.menu_item_id = mi.id
-            WHERE oi.order_id = %s
-            """
-            cursor.execute(query, (order.id,))
-            order_items = cursor.fetchall()
-            
-            # Process order items and add extras/takeouts
-            order.items = []
-            for item in order_items:
-                item_dict = dict(item)
-                
-                # Get extras for this order item
-                extras_query = """
-                SELECT oie.*, ie.name, ie.price
-                FROM order_item_extras oie
-                JOIN item_extras ie ON oie.extra_id = ie.id
-                WHERE oie.order_item_id = %s
-                """
-                cursor.execute(extras_query, (item['id'],))
-                item_dict['extras'] = cursor.fetchall()
-                
-                # Get takeouts for this order item
-                takeouts_query = """
-                SELECT oit.*, it.name
-                FROM order_item_takeouts oit
-                JOIN item_takeouts it ON oit.takeout_id = it.id
-                WHERE oit.order_item_id = %s
-                """
-                cursor.execute(takeouts_query, (item['id'],))
-                item_dict['takeouts'] = cursor.fetchall()
-                
-                order.items.append(item_dict)
-
+            order = Order._from_joined_row(result)
+            Order._load_items(cursor, [order])
             return order
         finally:
             cursor.close()
@@ -869,54 +1308,11 @@ class Order:
         """Get orders for a session."""
         cursor = db.get_cursor()
         try:
-            query = "SELECT * FROM orders WHERE session_id = %s ORDER BY order_time DESC"
-            cursor.execute(query, (session_id,))
+            cursor.execute(Order.BY_SESSION_QUERY, (session_id,))
             results = cursor.fetchall()
             
-            orders = []
-            for result in results:
-                order = Order(**result)
-                
-                # Get order items with extras and takeouts
-                query = """
-                SELECT oi.*, mi.name, mi.category
-                FROM order_items oi
-                JOIN menu_items mi ON oi.menu_item_id = mi.id
-                WHERE oi.order_id = %s
-                """
-                cursor.execute(query, (order.id,))
-                order_items = cursor.fetchall()
-                
-                # Process order items and add extras/takeouts
-                order.items = []
-                for item in order_items:
-                    item_dict = dict(item)
-                    
-                    # Get extras for this order item
-                    extras_query = """
-                    SELECT oie.*, ie.name, ie.price
-                    FROM order_item_extras oie
-                    JOIN item_extras ie ON oie.extra_id = ie.id
-                    WHERE oie.order_item_id = %s
-                    """
-                    cursor.execute(extras_query, (item['id'],))
-                    item_dict['extras'] = cursor.fetchall()
-                    
-                    # Get takeouts for this order item
-                    takeouts_query = """
-                    SELECT oit.*, it.name
-                    FROM order_item_takeouts oit
-                    JOIN item_takeouts it ON oit.takeout_id = it.id
-                    WHERE oit.order_item_id = %s
-                    """
-                    cursor.execute(takeouts_query, (item['id'],))
-                    item_dict['takeouts'] = cursor.fetchall()
-                    
-                    order.items.append(item_dict)
-                
-                orders.append(order)
-            
-            return orders
+            orders = [Order(**result) for result in results]
+            return Order._load_items(cursor, orders)
         finally:
             cursor.close()
     
@@ -925,80 +1321,76 @@ class Order:
         """Get all pending orders."""
         cursor = db.get_cursor()
         try:
-            query = """
-            SELECT o.*, s.id as session_id, u.name as user_name, p.pc_number
-            FROM orders o
-            JOIN sessions s ON o.session_id = s.id
-            JOIN users u ON s.user_id = u.id
-            JOIN pcs p ON s.pc_id = p.id
-            WHERE o.status = 'pending' OR o.status = 'preparing' OR o.status = 'ready'
-            ORDER BY o.order_time
-            """
-            cursor.execute(query)
+            cursor.execute(Order.PENDING_QUERY)
             results = cursor.fetchall()
             
-            orders = []
-            for result in results:
-                order = Order(
-                    id=result['id'],
-                    session_id=result['session_id'],
-                    status=result['status'],
-                    order_time=result['order_time'],
-                    delivery_time=result['delivery_time'],
-                    total_amount=result['total_amount']
-                )
-                
-                # Add additional info
-                order.user_name = result['user_name']
-                order.pc_number = result['pc_number']
-                
-                # Get order items with extras and takeouts
-                query = """
-                SELECT oi.*, mi.name, mi.category
-                FROM order_items oi
-                JOIN menu_items mi ON oi.menu_item_id = mi.id
-                WHERE oi.order_id = %s
-                """
-                cursor.execute(query, (order.id,))
-                order_items = cursor.fetchall()
-                
-                # Process order items and add extras/takeouts
-                order.items = []
-                for item in order_items:
-                    item_dict = dict(item)
-                    
-                    # Get extras for this order item
-                    extras_query = """
-                    SELECT oie.*, ie.name, ie.price
-                    FROM order_item_extras oie
-                    JOIN item_extras ie ON oie.extra_id = ie.id
-                    WHERE oie.order_item_id = %s
-                    """
-                    cursor.execute(extras_query, (item['id'],))
-                    item_dict['extras'] = cursor.fetchall()
-                    
-                    # Get takeouts for this order item
-                    takeouts_query = """
-                    SELECT oit.*, it.name
-                    FROM order_item_takeouts oit
-                    JOIN item_takeouts it ON oit.takeout_id = it.id
-                    WHERE oit.order_item_id = %s
-                    """
-                    cursor.execute(takeouts_query, (item['id'],))
-                    item_dict['takeouts'] = cursor.fetchall()
-                    
-                    order.items.append(item_dict)
-                
-                orders.append(order)
-            
-            return orders
+            orders = [Order._from_joined_row(result) for result in results]
+            return Order._load_items(cursor, orders)
         finally:
             cursor.close()
     
-    def update_status(self, status):
-        """Update the status of an order."""
+    @staticmethod
+    def get_history_page(after=None, limit=50, descending=True, search=None):
+        """
+        Get one page of delivered and cancelled orders.
+        
+        Pages are keyed on (order_time, id) so later pages cost the same as
+        the first.
+        
+        Args:
+            after (dict, optional): The last row of the previous page
+            limit (int): Page size
+            descending (bool): Newest first when True
+            search (str, optional): Match an order number, user name or PC number
+        
+        Returns:
+            list: Rows as dictionaries
+        """
+        query, params = Order.history_page_query(after, limit, descending, search)
         cursor = db.get_cursor()
         try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def history_page_query(after=None, limit=50, descending=True, search=None):
+        """Build the query behind get_history_page; returns (query, params)."""
+        keyset, keyset_params, order_by = _keyset_clause(
+            'o.order_time', 'o.id',
+            (after['order_time'], after['id']) if after else None,
+            descending
+        )
+        params = list(keyset_params)
+        search_sql = ""
+        if search:
+            search_sql = " AND (o.id = %s OR u.name LIKE %s OR p.pc_number = %s)"
+            params.extend([search, f"%{search}%", search])
+        params.append(limit)
+        
+        query = f"""
+        SELECT 
+            o.id,
+            p.pc_number,
+            u.name as user_name,
+            o.order_time,
+            o.delivery_time,
+            o.total_amount,
+            o.status
+        FROM orders o
+        JOIN sessions s ON o.session_id = s.id
+        JOIN users u ON s.user_id = u.id
+        JOIN pcs p ON s.pc_id = p.id
+        WHERE o.status IN ('delivered', 'cancelled'){keyset}{search_sql}
+        ORDER BY {order_by}
+        LIMIT %s
+        """
+        return query, params
+    
+    def update_status(self, status):
+        """Update the status of an order."""
+        with db.transaction() as cursor:
             if status == 'delivered':
                 query = """
                 UPDATE orders 
@@ -1013,15 +1405,9 @@ class Order:
                 WHERE id = %s
                 """
                 cursor.execute(query, (status, self.id))
-            db.commit()
             self.status = status
             if status == 'delivered':
                 self.delivery_time = datetime.now()
-        except Exception as e:
-            db.rollback()
-            raise e
-        finally:
-            cursor.close()
 
 
 class Game:
@@ -1073,4 +1459,434 @@ class Game:
             results = cursor.fetchall()
             return [Game(**result) for result in results]
         finally:
-            cursor.close() 
\ No newline at end of file
+            cursor.close() 
+
+class DailyStats:
+    """
+    Per-day rollup of revenue and usage, stored in the daily_stats table.
+
+    Writers add their change to the day's row with add() or record_session(),
+    a single upsert that reads no sessions or orders, so concurrent writers
+    only ever wait on that one row and cannot deadlock on each other's
+    uncommitted rows. Which users were active on which day is kept in
+    daily_user_activity, so distinct users over any range are counted from
+    one row per user per day. catch_up(), run by the sweeper and when the
+    admin panel opens, rebuilds recent days from the raw tables to pick up
+    edits made outside the models. Reports read a handful of rollup rows
+    instead of re-aggregating the raw sessions and orders tables.
+    """
+
+    # Aggregates rebuild_range writes, and the report reads; all are also
+    # EXPLAINed by migrations.check_query_plans
+    SESSIONS_BY_DAY_QUERY = """
+    SELECT DATE(start_time), SUM(payment_amount), COUNT(*), COUNT(DISTINCT user_id),
+           COALESCE(SUM(duration_minutes), 0)
+    FROM sessions
+    WHERE start_time >= %s AND start_time < %s
+    GROUP BY DATE(start_time)
+    """
+    ORDERS_BY_DAY_QUERY = """
+    SELECT DATE(order_time), SUM(total_amount)
+    FROM orders
+    WHERE order_time >= %s AND order_time < %s
+    GROUP BY DATE(order_time)
+    """
+    RANGE_QUERY = """
+    SELECT * FROM daily_stats
+    WHERE stat_date >= %s AND stat_date < %s
+    ORDER BY stat_date
+    """
+    DISTINCT_USERS_QUERY = """
+    SELECT COUNT(DISTINCT user_id) as count
+    FROM daily_user_activity
+    WHERE stat_date >= %s AND stat_date < %s
+    """
+
+    def __init__(self, stat_date=None, gaming_revenue=0, food_revenue=0, session_count=0,
+                 distinct_users=0, total_minutes=0, updated_at=None):
+        self.stat_date = stat_date
+        self.gaming_revenue = gaming_revenue
+        self.food_revenue = food_revenue
+        self.session_count = session_count
+        self.distinct_users = distinct_users
+        self.total_minutes = total_minutes
+        self.updated_at = updated_at
+
+    @staticmethod
+    def rebuild_range(cursor, start_date, end_date):
+        """
+        Recompute the rollup rows for an inclusive range of days.
+
+        Runs on the caller's cursor so it joins the caller's transaction.
+        """
+        range_start, range_end = day_range(start_date, end_date)
+
+        # Days whose sessions/orders have all gone must drop back to zero
+        cursor.execute(
+            "DELETE FROM daily_stats WHERE stat_date >= %s AND stat_date < %s",
+            (range_start.date(), range_end.date())
+        )
+        cursor.execute(
+            "DELETE FROM daily_user_activity WHERE stat_date >= %s AND stat_date < %s",
+            (range_start.date(), range_end.date())
+        )
+        cursor.execute("""
+        INSERT INTO daily_user_activity (stat_date, user_id)
+        SELECT DISTINCT DATE(start_time), user_id
+        FROM sessions
+        WHERE start_time >= %s AND start_time < %s
+        """, (range_start, range_end))
+
+        cursor.execute(
+            "INSERT INTO daily_stats (stat_date, gaming_revenue, session_count, distinct_users, total_minutes)"
+            + DailyStats.SESSIONS_BY_DAY_QUERY,
+            (range_start, range_end)
+        )
+
+        cursor.execute(
+            "INSERT INTO daily_stats (stat_date, food_revenue)"
+            + DailyStats.ORDERS_BY_DAY_QUERY
+            + "ON DUPLICATE KEY UPDATE food_revenue = VALUES(food_revenue)",
+            (range_start, range_end)
+        )
+
+    @staticmethod
+    def add(cursor, day, gaming_revenue=0, food_revenue=0, session_count=0,
+            distinct_users=0, total_minutes=0):
+        """
+        Add deltas to the rollup row of the day containing ``day``.
+
+        Runs on the caller's cursor so it joins the caller's transaction.
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+        cursor.execute("""
+        INSERT INTO daily_stats (stat_date, gaming_revenue, food_revenue, session_count,
+                                 distinct_users, total_minutes)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            gaming_revenue = gaming_revenue + VALUES(gaming_revenue),
+            food_revenue = food_revenue + VALUES(food_revenue),
+            session_count = session_count + VALUES(session_count),
+            distinct_users = distinct_users + VALUES(distinct_users),
+            total_minutes = total_minutes + VALUES(total_minutes)
+        """, (day, gaming_revenue or 0, food_revenue or 0, session_count,
+              distinct_users, total_minutes or 0))
+
+    @staticmethod
+    def record_session(cursor, user_id, start_time, payment_amount, duration_minutes):
+        """Add a newly inserted session to its day's rollup row."""
+        # Only the user's first session of the day inserts a row here
+        cursor.execute(
+            "INSERT IGNORE INTO daily_user_activity (stat_date, user_id) VALUES (%s, %s)",
+            (start_time.date(), user_id)
+        )
+        first_today = cursor.rowcount == 1
+        DailyStats.add(cursor, start_time, gaming_revenue=payment_amount, session_count=1,
+                       distinct_users=1 if first_today else 0,
+                       total_minutes=duration_minutes)
+
+    @staticmethod
+    def remove_session(cursor, session_id, user_id, start_time, payment_amount, duration_minutes):
+        """
+        Take a session that is being deleted back out of its day's rollup row.
+
+        Call it before deleting the session row.
+        """
+        day_start, day_end = day_range(start_time.date())
+        cursor.execute("""
+        SELECT 1 FROM sessions
+        WHERE user_id = %s AND start_time >= %s AND start_time < %s AND id != %s
+        LIMIT 1
+        """, (user_id, day_start, day_end, session_id))
+        last_today = cursor.fetchone() is None
+        if last_today:
+            cursor.execute(
+                "DELETE FROM daily_user_activity WHERE stat_date = %s AND user_id = %s",
+                (start_time.date(), user_id)
+            )
+        DailyStats.add(cursor, start_time, gaming_revenue=-(payment_amount or 0), session_count=-1,
+                       distinct_users=-1 if last_today else 0,
+                       total_minutes=-(duration_minutes or 0))
+
+    @staticmethod
+    def catch_up(days=7):
+        """Rebuild the last ``days`` days to pick up late or out-of-band edits."""
+        today = date.today()
+        with db.transaction() as cursor:
+            DailyStats.rebuild_range(cursor, today - timedelta(days=days - 1), today)
+
+    @staticmethod
+    def get_range(start_date, end_date):
+        """Get the rollup rows for an inclusive range of days."""
+        range_start, range_end = day_range(start_date, end_date)
+        cursor = db.get_cursor()
+        try:
+            cursor.execute(DailyStats.RANGE_QUERY, (range_start.date(), range_end.date()))
+            return [DailyStats(**result) for result in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_totals(start_date, end_date):
+        """
+        Get revenue and usage totals for an inclusive range of days.
+
+        Returns:
+            dict: gaming_revenue, food_revenue, session_count, distinct_users
+                  and total_minutes
+        """
+        range_start, range_end = day_range(start_date, end_date)
+        cursor = db.get_cursor()
+        try:
+            query = """
+            SELECT COALESCE(SUM(gaming_revenue), 0) as gaming_revenue,
+                   COALESCE(SUM(food_revenue), 0) as food_revenue,
+                   COALESCE(SUM(session_count), 0) as session_count,
+                   COALESCE(SUM(distinct_users), 0) as distinct_users,
+                   COALESCE(SUM(total_minutes), 0) as total_minutes,
+                   COUNT(*) as days
+            FROM daily_stats
+            WHERE stat_date >= %s AND stat_date < %s
+            """
+            cursor.execute(query, (range_start.date(), range_end.date()))
+            totals = cursor.fetchone()
+
+            # Distinct users do not add up across days; count them from the
+            # per-day activity rows when the report spans several days
+            if totals['days'] > 1:
+                cursor.execute(DailyStats.DISTINCT_USERS_QUERY, (range_start.date(), range_end.date()))
+                totals['distinct_users'] = cursor.fetchone()['count'] or 0
+
+            del totals['days']
+            return totals
+        finally:
+            cursor.close()
+
+
+class DashboardSnapshot:
+    """
+    All of the admin dashboard counters, fetched in a single round-trip.
+
+    Snapshots are cached for ``ttl`` seconds so several tabs refreshing in the
+    same second share one query.
+    """
+
+    ttl = 2.0
+
+    # Registration counters; also EXPLAINed by migrations.check_query_plans
+    REGISTRATIONS_QUERY = """
+    SELECT
+        COALESCE(SUM(created_at >= %s AND created_at < %s), 0) as registrations_today,
+        COALESCE(SUM(created_at >= %s), 0) as registrations_week,
+        COALESCE(SUM(created_at >= %s), 0) as registrations_month
+    FROM users
+    WHERE created_at >= %s AND created_at < %s
+    """
+
+    _cache = None
+    _cache_time = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, max_age=None):
+        """
+        Get the current dashboard counters.
+
+        Args:
+            max_age (float, optional): Oldest cached snapshot to accept in
+                seconds, defaults to ``ttl``. Pass 0 to force a fresh query.
+
+        Returns:
+            dict: occupied_pcs, available_pcs, maintenance_pcs, active_sessions,
+                  active_minutes, gaming_revenue, food_revenue,
+                  registrations_today, registrations_week,
+                  registrations_month and query_ms (time spent in the database)
+        """
+        max_age = cls.ttl if max_age is None else max_age
+        with cls._lock:
+            if cls._cache is not None and time.monotonic() - cls._cache_time < max_age:
+                return cls._cache
+
+            snapshot = cls._fetch()
+            cls._cache = snapshot
+            cls._cache_time = time.monotonic()
+            return snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached snapshot so the next get() queries the database."""
+        with cls._lock:
+            cls._cache = None
+
+    @staticmethod
+    def _fetch():
+        today = date.today()
+        day_start, day_end = day_range(today)
+        week_start, _ = day_range(today - timedelta(days=today.weekday()))
+        month_start, _ = day_range(today.replace(day=1))
+
+        started = time.perf_counter()
+        cursor = db.get_cursor()
+        try:
+            query = f"""
+            SELECT
+                pc.occupied_pcs, pc.available_pcs, pc.maintenance_pcs,
+                active.active_sessions, active.paused_sessions, active.active_minutes,
+                COALESCE(stats.gaming_revenue, 0) as gaming_revenue,
+                COALESCE(stats.food_revenue, 0) as food_revenue,
+                reg.registrations_today, reg.registrations_week, reg.registrations_month
+            FROM (
+                SELECT
+                    COALESCE(SUM(status = 'occupied'), 0) as occupied_pcs,
+                    COALESCE(SUM(status = 'available'), 0) as available_pcs,
+                    COALESCE(SUM(status = 'maintenance'), 0) as maintenance_pcs
+                FROM pcs
+            ) pc
+            CROSS JOIN (
+                SELECT COALESCE(SUM(s.status = 'active'), 0) as active_sessions,
+                       COALESCE(SUM(s.status = 'paused'), 0) as paused_sessions,
+                       COALESCE(SUM(IF(s.status = 'active', s.duration_minutes, 0)), 0) as active_minutes
+                FROM sessions s
+                JOIN users u ON s.user_id = u.id
+                WHERE s.status IN ('active', 'paused')
+                AND u.civil_id != 'WALK-IN'
+            ) active
+            CROSS JOIN ({DashboardSnapshot.REGISTRATIONS_QUERY}) reg
+            LEFT JOIN daily_stats stats ON stats.stat_date = %s
+            """
+            cursor.execute(query, (
+                day_start, day_end,
+                week_start,
+                month_start,
+                min(week_start, month_start), day_end,
+                today
+            ))
+            snapshot = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        for key in ('occupied_pcs', 'available_pcs', 'maintenance_pcs', 'active_sessions',
+                    'paused_sessions', 'active_minutes', 'registrations_today', 'registrations_week',
+                    'registrations_month'):
+            snapshot[key] = int(snapshot[key] or 0)
+        snapshot['query_ms'] = (time.perf_counter() - started) * 1000
+        return snapshot
+
+
+class ChangeTracker:
+    """
+    Detects writes to the tables the admin panel displays.
+
+    Each tracked table has an auto-increment id and an indexed updated_at
+    column maintained by MySQL, so writes made anywhere (models, raw SQL in
+    the launcher, another admin instance) move MAX(id) or MAX(updated_at).
+    poll() reads both for every table in one query answered from the
+    indexes, without adding any work to the writers. Deletes by other
+    clients are not detected; the admin panel refreshes after its own.
+    """
+
+    TABLES = ('sessions', 'orders', 'pcs', 'users')
+
+    def __init__(self):
+        self.versions = None
+
+    @staticmethod
+    def get_versions():
+        """Get the (MAX(id), MAX(updated_at)) signature of every tracked table."""
+        # The admin GUI thread keeps its connection, and with autocommit off
+        # its REPEATABLE READ snapshot would never move; end it so the poll
+        # (and the refresh it triggers) sees other clients' commits
+        db.rollback()
+        cursor = db.get_cursor()
+        try:
+            query = " UNION ALL ".join(
+                f"SELECT '{table}' as table_name, MAX(id) as last_id, MAX(updated_at) as last_update "
+                f"FROM {table}"
+                for table in ChangeTracker.TABLES
+            )
+            cursor.execute(query)
+            return {row['table_name']: (row['last_id'], row['last_update'])
+                    for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def poll(self):
+        """
+        Check for writes since the previous poll.
+
+        The first poll only records a baseline and reports no changes.
+
+        Returns:
+            set: Names of the tables that changed
+        """
+        versions = self.get_versions()
+        if self.versions is None:
+            changed = set()
+        else:
+            changed = {table for table in set(versions) | set(self.versions)
+                       if versions.get(table) != self.versions.get(table)}
+        self.versions = versions
+        return changed
+
+
+class Heartbeat:
+    """
+    Launcher liveness and session-state channel.
+
+    Every launcher calls beat() every few seconds. One upsert records the
+    PC number and last_seen, and one primary-key read returns the state of
+    the launcher's session, so staff pauses, extensions and terminations
+    reach the PC within one heartbeat. Heartbeats go to their own table,
+    which ChangeTracker does not watch, so they never wake the admin
+    panel's change polling.
+    """
+
+    INTERVAL_SECONDS = 5
+    # A launcher that missed this many seconds of heartbeats is shown offline
+    OFFLINE_AFTER_SECONDS = 15
+
+    @staticmethod
+    def beat(pc_number, session_id=None):
+        """
+        Record that the launcher on ``pc_number`` is alive.
+
+        Args:
+            pc_number (int): The launcher's PC number
+            session_id (int, optional): The session the launcher is running
+
+        Returns:
+            dict: status, end_time and remaining_seconds of the session
+                (None when there is no session or it no longer exists)
+        """
+        with db.transaction() as cursor:
+            cursor.execute("""
+            INSERT INTO launcher_heartbeats (pc_number, session_id, last_seen)
+            VALUES (%s, %s, NOW())
+            ON DUPLICATE KEY UPDATE session_id = VALUES(session_id), last_seen = VALUES(last_seen)
+            """, (pc_number, session_id))
+            if session_id is None:
+                return None
+            cursor.execute(f"""
+            SELECT status, end_time, {Session.remaining_seconds_sql()} as remaining_seconds
+            FROM sessions WHERE id = %s
+            """, (session_id,))
+            return cursor.fetchone()
+
+    @staticmethod
+    def get_liveness():
+        """
+        Get how long ago each launcher last checked in.
+
+        Returns:
+            dict: pc_number -> seconds since the last heartbeat
+        """
+        cursor = db.get_cursor()
+        try:
+            cursor.execute("""
+            SELECT pc_number, TIMESTAMPDIFF(SECOND, last_seen, NOW()) as seconds_ago
+            FROM launcher_heartbeats
+            """)
+            return {row['pc_number']: row['seconds_ago'] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
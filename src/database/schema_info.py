@@ -0,0 +1,63 @@
+"""
+Cached knowledge of which columns exist in the application tables.
+
+Older databases name some columns differently (``is_active`` instead of
+``is_available``, ``image`` instead of ``image_path``). Rather than running
+DESCRIBE before every query, the column lists of every table are read once,
+in a single information_schema query, and kept until the schema changes.
+"""
+import threading
+from .db_connection import db
+
+
+class SchemaCapabilities:
+    """A process-wide registry of the columns each table has."""
+
+    def __init__(self):
+        self._columns = None
+        self._lock = threading.Lock()
+
+    def columns(self, table):
+        """Return the set of column names of ``table`` (empty if it does not exist)."""
+        if self._columns is None:
+            with self._lock:
+                if self._columns is None:
+                    self._columns = self._probe()
+        return self._columns.get(table, set())
+
+    def has_column(self, table, column):
+        """Check whether ``table`` has ``column``."""
+        return column in self.columns(table)
+
+    def first_column(self, table, *candidates):
+        """Return the first of ``candidates`` that exists on ``table``, or None."""
+        columns = self.columns(table)
+        for column in candidates:
+            if column in columns:
+                return column
+        return None
+
+    def invalidate(self):
+        """Forget the cached columns; call after the schema has been altered."""
+        with self._lock:
+            self._columns = None
+
+    @staticmethod
+    def _probe():
+        cursor = db.get_cursor()
+        try:
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+            """)
+            columns = {}
+            for row in cursor.fetchall():
+                columns.setdefault(row['TABLE_NAME'], set()).add(row['COLUMN_NAME'])
+            return columns
+        finally:
+            cursor.close()
+
+
+# Create a global instance
+schema_info = SchemaCapabilities()
@@ -2,12 +2,20 @@ import sys
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QLabel, QLineEdit, QPushButton, QStackedWidget, QMessageBox, 
                            QFrame, QGraphicsDropShadowEffect, QDialog, QGridLayout, QScrollArea, QSpinBox, QTableWidgetItem,
-                           QCheckBox, QGroupBox)
-from PyQt5.QtCore import Qt, QTimer, QSettings
-from PyQt5.QtGui import QColor, QFont, QPixmap, QPainter, QPainterPath
-from ..database import db, User, Session, PC, Order, MenuItem, MenuItemExtra, MenuItemTakeout
+                           QCheckBox, QGroupBox, QListView, QStyledItemDelegate, QStyle)
+from PyQt5.QtCore import (Qt, QTimer, QSettings, QAbstractListModel, QModelIndex, QSize, QRect,
+                          QPointF, QEvent, pyqtSignal)
+from PyQt5.QtGui import QColor, QFont, QPixmap, QPainter, QPainterPath, QLinearGradient
+from ..database import (db, schema_info, User, Session, PC, Order, MenuItem, MenuItemExtra, MenuItemTakeout,
+                         DailyStats, Heartbeat)
 from src.utils.helpers import set_background_image, verify_password
+from src.utils.image_loader import get_image_loader
+from src.utils.db_worker import get_db_worker, TaskTimeoutError
+from .offline_store import get_offline_store, is_connection_error
 import os
+import math
+import time
+import uuid
 from src.common import add_close_button
 from datetime import datetime, timedelta
 from src.common.ui_components import StyledTable
@@ -15,6 +23,15 @@ from src.common.ui_components import StyledTable
 
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 
+# How often the launcher reports in and re-reads its session state (ms)
+HEARTBEAT_MS = Heartbeat.INTERVAL_SECONDS * 1000
+
+# Seconds left at which the user is warned, with the warning text
+TIME_WARNINGS = (
+    (60, "#FF0000", "Your session will end in 1 minute! Please finish up now.", QMessageBox.Critical),
+    (300, "#FFA500", "Your session will end in 5 minutes. Please save your progress.", QMessageBox.Warning),
+)
+
 class RoundedImageLabel(QLabel):
     """A QLabel that displays images with rounded corners."""
     def __init__(self, *args, **kwargs):
@@ -155,41 +172,191 @@ class ExitPasswordDialog(QDialog):
         """Return the entered password."""
         return self.password_input.text()
 
+# Card styles are set once on each grid container rather than on every card
+GAME_CARD_STYLE = """
+    QFrame#gameCard {
+        background-color: rgba(25, 25, 40, 0.7);
+        border: 1px solid rgba(0, 195, 255, 0.5);
+        border-radius: 10px;
+    }
+    QFrame#gameCard:hover {
+        background-color: rgba(35, 35, 50, 0.8);
+        border: 1px solid rgba(0, 195, 255, 0.8);
+    }
+    QFrame#gameCard QLabel {
+        color: white;
+        background-color: transparent;
+    }
+    QFrame#gameCard QLabel#gameCardName {
+        color: #00c3ff;
+    }
+    QFrame#gameCard QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #0078d7, stop:1 #00c3ff);
+        color: white;
+        border: none;
+        border-radius: 5px;
+        padding: 8px;
+        font-weight: bold;
+    }
+    QFrame#gameCard QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #0086ef, stop:1 #19ceff);
+    }
+    QFrame#gameCard QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #006acf, stop:1 #00b2e8);
+    }
+"""
+
+MENU_CARD_STYLE = """
+    QFrame#menuCard {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 rgba(30, 30, 50, 0.9),
+            stop:1 rgba(20, 20, 35, 0.95));
+        border: 2px solid rgba(255, 152, 0, 0.3);
+        border-radius: 12px;
+        padding: 8px;
+    }
+    QFrame#menuCard:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 rgba(40, 40, 60, 0.95),
+            stop:1 rgba(30, 30, 45, 0.98));
+        border: 2px solid rgba(255, 152, 0, 0.8);
+    }
+    QFrame#menuCardImage {
+        background-color: rgba(40, 40, 60, 0.5);
+        border-radius: 8px;
+        border: 1px solid rgba(255, 152, 0, 0.3);
+    }
+    QLabel#menuCardName {
+        color: #ff9800;
+        letter-spacing: 1px;
+    }
+    QLabel#menuCardDescription {
+        color: #cccccc;
+        background-color: rgba(40, 40, 60, 0.3);
+        border-radius: 4px;
+        padding: 4px;
+    }
+    QWidget#menuCardPrice {
+        background-color: rgba(40, 40, 60, 0.5);
+        border-radius: 8px;
+        padding: 6px;
+    }
+    QLabel#menuCardPriceLabel {
+        color: #00c853;
+    }
+    QPushButton#menuCardOrder {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #ff9800, stop:1 #ff5722);
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 6px 6px;
+        font-weight: bold;
+        font-size: 10px;
+        letter-spacing: 1px;
+    }
+    QPushButton#menuCardOrder:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #ffa726, stop:1 #ff7043);
+    }
+    QPushButton#menuCardOrder:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #f57c00, stop:1 #f4511e);
+    }
+"""
+
+def get_game_attribute(game, possible_keys):
+    """Get a game attribute by trying different possible column names."""
+    if isinstance(game, dict):
+        for key in possible_keys:
+            if key in game and game[key]:
+                return game[key]
+    else:
+        for key in possible_keys:
+            if hasattr(game, key) and getattr(game, key):
+                return getattr(game, key)
+    return None
+
+def launch_game(parent, game):
+    """Launch the executable of ``game``, reporting problems in a message box."""
+    name = get_game_attribute(game, ['name', 'title']) or "Unknown Game"
+    try:
+        import subprocess
+        
+        # Get the executable path
+        exe_path = get_game_attribute(game, ['executable_path', 'path', 'exe_path'])
+        
+        if exe_path:
+            # Show a launching message
+            QMessageBox.information(
+                parent, 
+                "Launching Game",
+                f"Launching {name}...\nPlease wait.",
+                QMessageBox.Ok
+            )
+            
+            # Start the game process
+            subprocess.Popen(exe_path, shell=True)
+        else:
+            QMessageBox.warning(
+                parent,
+                "Game Error",
+                f"Could not find executable path for {name}.",
+                QMessageBox.Ok
+            )
+    except Exception as e:
+        QMessageBox.critical(
+            parent, 
+            "Launch Error", 
+            f"Failed to launch game: {str(e)}",
+            QMessageBox.Ok
+        )
+
+class CardGrid:
+    """
+    Shows a list of items as pooled cards in a QGridLayout.
+    
+    Cards are created the first time a grid position is needed and then
+    kept: later calls rebind them to new data and hide the spare ones, so
+    reloading a page with the same data allocates no widgets at all.
+    """
+    
+    def __init__(self, layout, create_card, empty_text, columns=5):
+        self.layout = layout
+        self.create_card = create_card
+        self.empty_text = empty_text
+        self.columns = columns
+        self.cards = []
+        self.empty_label = None
+    
+    def show_items(self, items):
+        """Bind the cards to ``items`` in order, growing the pool if needed."""
+        for index, data in enumerate(items):
+            if index == len(self.cards):
+                card = self.create_card()
+                self.layout.addWidget(card, index // self.columns, index % self.columns)
+                self.cards.append(card)
+            card = self.cards[index]
+            card.bind(data)
+            card.show()
+        
+        for card in self.cards[len(items):]:
+            card.hide()
+        
+        if self.empty_label is None:
+            self.empty_label = QLabel(self.empty_text)
+            self.empty_label.setAlignment(Qt.AlignCenter)
+            self.empty_label.setStyleSheet("color: white; font-size: 16px;")
+            self.layout.addWidget(self.empty_label, 0, 0, 1, self.columns)
+        self.empty_label.setVisible(not items)
+
 class GameCard(QFrame):
     """A card widget to display a game with icon and launch button."""
-    def __init__(self, game, parent=None):
+    def __init__(self, game=None, parent=None):
         super().__init__(parent)
-        self.game = game
+        self.game = None
+        self.setObjectName("gameCard")
         self.setFixedSize(180, 220)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: rgba(25, 25, 40, 0.7);
-                border: 1px solid rgba(0, 195, 255, 0.5);
-                border-radius: 10px;
-            }
-            QFrame:hover {
-                background-color: rgba(35, 35, 50, 0.8);
-                border: 1px solid rgba(0, 195, 255, 0.8);
-            }
-            QLabel {
-                color: white;
-                background-color: transparent;
-            }
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #0078d7, stop:1 #00c3ff);
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #0086ef, stop:1 #19ceff);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #006acf, stop:1 #00b2e8);
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -200,22 +367,6 @@ class GameCard(QFrame):
         self.icon_label.setAlignment(Qt.AlignCenter)
         self.icon_label.setFixedSize(120, 120)
         
-        # Use image if available, otherwise use a placeholder
-        image_path = self.get_game_attribute(['image_path', 'icon_path'])
-        if image_path and os.path.exists(image_path):
-            pixmap = QPixmap(image_path)
-        else:
-            # Use a default game icon
-            game_path = os.path.join(root_dir, 'src', 'assets', 'game_icon.png')
-            pixmap = QPixmap(game_path)
-            if not os.path.exists(game_path):
-                # Create a colored rectangle as fallback
-                pixmap = QPixmap(120, 120)
-                pixmap.fill(QColor("#0078d7"))
-        
-        scaled_pixmap = pixmap.scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.icon_label.setPixmap(scaled_pixmap)
-        
         # Center the icon
         icon_container = QWidget()
         icon_layout = QHBoxLayout(icon_container)
@@ -225,12 +376,11 @@ class GameCard(QFrame):
         layout.addWidget(icon_container)
         
         # Game Name
-        game_name = self.get_game_attribute(['name', 'title'])
-        self.name_label = QLabel(game_name or "Unknown Game")
+        self.name_label = QLabel()
+        self.name_label.setObjectName("gameCardName")
         self.name_label.setAlignment(Qt.AlignCenter)
         self.name_label.setWordWrap(True)
         self.name_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
-        self.name_label.setStyleSheet("color: #00c3ff;")
         layout.addWidget(self.name_label)
         
         # Launch Button
@@ -238,290 +388,443 @@ class GameCard(QFrame):
         self.launch_button.setCursor(Qt.PointingHandCursor)
         self.launch_button.clicked.connect(self.launch_game)
         layout.addWidget(self.launch_button)
+        
+        if game is not None:
+            self.bind(game)
+    
+    def bind(self, game):
+        """Show ``game`` on this card."""
+        if game == self.game:
+            return
+        self.game = game
+        
+        game_name = self.get_game_attribute(['name', 'title'])
+        self.name_label.setText(game_name or "Unknown Game")
+        
+        # Use image if available, otherwise use a placeholder; both are
+        # decoded and scaled off the GUI thread and arrive asynchronously
+        self.icon_label.clear()
+        image_path = self.get_game_attribute(['image_path', 'icon_path'])
+        game_path = os.path.join(root_dir, 'src', 'assets', 'game_icon.png')
+        self.request_icon(game, [image_path, game_path])
+    
+    def request_icon(self, game, paths):
+        """
+        Request the first of ``paths`` that exists, moving on to the next one
+        if it cannot be decoded, and show a coloured placeholder when none
+        is left.
+        """
+        loader = get_image_loader()
+        for index, path in enumerate(paths):
+            if loader.request(path, 120, 120, self.show_icon(game),
+                              on_failed=self.icon_failed(game, paths[index + 1:])):
+                return
+        # Create a colored rectangle as fallback
+        pixmap = QPixmap(120, 120)
+        pixmap.fill(QColor("#0078d7"))
+        self.icon_label.setPixmap(pixmap)
+    
+    def icon_failed(self, game, remaining_paths):
+        """Return a callback that falls back to the next image unless the card was rebound meanwhile."""
+        def fall_back(_):
+            if self.game is game:
+                self.request_icon(game, remaining_paths)
+        return fall_back
+    
+    def show_icon(self, game):
+        """Return a callback that sets the icon unless the card was rebound meanwhile."""
+        def set_icon(pixmap):
+            if self.game is game:
+                self.icon_label.setPixmap(pixmap)
+        return set_icon
     
     def get_game_attribute(self, possible_keys):
         """Get a game attribute by trying different possible column names."""
-        if isinstance(self.game, dict):
-            for key in possible_keys:
-                if key in self.game and self.game[key]:
-                    return self.game[key]
-        else:
-            for key in possible_keys:
-                if hasattr(self.game, key) and getattr(self.game, key):
-                    return getattr(self.game, key)
-        return None
+        return get_game_attribute(self.game, possible_keys)
     
     def launch_game(self):
         """Launch the game executable."""
-        try:
-            import subprocess
-            
-            # Get the executable path
-            exe_path = self.get_game_attribute(['executable_path', 'path', 'exe_path'])
-            
-            if exe_path:
-                # Show a launching message
-                QMessageBox.information(
-                    self, 
-                    "Launching Game",
-                    f"Launching {self.name_label.text()}...\nPlease wait.",
-                    QMessageBox.Ok
-                )
-                
-                # Start the game process
-                subprocess.Popen(exe_path, shell=True)
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Game Error",
-                    f"Could not find executable path for {self.name_label.text()}.",
-                    QMessageBox.Ok
-                )
-        except Exception as e:
-            QMessageBox.critical(
-                self, 
-                "Launch Error", 
-                f"Failed to launch game: {str(e)}",
-                QMessageBox.Ok
-            )
+        launch_game(self, self.game)
+
+class GameListModel(QAbstractListModel):
+    """
+    List model over the game rows shown in the virtualized games grid.
+    
+    Icons are only looked up for rows the view actually paints: the first
+    time a row asks for its icon, the thumbnail is requested from the shared
+    image loader and the row is repainted once it arrives. Pixmaps live in
+    the loader's bounded cache, so memory does not grow with the library.
+    """
+    GameRole = Qt.UserRole
+    ICON_SIZE = 120
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.games = []
+        self.requested = set()
+        # Row -> image loader key of its thumbnail, or None for the placeholder
+        self.sources = {}
+        self.placeholder = QPixmap(self.ICON_SIZE, self.ICON_SIZE)
+        self.placeholder.fill(QColor("#0078d7"))
+        self.fallback_path = os.path.join(root_dir, 'src', 'assets', 'game_icon.png')
+    
+    def set_games(self, games):
+        """Replace the rows; a no-op when the games have not changed."""
+        if games == self.games:
+            return
+        self.beginResetModel()
+        self.games = list(games)
+        self.requested = set()
+        self.sources = {}
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.games)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.games):
+            return None
+        game = self.games[index.row()]
+        if role == Qt.DisplayRole:
+            return get_game_attribute(game, ['name', 'title']) or "Unknown Game"
+        if role == Qt.DecorationRole:
+            return self.icon(index.row(), game)
+        if role == self.GameRole:
+            return game
+        return None
+    
+    def icon(self, row, game):
+        """Return the row's thumbnail, requesting it on first use."""
+        if row in self.sources:
+            key = self.sources[row]
+            if key is None:
+                return self.placeholder
+            pixmap = get_image_loader().lookup(key)
+            if pixmap is not None:
+                return pixmap
+            # Evicted from the loader's cache; load it again
+            del self.sources[row]
+        if row in self.requested:
+            return None
+        return self.request_icon(
+            row, game, [get_game_attribute(game, ['image_path', 'icon_path']), self.fallback_path]
+        )
+    
+    def request_icon(self, row, game, paths):
+        """
+        Request the first of ``paths`` that exists, remembering its cache key
+        so later paints look the row up without touching the file system.
+        """
+        loader = get_image_loader()
+        for index, path in enumerate(paths):
+            key = loader.key(path, self.ICON_SIZE, self.ICON_SIZE)
+            if key is None:
+                continue
+            pixmap = loader.lookup(key)
+            if pixmap is not None:
+                self.sources[row] = key
+                return pixmap
+            self.requested.add(row)
+            loader.request(path, self.ICON_SIZE, self.ICON_SIZE,
+                           self.icon_loaded(row, game, key),
+                           on_failed=self.icon_failed(row, game, paths[index + 1:]))
+            return None
+        self.sources[row] = None
+        return self.placeholder
+    
+    def icon_loaded(self, row, game, key):
+        """Return a callback that repaints ``row`` unless the model was reset meanwhile."""
+        def repaint(pixmap):
+            if row < len(self.games) and self.games[row] is game:
+                self.requested.discard(row)
+                self.sources[row] = key
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+        return repaint
+    
+    def icon_failed(self, row, game, remaining_paths):
+        """Return a callback that falls back to the next image, or the placeholder."""
+        def fall_back(_):
+            if row < len(self.games) and self.games[row] is game:
+                self.requested.discard(row)
+                self.request_icon(row, game, remaining_paths)
+                if row not in self.requested:
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index, [Qt.DecorationRole])
+        return fall_back
+
+class GameCardDelegate(QStyledItemDelegate):
+    """Paints a game card (icon, name and launch button) for one grid cell."""
+    launch_requested = pyqtSignal(QModelIndex)
+    
+    CARD_SIZE = QSize(180, 220)
+    
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+    
+    def card_rect(self, option):
+        return QRect(option.rect.topLeft(), self.CARD_SIZE).adjusted(1, 1, -1, -1)
+    
+    def button_rect(self, option):
+        card = self.card_rect(option)
+        return QRect(card.left() + 10, card.bottom() - 44, card.width() - 20, 34)
+    
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        
+        # Card frame
+        card = self.card_rect(option)
+        painter.setPen(QColor(0, 195, 255, 204 if hovered else 128))
+        painter.setBrush(QColor(35, 35, 50, 204) if hovered else QColor(25, 25, 40, 178))
+        painter.drawRoundedRect(card, 10, 10)
+        
+        # Icon, centered in the top of the card
+        icon_rect = QRect(card.left() + (card.width() - 120) // 2, card.top() + 10, 120, 120)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            x = icon_rect.left() + (icon_rect.width() - pixmap.width()) // 2
+            y = icon_rect.top() + (icon_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        
+        # Name
+        name_rect = QRect(card.left() + 10, icon_rect.bottom() + 4, card.width() - 20, 36)
+        painter.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        painter.setPen(QColor("#00c3ff"))
+        name = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, name_rect.width() * 2)
+        painter.drawText(name_rect, Qt.AlignCenter | Qt.TextWordWrap, name)
+        
+        # Launch button
+        button = self.button_rect(option)
+        gradient = QLinearGradient(QPointF(button.topLeft()), QPointF(button.topRight()))
+        gradient.setColorAt(0, QColor("#0086ef") if hovered else QColor("#0078d7"))
+        gradient.setColorAt(1, QColor("#19ceff") if hovered else QColor("#00c3ff"))
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(gradient)
+        painter.drawRoundedRect(button, 5, 5)
+        painter.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        painter.setPen(QColor("white"))
+        painter.drawText(button, Qt.AlignCenter, "LAUNCH")
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self.button_rect(option).contains(event.pos())):
+            self.launch_requested.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
 
-class MenuItemCard(QFrame):
-    """A card widget to display a menu item with pricing and order button."""
-    def __init__(self, menu_item, parent=None):
+class GameGridView(QListView):
+    """
+    Virtualized grid of game cards.
+    
+    Only the cells inside the viewport are painted, so opening the page costs
+    the same for ten games or a thousand, and the number of columns follows
+    the width of the window.
+    """
+    def __init__(self, empty_text, parent=None):
         super().__init__(parent)
-        self.menu_item = menu_item
-        self.parent_window = parent
-        self.setFixedSize(250, 240)  # Increased width and height for better visibility
+        self.empty_text = empty_text
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        self.setSpacing(10)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setEditTriggers(QListView.NoEditTriggers)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        
+        self.games_model = GameListModel(self)
+        self.setModel(self.games_model)
+        self.card_delegate = GameCardDelegate(self)
+        self.card_delegate.launch_requested.connect(self.launch)
+        self.setItemDelegate(self.card_delegate)
+    
+    def set_games(self, games):
+        self.games_model.set_games(games)
+        self.viewport().update()
+    
+    def set_empty_text(self, text):
+        """Change what is shown while there are no games (e.g. while loading)."""
+        self.empty_text = text
+        self.viewport().update()
+    
+    def launch(self, index):
+        launch_game(self, index.data(GameListModel.GameRole))
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.games_model.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("white"))
+            painter.setFont(QFont("Segoe UI", 12))
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, self.empty_text)
+
+class MenuCard(QFrame):
+    """A card widget for a menu item on the food menu pages."""
+    def __init__(self, on_order, parent=None):
+        super().__init__(parent)
+        self.item = None
+        self.on_order = on_order
+        self.setObjectName("menuCard")
+        self.setFixedSize(200, 260)  # Reduced from 250x320
+        
+        # Add shadow effect to the card
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(15)
+        shadow.setColor(QColor(255, 152, 0, 100))
+        shadow.setOffset(0, 4)
+        self.setGraphicsEffect(shadow)
+        
+        # Create layout for the card
+        card_layout = QVBoxLayout(self)
+        card_layout.setContentsMargins(8, 8, 8, 8)
+        card_layout.setSpacing(6)
+        
+        # Image container with rounded corners
+        self.image_container = QFrame()
+        self.image_container.setObjectName("menuCardImage")
+        self.image_container.setFixedHeight(120)  # Reduced from 160
+        image_layout = QVBoxLayout(self.image_container)
+        image_layout.setContentsMargins(4, 4, 4, 4)
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        image_layout.addWidget(self.image_label)
+        card_layout.addWidget(self.image_container)
+        
+        # Item name
+        self.name_label = QLabel()
+        self.name_label.setObjectName("menuCardName")
+        self.name_label.setFont(QFont("Segoe UI", 12, QFont.Bold))  # Reduced from 14
+        self.name_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.name_label)
+        
+        # Item description
+        self.desc_label = QLabel()
+        self.desc_label.setObjectName("menuCardDescription")
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setFont(QFont("Segoe UI", 9))  # Reduced from 10
+        self.desc_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.desc_label)
+        
+        # Price and order button container
+        price_container = QWidget()
+        price_container.setObjectName("menuCardPrice")
+        price_layout = QHBoxLayout(price_container)
+        price_layout.setContentsMargins(6, 6, 6, 6)
+        price_layout.setSpacing(8)
+        
+        self.price_label = QLabel()
+        self.price_label.setObjectName("menuCardPriceLabel")
+        self.price_label.setFont(QFont("Segoe UI", 14, QFont.Bold))  # Reduced from 16
+        price_layout.addWidget(self.price_label)
+        
+        order_button = QPushButton("ORDER NOW")
+        order_button.setObjectName("menuCardOrder")
+        order_button.setCursor(Qt.PointingHandCursor)
+        order_button.setFixedWidth(80)  # Reduced from 100
+        order_button.clicked.connect(self.order)
+        price_layout.addWidget(order_button)
+        
+        card_layout.addWidget(price_container)
+    
+    def bind(self, item):
+        """Show menu ``item`` (a row dictionary) on this card."""
+        if item == self.item:
+            return
+        self.item = item
+        
+        self.name_label.setText(item['name'])
+        self.desc_label.setText(item.get('description') or "")
+        self.desc_label.setVisible(bool(item.get('description')))
+        self.price_label.setText(f"₹{float(item['price']):.2f}")
+        
+        # Image decoded and scaled off the GUI thread
+        self.image_label.clear()
+        has_image = bool(item.get('image_path')) and get_image_loader().request(
+            item['image_path'], 160, 100, self.show_image(item)  # Reduced from 200x140
+        )
+        self.image_container.setVisible(has_image)
+    
+    def show_image(self, item):
+        """Return a callback that sets the image unless the card was rebound meanwhile."""
+        def set_image(pixmap):
+            if self.item is item:
+                self.image_label.setPixmap(pixmap)
+        return set_image
+    
+    def order(self):
+        """Open the order dialog for the bound item."""
+        if self.item:
+            self.on_order(self.item['id'], self.item['name'], self.item['price'])
+
+class LoadingOverlay(QWidget):
+    """Dims the launcher and says what it is waiting for, with an optional cancel button."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.on_cancel = None
+        self.setObjectName("loadingOverlay")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         self.setStyleSheet("""
-            QFrame {
-                background-color: rgba(25, 25, 40, 0.9);  /* Increased opacity for better contrast */
-                border: 2px solid rgba(0, 195, 255, 0.5);  /* Thicker border */
-                border-radius: 10px;
-                padding: 10px;
-                margin: 10px;
-            }
-            QFrame:hover {
-                background-color: rgba(35, 35, 50, 0.95);
-                border: 2px solid rgba(0, 195, 255, 0.8);
+            QWidget#loadingOverlay {
+                background-color: rgba(0, 0, 0, 0.6);
             }
             QLabel {
-                color: white;
+                color: #00c3ff;
+                font-size: 20px;
+                font-weight: bold;
                 background-color: transparent;
-                padding: 2px;
-                margin: 2px;
             }
             QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #ff5722, stop:1 #ff9800);
+                background-color: #ff4c4c;
                 color: white;
                 border: none;
                 border-radius: 5px;
-                padding: 5px;
+                padding: 8px 24px;
                 font-weight: bold;
             }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #ff7043, stop:1 #ffb74d);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #e64a19, stop:1 #f57c00);
-            }
-            QSpinBox {
-                background-color: rgba(40, 40, 60, 0.7);
-                border: 1px solid rgba(0, 195, 255, 0.5);
-                border-radius: 5px;
-                padding: 5px;
-                color: white;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: rgba(0, 195, 255, 0.5);
-                border-radius: 3px;
-            }
         """)
         
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(12, 12, 12, 12)  # Increased margins
-        layout.setSpacing(8)  # Increased spacing
-        
-        # Menu Item Name
-        item_name = self.get_item_attribute(['name'])
-        self.name_label = QLabel(item_name or "Unknown Item")
-        self.name_label.setAlignment(Qt.AlignCenter)
-        self.name_label.setWordWrap(True)
-        self.name_label.setFont(QFont("Segoe UI", 14, QFont.Bold))  # Larger font
-        self.name_label.setStyleSheet("color: #00c3ff; margin-bottom: 10px;")
-        self.name_label.setMinimumHeight(45)  # Ensure enough height for text
-        layout.addWidget(self.name_label)
-        
-        # Category
-        category = self.get_item_attribute(['category'])
-        if category:
-            category_label = QLabel(f"Category: {category.capitalize()}")
-            category_label.setAlignment(Qt.AlignCenter)
-            category_label.setFont(QFont("Segoe UI", 11))  # Increased font size
-            category_label.setMinimumHeight(35)  # Fixed height
-            layout.addWidget(category_label)
-        
-        # Price
-        price = self.get_item_attribute(['price'])
-        if price:
-            price_label = QLabel(f"Price: ${float(price):.2f}")
-            price_label.setAlignment(Qt.AlignCenter)
-            price_label.setFont(QFont("Segoe UI", 13, QFont.Bold))  # Increased font size
-            price_label.setStyleSheet("color: #ffc107; margin: 5px 0;")  # Added margin
-            price_label.setMinimumHeight(35)  # Fixed height
-            layout.addWidget(price_label)
+        layout.setAlignment(Qt.AlignCenter)
+        self.label = QLabel()
+        self.label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.label)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setCursor(Qt.PointingHandCursor)
+        self.cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(self.cancel_button, 0, Qt.AlignCenter)
         
-        # Spacer
-        layout.addSpacing(5)
-        
-        # Quantity selection
-        quantity_layout = QHBoxLayout()
-        quantity_layout.setContentsMargins(5, 5, 5, 5)
-        quantity_label = QLabel("Qty:")
-        quantity_label.setFont(QFont("Segoe UI", 12)) 
-        quantity_label.setMinimumHeight(30)  # Increased font size
-        quantity_layout.addWidget(quantity_label)
-        
-        self.quantity_spin = QSpinBox()
-        self.quantity_spin.setMinimum(1)
-        self.quantity_spin.setMaximum(10)
-        self.quantity_spin.setValue(1)
-        self.quantity_spin.setFixedHeight(30)  # Fixed height
-        quantity_layout.addWidget(self.quantity_spin)
-        layout.addLayout(quantity_layout)
-        
-        layout.addSpacing(10)  # More space between quantity and button
-        
-        # Order Button
-        self.order_button = QPushButton("ORDER")
-        self.order_button.setFont(QFont("Segoe UI", 12, QFont.Bold))  # Increased font size
-        self.order_button.setCursor(Qt.PointingHandCursor)
-        self.order_button.setMinimumHeight(35)  # Increased height
-        self.order_button.clicked.connect(self.place_order)
-        layout.addWidget(self.order_button)
-    
-    def get_item_attribute(self, possible_keys):
-        """Get a menu item attribute by trying different possible column names."""
-        if isinstance(self.menu_item, dict):
-            for key in possible_keys:
-                if key in self.menu_item and self.menu_item[key]:
-                    return self.menu_item[key]
-        else:
-            for key in possible_keys:
-                if hasattr(self.menu_item, key) and getattr(self.menu_item, key):
-                    return getattr(self.menu_item, key)
-        return None
+        # Follow the parent's size
+        parent.installEventFilter(self)
+        self.hide()
     
-    def place_order(self):
-        """Place an order for this menu item."""
-        cursor = None
-        try:
-            # Check for active user session
-            if not self.parent_window.current_user or not self.parent_window.current_session:
-                QMessageBox.warning(self, "Error", "No active user session found.")
-                return
-            
-            # Get item details
-            item_id = self.get_item_attribute(['id'])
-            item_name = self.name_label.text()
-            item_price = float(self.get_item_attribute(['price']))
-            quantity = self.quantity_spin.value()
-            
-            # Get user ID
-            user_id = None
-            if hasattr(self.parent_window.current_user, 'id'):
-                user_id = self.parent_window.current_user.id
-            elif isinstance(self.parent_window.current_user, dict) and 'id' in self.parent_window.current_user:
-                user_id = self.parent_window.current_user['id']
-            
-            if not user_id:
-                QMessageBox.warning(self, "Error", "Cannot determine user ID.")
-                return
-                
-            # Get session ID
-            session_id = None
-            if isinstance(self.parent_window.current_session, dict) and 'id' in self.parent_window.current_session:
-                session_id = self.parent_window.current_session['id']
-            elif hasattr(self.parent_window.current_session, 'id'):
-                session_id = self.parent_window.current_session.id
-            
-            if not session_id:
-                QMessageBox.warning(self, "Error", "Cannot determine session ID.")
-                return
-            
-            # Verify the menu item is still available
-            cursor = db.get_cursor()
-            try:
-                # Check if item exists and is active
-                cursor.execute("SELECT * FROM menu_items WHERE id = %s", (item_id,))
-                menu_item = cursor.fetchone()
-                
-                if not menu_item:
-                    QMessageBox.warning(self, "Error", "This menu item is no longer available.")
-                    return
-            except Exception as e:
-                print(f"Menu item verification error: {str(e)}")
-                # Continue anyway if verification fails
-            
-            # Calculate total amount
-            total_amount = item_price * quantity
-            
-            # First create the order with appropriate values
-            cursor.execute("""
-                INSERT INTO orders (session_id, status, order_time, total_amount)
-                VALUES (%s, %s, %s, %s)
-            """, (
-                session_id,
-                'pending',
-                datetime.now(),
-                total_amount
-            ))
-            
-            order_id = cursor.lastrowid
-            
-            # Then add the order item
-            cursor.execute("""
-                INSERT INTO order_items (order_id, menu_item_id, quantity, price)
-                VALUES (%s, %s, %s, %s)
-            """, (
-                order_id,
-                item_id,
-                quantity,
-                item_price
-            ))
-            
-            db.commit()
-            
-            # Show success message with order details
-            QMessageBox.information(
-                self, 
-                "Order Placed", 
-                f"Your order for {quantity} x {item_name} has been placed!\n\n"
-                f"Total: ${total_amount:.2f}\n"
-                "Your order status is now 'pending'. Staff will deliver your order shortly.",
-                QMessageBox.Ok
-            )
-
-            self.parent_window.load_user_orders()
-            
-            # Reset quantity to 1 after successful order
-            self.quantity_spin.setValue(1)
-            
-        except Exception as e:
-            if cursor and db:
-                db.rollback()
-            QMessageBox.critical(
-                self, 
-                "Order Error", 
-                f"Failed to place order: {str(e)}"
-                "\nPlease try again or contact staff for assistance.",
-                QMessageBox.Ok
-            )
-            import traceback
-            traceback.print_exc()
-        finally:
-            if cursor:
-                cursor.close()
-
+    def start(self, text, on_cancel=None):
+        """Cover the parent with ``text``; ``on_cancel`` enables the cancel button."""
+        self.label.setText(text)
+        self.on_cancel = on_cancel
+        self.cancel_button.setVisible(on_cancel is not None)
+        self.setGeometry(self.parentWidget().rect())
+        self.raise_()
+        self.show()
+    
+    def stop(self):
+        self.on_cancel = None
+        self.hide()
+    
+    def cancel(self):
+        on_cancel = self.on_cancel
+        self.stop()
+        if on_cancel is not None:
+            on_cancel()
+    
+    def eventFilter(self, obj, event):
+        if obj is self.parentWidget() and event.type() == QEvent.Resize:
+            self.setGeometry(obj.rect())
+        return False
 
 class LauncherMainWindow(QMainWindow):
     def __init__(self, pc_number=None):
@@ -529,16 +832,43 @@ class LauncherMainWindow(QMainWindow):
         self.pc_number = pc_number
         self.current_user = None
         self.current_session = None
-        self.remaining_time = None
+        # Countdown state: a time.monotonic() deadline for the session end,
+        # and the warning thresholds already shown
+        self.session_deadline = None
+        self.session_paused = False
+        self.time_warnings_shown = set()
+        
+        # Menu rows per category, fetched once per login
+        self.menu_items_by_category = None
+        self.rendered_menu_categories = set()
+        
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_timer)
         
+        # Heartbeat: reports this launcher as alive and picks up staff
+        # changes to its session; runs on the login page too
+        self.heartbeat_timer = QTimer()
+        self.heartbeat_timer.timeout.connect(self.send_heartbeat)
+        self.heartbeat_timer.start(HEARTBEAT_MS)
+        
         # Add orders refresh timer
         # self.orders_refresh_timer = QTimer()
         
         # self.orders_refresh_timer.timeout.connect(lambda: self.load_user_orders())
         
-        # Exit password tracking
+        # Database calls in flight on the worker threads, by kind
+        self.pending_calls = {}
+        # Local queue for writes made while the database is unreachable
+        self.offline_store = get_offline_store()
+        self.loading_call = None
+        # The last order whose outcome is unknown (it timed out or failed):
+        # (session id, items, client token). Confirming the same order again
+        # reuses its token, so the server inserts it at most once.
+        self.unconfirmed_order = None
+        
+        # Exit password tracking; the password itself is fetched in the
+        # background at startup and on login so closing never waits on MySQL
+        self.exit_password = ""
         self.exit_password_attempts = 0
         self.exit_password_locked_until = None
         
@@ -624,6 +954,63 @@ class LauncherMainWindow(QMainWindow):
 
         # Add close button
         self.close_button = add_close_button(self)
+        
+        # Covers the pages while the launcher waits on the database
+        self.loading_overlay = LoadingOverlay(central_widget)
+        
+        self.load_exit_password()
+    
+    def run_db_call(self, name, fn, *args, on_done=None, on_error=None, on_late=None, loading=None):
+        """
+        Run ``fn(*args)`` on a database worker thread.
+        
+        A call still pending under the same ``name`` is cancelled first, so
+        only the latest result of each kind is applied. With ``loading``
+        text, the loading overlay covers the launcher (and can cancel the
+        call) until it completes. Errors go to ``on_error``, or are shown
+        in a message box. ``on_late`` gets the result of a call that wrote
+        something but finished after being cancelled or timing out.
+        """
+        self.cancel_db_call(name)
+        
+        def finish(callback, value):
+            if self.pending_calls.get(name) is call:
+                del self.pending_calls[name]
+            if loading and self.loading_call is call:
+                self.loading_call = None
+                self.loading_overlay.stop()
+            if callback is not None:
+                callback(value)
+        
+        call = get_db_worker().run(
+            fn, *args,
+            on_done=lambda result: finish(on_done, result),
+            on_error=lambda error: finish(on_error or self.show_db_error, error),
+            on_late=on_late
+        )
+        self.pending_calls[name] = call
+        if loading:
+            self.loading_call = call
+            self.loading_overlay.start(loading, on_cancel=lambda: self.cancel_db_call(name))
+        return call
+    
+    def cancel_db_call(self, name):
+        """Cancel the pending database call of this kind, if any."""
+        call = self.pending_calls.pop(name, None)
+        if call is not None:
+            call.cancel()
+            if call is self.loading_call:
+                self.loading_call = None
+                self.loading_overlay.stop()
+    
+    def show_db_error(self, error):
+        """Report a failed database call."""
+        if isinstance(error, TaskTimeoutError):
+            self.show_message("Connection Problem",
+                              "The server is not responding. Please try again or contact staff.",
+                              QMessageBox.Warning)
+        else:
+            self.show_message("Error", f"Database error: {str(error)}", QMessageBox.Critical)
     
     def create_pre_login_page(self):
         """Create the pre-login page with options for PC users and non-PC users."""
@@ -801,10 +1188,18 @@ class LauncherMainWindow(QMainWindow):
 
     def show_non_pc_order_page(self):
         """Show the non-PC user order page using the existing food menu page."""
+        self.run_db_call('walk_in', self.fetch_walk_in_session,
+                         on_done=self.on_walk_in_session_ready,
+                         on_error=self.on_walk_in_session_failed,
+                         on_late=self.discard_walk_in_session,
+                         loading="Preparing the menu...")
+    
+    @staticmethod
+    def fetch_walk_in_session():
+        """Create a session for a walk-in customer (runs on a worker thread)."""
+        # First create a temporary user if none exists
+        cursor = db.get_cursor()
         try:
-            # First create a temporary user if none exists
-            cursor = db.get_cursor()
-            
             # First check if walk-in user exists
             cursor.execute("""
                 SELECT id FROM users WHERE civil_id = 'WALK-IN'
@@ -840,49 +1235,119 @@ class LauncherMainWindow(QMainWindow):
             else:
                 walk_in_pc_id = walk_in_pc['id']
             
-            # Then create a session with the user ID and walk-in PC
+            # Then create a session with the user ID and walk-in PC; its
+            # minutes are recorded when it closes (see close_walk_in_session)
+            started = datetime.now()
             cursor.execute("""
                 INSERT INTO sessions (user_id, pc_id, status, start_time, duration_minutes)
-                VALUES (%s, %s, 'active', NOW(), 1440)
-            """, (user_id, walk_in_pc_id))
+                VALUES (%s, %s, 'active', %s, 0)
+            """, (user_id, walk_in_pc_id, started))
+            session_id = cursor.lastrowid
+            DailyStats.record_session(cursor, user_id, started, 0, 0)
             db.commit()
-            
-            # Store the user and session info
-            self.current_user = {'id': user_id, 'name': 'Walk-in Customer'}
-            self.current_session = {'id': cursor.lastrowid}
-            
+        finally:
             cursor.close()
-            
-            # Use the existing food menu page (same as PC users)
-            # Initialize with food category
-            self.item_set = "food"
-            
-            # Make sure the food button is checked and select the correct page
-            self.food_btn.setChecked(True)
-            self.drinks_btn.setChecked(False)
-            self.accessories_btn.setChecked(False)
-            self.services_btn.setChecked(False)
-            self.orders_btn.setChecked(False)
-            self.menu_stack.setCurrentIndex(0)
-            
-            # Load menu items for the food category
-            self.load_menu_items()
-            
-            # Load user orders
-            self.load_user_orders()
-            
-            # Start orders refresh timer
-            # self.orders_refresh_timer.start(60000)  # Refresh every minute
-            
-            # Show the food menu page
-            self.stacked_widget.setCurrentWidget(self.food_menu_page)
-            
-        except Exception as e:
-            print(f"Error creating temporary session: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        
+        return {
+            'user_id': user_id,
+            'session_id': session_id,
+            'menu': LauncherMainWindow.fetch_menu(),
+        }
+    
+    def discard_walk_in_session(self, result):
+        """Remove a walk-in session created after its loading screen was cancelled."""
+        self.run_db_call(f"discard_walk_in_{result['session_id']}", self.delete_walk_in_session,
+                         result['session_id'],
+                         on_error=lambda e: print(f"Error removing abandoned walk-in session: {str(e)}"))
+    
+    @staticmethod
+    def delete_walk_in_session(session_id):
+        """
+        Delete a walk-in session nobody used and take it back out of the
+        daily stats (runs on a worker thread).
+        """
+        with db.transaction() as cursor:
+            cursor.execute("""
+                SELECT user_id, start_time, payment_amount, duration_minutes FROM sessions
+                WHERE id = %s AND status = 'active'
+                AND NOT EXISTS (SELECT 1 FROM orders WHERE session_id = %s)
+                FOR UPDATE
+            """, (session_id, session_id))
+            session = cursor.fetchone()
+            if session is None:
+                return
+            DailyStats.remove_session(cursor, session_id, session['user_id'], session['start_time'],
+                                      session['payment_amount'], session['duration_minutes'])
+            cursor.execute("DELETE FROM sessions WHERE id = %s", (session_id,))
+    
+    def end_walk_in_session(self):
+        """Close the current walk-in session in the background."""
+        session_id = self.current_session_id()
+        self.current_user = None
+        self.current_session = None
+        if session_id:
+            self.run_db_call(f"close_walk_in_{session_id}", self.close_walk_in_session, session_id,
+                             on_error=lambda e: print(f"Error closing walk-in session: {str(e)}"))
+    
+    @staticmethod
+    def close_walk_in_session(session_id):
+        """
+        Complete a walk-in session and record the minutes it actually lasted
+        (runs on a worker thread).
+        """
+        with db.transaction() as cursor:
+            cursor.execute("""
+                SELECT start_time, TIMESTAMPDIFF(MINUTE, start_time, NOW()) as minutes
+                FROM sessions WHERE id = %s AND status = 'active'
+                FOR UPDATE
+            """, (session_id,))
+            session = cursor.fetchone()
+            if session is None:
+                return
+            cursor.execute("""
+                UPDATE sessions SET status = 'completed', end_time = NOW(), duration_minutes = %s
+                WHERE id = %s
+            """, (session['minutes'], session_id))
+            DailyStats.add(cursor, session['start_time'], total_minutes=session['minutes'])
+    
+    def on_walk_in_session_ready(self, result):
+        """Open the food menu for the walk-in session created on the worker."""
+        # Store the user and session info
+        self.current_user = {'id': result['user_id'], 'name': 'Walk-in Customer'}
+        self.current_session = {'id': result['session_id']}
+        self.set_menu_items(result['menu'])
+        
+        # Use the existing food menu page (same as PC users)
+        # Initialize with food category
+        self.item_set = "food"
+        
+        # Make sure the food button is checked and select the correct page
+        self.food_btn.setChecked(True)
+        self.drinks_btn.setChecked(False)
+        self.accessories_btn.setChecked(False)
+        self.services_btn.setChecked(False)
+        self.orders_btn.setChecked(False)
+        self.menu_stack.setCurrentIndex(0)
+        
+        # Load menu items for the food category
+        self.load_menu_items()
+        
+        # Load user orders
+        self.load_user_orders()
+        
+        # Start orders refresh timer
+        # self.orders_refresh_timer.start(60000)  # Refresh every minute
+        
+        # Show the food menu page
+        self.stacked_widget.setCurrentWidget(self.food_menu_page)
+    
+    def on_walk_in_session_failed(self, error):
+        print(f"Error creating temporary session: {str(error)}")
+        if isinstance(error, TaskTimeoutError):
+            self.show_db_error(error)
+        else:
             self.show_message("Error", "Failed to initialize ordering system. Please try again.", QMessageBox.Critical)
-            self.stacked_widget.setCurrentWidget(self.pre_login_page)
+        self.stacked_widget.setCurrentWidget(self.pre_login_page)
 
     def create_login_page(self):
         """Create the login page with modern gaming styling."""
@@ -1161,28 +1626,14 @@ class LauncherMainWindow(QMainWindow):
         line.setStyleSheet("background-color: rgba(0, 195, 255, 0.5); border: none; height: 2px;")
         layout.addWidget(line)
         
-        # Games grid
-        self.games_container = QWidget()
-        self.games_container.setStyleSheet("""
+        # Games grid: a virtualized view that only paints the visible cards
+        self.games_view = GameGridView("No games available")
+        self.games_view.setStyleSheet("""
+            QListView {
                 background-color: rgba(18, 18, 30, 0.85);
                 border: 1px solid rgba(0, 195, 255, 0.5);
                 border-radius: 10px;
                 padding: 10px;
-        """)
-        self.games_layout = QGridLayout(self.games_container)
-        self.games_layout.setContentsMargins(10, 10, 10, 10)
-        self.games_layout.setSpacing(20)
-        
-        # Games will be dynamically populated in load_games method
-        
-        # Add games container to scrollable area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.games_container)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
             }
             QScrollBar:vertical {
                 background: rgba(25, 25, 40, 0.5);
@@ -1198,8 +1649,7 @@ class LauncherMainWindow(QMainWindow):
                 height: 0px;
             }
         """)
-        
-        layout.addWidget(scroll_area)
+        layout.addWidget(self.games_view)
         
         return page
     
@@ -1343,11 +1793,13 @@ class LauncherMainWindow(QMainWindow):
         # Container for menu items
         food_container = QWidget()
         food_container.setStyleSheet("""
-            background-color: rgba(18, 18, 30, 0.85);
-            border: 1px solid rgba(255, 152, 0, 0.5);
-            border-radius: 10px;
-            padding: 10px;
-        """)
+            * {
+                background-color: rgba(18, 18, 30, 0.85);
+                border: 1px solid rgba(255, 152, 0, 0.5);
+                border-radius: 10px;
+                padding: 10px;
+            }
+        """ + MENU_CARD_STYLE)
         self.food_grid = QGridLayout(food_container)
         self.food_grid.setContentsMargins(10, 10, 10, 10)
         self.food_grid.setSpacing(20)
@@ -1385,11 +1837,13 @@ class LauncherMainWindow(QMainWindow):
         # Container for drinks items
         drinks_container = QWidget()
         drinks_container.setStyleSheet("""
-            background-color: rgba(18, 18, 30, 0.85);
-            border: 1px solid rgba(0, 150, 255, 0.5);
-            border-radius: 10px;
-            padding: 10px;
-        """)
+            * {
+                background-color: rgba(18, 18, 30, 0.85);
+                border: 1px solid rgba(0, 150, 255, 0.5);
+                border-radius: 10px;
+                padding: 10px;
+            }
+        """ + MENU_CARD_STYLE)
         self.drinks_grid = QGridLayout(drinks_container)
         self.drinks_grid.setContentsMargins(10, 10, 10, 10)
         self.drinks_grid.setSpacing(20)
@@ -1427,11 +1881,13 @@ class LauncherMainWindow(QMainWindow):
         # Container for accessories items
         accessories_container = QWidget()
         accessories_container.setStyleSheet("""
-            background-color: rgba(18, 18, 30, 0.85);
-            border: 1px solid rgba(153, 0, 255, 0.5);
-            border-radius: 10px;
-            padding: 10px;
-        """)
+            * {
+                background-color: rgba(18, 18, 30, 0.85);
+                border: 1px solid rgba(153, 0, 255, 0.5);
+                border-radius: 10px;
+                padding: 10px;
+            }
+        """ + MENU_CARD_STYLE)
         self.accessories_grid = QGridLayout(accessories_container)
         self.accessories_grid.setContentsMargins(10, 10, 10, 10)
         self.accessories_grid.setSpacing(20)
@@ -1468,12 +1924,14 @@ class LauncherMainWindow(QMainWindow):
         
         # Container for services items
         services_container = QWidget()
-        services_container.setStyleSheet("""
-            background-color: rgba(18, 18, 30, 0.85);
-            border: 1px solid rgba(0, 200, 100, 0.5);
-            border-radius: 10px;
-            padding: 10px;
-        """)
+        services_container.setStyleSheet("""
+            * {
+                background-color: rgba(18, 18, 30, 0.85);
+                border: 1px solid rgba(0, 200, 100, 0.5);
+                border-radius: 10px;
+                padding: 10px;
+            }
+        """ + MENU_CARD_STYLE)
         self.services_grid = QGridLayout(services_container)
         self.services_grid.setContentsMargins(10, 10, 10, 10)
         self.services_grid.setSpacing(20)
@@ -1520,6 +1978,16 @@ class LauncherMainWindow(QMainWindow):
             "service": self.services_grid
         }
         
+        # Pooled menu cards per category
+        self.category_cards = {
+            category: CardGrid(
+                grid,
+                lambda: MenuCard(self.show_order_dialog),
+                f"No items available for category: {category}"
+            )
+            for category, grid in self.category_layouts.items()
+        }
+        
         # Add stacked widget to main layout
         layout.addWidget(self.menu_stack, 1)  # 1 = stretch factor to take available space
         
@@ -1745,14 +2213,17 @@ class LauncherMainWindow(QMainWindow):
         # Container for apps
         apps_container = QWidget()
         apps_container.setStyleSheet("""
-            background-color: rgba(18, 18, 30, 0.85);
-            border: 1px solid rgba(76, 175, 80, 0.5);
-            border-radius: 10px;
-            padding: 10px;
-        """)
+            * {
+                background-color: rgba(18, 18, 30, 0.85);
+                border: 1px solid rgba(76, 175, 80, 0.5);
+                border-radius: 10px;
+                padding: 10px;
+            }
+        """ + GAME_CARD_STYLE)
         self.apps_layout = QGridLayout(apps_container)
         self.apps_layout.setContentsMargins(10, 10, 10, 10)
         self.apps_layout.setSpacing(20)
+        self.app_cards = CardGrid(self.apps_layout, GameCard, "No applications available")
         
         # Add apps container to scrollable area
         scroll_area = QScrollArea()
@@ -1793,173 +2264,309 @@ class LauncherMainWindow(QMainWindow):
             self.show_message("Error", "Please enter your Civil ID or Phone Number", QMessageBox.Warning)
             return
         
+        self.run_db_call('login', self.fetch_login, login_id,
+                         on_done=self.on_login_loaded,
+                         on_error=lambda error: self.on_login_failed(login_id, error),
+                         loading="Signing in...")
+    
+    @staticmethod
+    def fetch_login(login_id):
+        """
+        Look up the user, their PC and their active session (runs on a worker thread).
+        
+        Returns:
+            dict: user, pc, session and countdown (None where not found) and the menu
+        """
+        result = {'user': None, 'pc': None, 'session': None, 'countdown': None, 'menu': None}
+        
         # Try to find user by civil ID or phone
         user = User.get_by_civil_id(login_id) or User.get_by_phone(login_id)
+        if not user:
+            return result
+        result['user'] = user
+        
+        # Check if user has an active PC assignment
+        assigned_pc = PC.get_by_user_id(user.id)
+        if not assigned_pc:
+            return result
+        result['pc'] = assigned_pc
+        
+        # Queued locally first, so it is replayed if the write does not get through
+        get_offline_store().set_pc_status(assigned_pc.pc_number, 'occupied')
+        
+        # Get active session and calculate remaining time
+        cursor = db.get_cursor()
+        try:
+            query = """
+            SELECT * FROM sessions 
+            WHERE user_id = %s AND pc_id = %s AND status = 'active'
+            ORDER BY start_time DESC LIMIT 1
+            """
+            cursor.execute(query, (user.id, assigned_pc.id))
+            session_data = cursor.fetchone()
+        finally:
+            cursor.close()
+        
+        if session_data:
+            result['session'] = session_data
+            result['countdown'] = Session.get_countdown(session_data['id'])
+            result['menu'] = LauncherMainWindow.fetch_menu()
+            if result['countdown'] and result['countdown']['remaining_seconds'] is not None:
+                # Lets the user sign back in on this PC while the database is down
+                get_offline_store().save_session(user, assigned_pc, session_data,
+                                                 result['countdown']['remaining_seconds'])
+        return result
+    
+    def on_login_failed(self, login_id, error):
+        """Fall back to the cached session when the database cannot be reached."""
+        if not is_connection_error(error):
+            self.show_db_error(error)
+            return
+        print(f"Database unreachable during login, trying the cached session: {str(error)}")
+        self.run_db_call('login', self.offline_store.cached_login, login_id,
+                         on_done=self.on_offline_login, loading="Signing in...")
+    
+    def on_offline_login(self, result):
+        if result is None:
+            self.show_message("Connection Problem",
+                              "The server is not responding and there is no saved session for you "
+                              "on this PC. Please contact staff.",
+                              QMessageBox.Warning)
+            return
+        self.on_login_loaded(result)
+    
+    def on_login_loaded(self, result):
+        """Finish logging in with the data fetched by fetch_login."""
+        user = result['user']
+        assigned_pc = result['pc']
         
         if not user:
             self.show_message("Login Failed", "User not found. Please check your credentials.", QMessageBox.Warning)
             return
         
-        # Check if user has an active PC assignment
-        assigned_pc = PC.get_by_user_id(user.id)
-
-        if assigned_pc:
-            # User has an existing active session with a PC
-            # Check if user is trying to login from the correct PC
-            # default_pc = int(os.getenv('DEFAULT_PC_NUMBER', 1))
-            # if assigned_pc.pc_number != default_pc:
-            #     self.show_message("Wrong PC", 
-            #         f"You are assigned to PC #{assigned_pc.pc_number} but trying to login from PC #{default_pc}. "
-            #         "Please use your assigned PC.", QMessageBox.Warning)
-            #     return
-
-            self.show_message("Login Successful", 
-                           f"Welcome back, {user.name}! You are assigned to PC #{assigned_pc.pc_number}.",
-                           QMessageBox.Information)
-            
-            # Set self.pc_number to the assigned PC number
-            self.pc_number = assigned_pc.pc_number
-
-            assigned_pc.update_status('occupied', True)
-
-            try:
-                # Get active session and calculate remaining time
-                cursor = db.get_cursor()
-                query = """
-                SELECT * FROM sessions 
-                WHERE user_id = %s AND pc_id = %s AND status = 'active'
-                ORDER BY start_time DESC LIMIT 1
-                """
-                cursor.execute(query, (user.id, assigned_pc.id))
-                session_data = cursor.fetchone()
-                cursor.close()
+        if not assigned_pc:
+            # If no PC is automatically assigned, use the pc_number provided to the launcher
+            self.show_message("Error", "No PC number assigned. Please contact staff.", QMessageBox.Warning)
+            return
+        
+        # User has an existing active session with a PC
+        # Check if user is trying to login from the correct PC
+        # default_pc = int(os.getenv('DEFAULT_PC_NUMBER', 1))
+        # if assigned_pc.pc_number != default_pc:
+        #     self.show_message("Wrong PC", 
+        #         f"You are assigned to PC #{assigned_pc.pc_number} but trying to login from PC #{default_pc}. "
+        #         "Please use your assigned PC.", QMessageBox.Warning)
+        #     return
+        
+        self.show_message("Login Successful", 
+                       f"Welcome back, {user.name}! You are assigned to PC #{assigned_pc.pc_number}.",
+                       QMessageBox.Information)
+        
+        # Set self.pc_number to the assigned PC number
+        self.pc_number = assigned_pc.pc_number
+        
+        try:
+            session_data = result['session']
+            if session_data:
+                # Found an active session
+                self.current_user = user
+                self.current_session = session_data
+                self.set_menu_items(result['menu'])
                 
-                if session_data:
-                    # Found an active session
-                    self.current_user = user
-                    self.current_session = session_data
+                # Count down against the server's end time
+                countdown = result['countdown']
+                if countdown and countdown['remaining_seconds'] is not None:
+                    self.set_remaining_time(countdown['remaining_seconds'])
+                    self.session_paused = countdown['status'] == 'paused'
+                else:
+                    # No end_time in session, fallback to duration_minutes
+                    duration_minutes = session_data.get('duration_minutes', 60)
+                    start_time = session_data.get('start_time', datetime.now())
                     
-                    # Calculate remaining time
-                    if 'end_time' in session_data and session_data['end_time']:
-                        # Convert end_time to datetime if it's a string
-                        if isinstance(session_data['end_time'], str):
-                            end_time = datetime.strptime(session_data['end_time'], "%Y-%m-%d %H:%M:%S")
-                        else:
-                            end_time = session_data['end_time']
-                        
-                        # Calculate remaining seconds
-                        now = datetime.now()
-                        if end_time > now:
-                            remaining_seconds = int((end_time - now).total_seconds())
-                            self.remaining_time = remaining_seconds
-                        else:
-                            # Session expired but still active in database
-                            self.remaining_time = 0
-                    else:
-                        # No end_time in session, fallback to duration_minutes
-                        duration_minutes = session_data.get('duration_minutes', 60)
-                        start_time = session_data.get('start_time', datetime.now())
+                    # Convert start_time to datetime if it's a string
+                    if isinstance(start_time, str):
+                        start_time = datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
                         
-                        # Convert start_time to datetime if it's a string
-                        if isinstance(start_time, str):
-                            start_time = datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
-                            
-                        # Calculate elapsed time
-                        elapsed_seconds = int((datetime.now() - start_time).total_seconds())
-                        total_seconds = duration_minutes * 60
-                        self.remaining_time = max(0, total_seconds - elapsed_seconds)
-                else:
-                    # No active session found, create default one-hour timer
-                    self.remaining_time = 3600  # Default to 1 hour
-
-                
-
-                # Update UI
-                self.user_label.setText(f"Welcome, {user.name} - PC #{assigned_pc.pc_number}")
-                self.update_timer()
-                self.timer.start(1000)  # Update every second
-                
-                # Load games
-                self.load_games()
-                
-                # Switch to main page
-                self.stacked_widget.setCurrentWidget(self.main_page)
-
-            except Exception as e:
-                self.show_message("Error", f"No active session found. Please contact staff. {str(e)}", QMessageBox.Critical)
-                import traceback
-                traceback.print_exc()
-
-        else:
-            # If no PC is automatically assigned, use the pc_number provided to the launcher
-            if not self.pc_number:
-                self.show_message("Error", "No PC number assigned. Please contact staff.", QMessageBox.Warning)
-                return
+                    # Calculate elapsed time
+                    elapsed_seconds = int((datetime.now() - start_time).total_seconds())
+                    self.set_remaining_time(duration_minutes * 60 - elapsed_seconds)
+            else:
+                # No active session found, create default one-hour timer
+                self.set_remaining_time(3600)  # Default to 1 hour
             
-            self.show_message("Error", "No PC number assigned. Please contact staff.", QMessageBox.Warning)
+            # Update UI
+            self.user_label.setText(f"Welcome, {user.name} - PC #{assigned_pc.pc_number}")
+            self.time_warnings_shown = set()
+            self.update_timer()
+            self.timer.start(1000)  # Redraw every second
+            
+            # Load games
+            self.load_games()
+            self.load_exit_password()
+            
+            # Switch to main page
+            self.stacked_widget.setCurrentWidget(self.main_page)
+        
+        except Exception as e:
+            self.show_message("Error", f"No active session found. Please contact staff. {str(e)}", QMessageBox.Critical)
+            import traceback
+            traceback.print_exc()
+    
+    def set_remaining_time(self, seconds):
+        """Anchor the countdown so that ``seconds`` are left from now."""
+        self.session_deadline = time.monotonic() + max(0, seconds)
+    
+    def remaining_seconds(self):
+        """Seconds left in the session, derived from the monotonic deadline."""
+        if self.session_deadline is None:
+            return None
+        return max(0, math.ceil(self.session_deadline - time.monotonic()))
+    
+    def current_session_id(self):
+        """The id of the current session, whether it is a row dict or a Session."""
+        if isinstance(self.current_session, dict):
+            return self.current_session.get('id')
+        return getattr(self.current_session, 'id', None)
+    
+    def send_heartbeat(self):
+        """Report this launcher as alive and apply staff extensions, pauses and terminations."""
+        if not self.pc_number or 'heartbeat' in self.pending_calls:
+            # Not set up yet, or the previous beat is still on its way
             return
-                
-                
-
+        session_id = self.current_session_id()
+        self.run_db_call(
+            'heartbeat', self.beat_and_replay, self.pc_number, session_id,
+            on_done=lambda state: self.on_heartbeat(session_id, state),
+            # Keep counting down locally; the next heartbeat will catch up
+            on_error=lambda e: print(f"Error sending heartbeat: {str(e)}")
+        )
+    
+    @staticmethod
+    def beat_and_replay(pc_number, session_id):
+        """Send a heartbeat, then replay any writes queued while offline (runs on a worker thread)."""
+        state = Heartbeat.beat(pc_number, session_id)
+        get_offline_store().replay()
+        return state
+    
+    def on_heartbeat(self, session_id, state):
+        """Apply the session state read back by a heartbeat."""
+        if session_id is None or session_id != self.current_session_id():
+            return
+        if state is None or state['status'] in ('completed', 'terminated'):
+            # Ended from the admin side, nothing left to write back
+            self.end_session(update_database=False)
+            return
+        
+        self.session_paused = state['status'] == 'paused'
+        if state['remaining_seconds'] is not None:
+            self.set_remaining_time(state['remaining_seconds'])
+        self.update_timer()
+    
     def update_timer(self):
         """Update the session timer."""
-        if self.remaining_time is None:
+        remaining = self.remaining_seconds()
+        if remaining is None:
             return
         
-        if self.remaining_time <= 0:
-            self.end_session()
+        if self.session_paused:
+            # The deadline is refreshed on resume, so just hold the display
+            self.timer_label.setText("Session Paused")
             return
         
-        # Show warnings when time is running low
-        if self.remaining_time == 300:  # 5 minutes warning
-            self.timer_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #FFA500;")  # Orange
-            self.show_message("Time Warning", "Your session will end in 5 minutes. Please save your progress.", QMessageBox.Warning)
-        elif self.remaining_time == 60:  # 1 minute warning
-            self.timer_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #FF0000;")  # Red
-            self.show_message("Time Warning", "Your session will end in 1 minute! Please finish up now.", QMessageBox.Critical)
-            
-        hours = self.remaining_time // 3600
-        minutes = (self.remaining_time % 3600) // 60
-        seconds = self.remaining_time % 60
+        if remaining <= 0:
+            self.timer_label.setText("Time Remaining: 00:00:00")
+            self.check_session_end()
+            return
+        
+        # Forget warnings for thresholds the session is back above (extended)
+        self.time_warnings_shown = {t for t in self.time_warnings_shown if remaining <= t}
+        
+        # Show warnings when time is running low; a threshold fires once when
+        # crossed, however the ticks happen to land
+        color, warning = "#00c3ff", None
+        for threshold, warning_color, message, icon in TIME_WARNINGS:
+            if remaining <= threshold:
+                color = warning_color
+                if threshold not in self.time_warnings_shown:
+                    # Mark every larger threshold too so only the most urgent one shows
+                    self.time_warnings_shown.update(t for t, _, _, _ in TIME_WARNINGS if t >= threshold)
+                    warning = (message, icon)
+                break
+        if color != self.timer_label.property("countdownColor"):
+            self.timer_label.setProperty("countdownColor", color)
+            self.timer_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {color};")
+        if warning:
+            self.show_message("Time Warning", *warning)
+            
+        hours = remaining // 3600
+        minutes = (remaining % 3600) // 60
+        seconds = remaining % 60
         
         self.timer_label.setText(f"Time Remaining: {hours:02d}:{minutes:02d}:{seconds:02d}")
-        self.remaining_time -= 1
     
-    def end_session(self):
-        """End the current session and log out the user when time expires."""
+    def check_session_end(self):
+        """
+        Ask the server whether the session really ran out before ending it.
+        
+        Staff may have extended or paused the session since the last
+        heartbeat, so the local deadline alone is not enough.
+        """
+        call = self.pending_calls.get('end_check')
+        if call is not None and call.is_active():
+            return
+        session_id = self.current_session_id()
+        self.run_db_call('end_check', Session.get_countdown, session_id,
+                         on_done=lambda countdown: self.on_session_end_checked(session_id, countdown),
+                         on_error=lambda error: self.on_session_end_check_failed(session_id, error))
+    
+    def on_session_end_checked(self, session_id, countdown):
+        """End the session unless the server says it still has time."""
+        if session_id != self.current_session_id():
+            return
+        if countdown is None or countdown['status'] in ('completed', 'terminated'):
+            self.end_session(update_database=False)
+            return
+        
+        self.session_paused = countdown['status'] == 'paused'
+        if self.session_paused or (countdown['remaining_seconds'] or 0) > 0:
+            # Extended or paused since the last heartbeat
+            if countdown['remaining_seconds'] is not None:
+                self.set_remaining_time(countdown['remaining_seconds'])
+            self.update_timer()
+            return
+        self.end_session()
+    
+    def on_session_end_check_failed(self, session_id, error):
+        """End locally when the server cannot be asked; the queued completion re-checks it."""
+        if session_id != self.current_session_id():
+            return
+        print(f"Could not confirm the session end with the server: {str(error)}")
+        self.end_session()
+    
+    def end_session(self, update_database=True):
+        """
+        End the current session and log out the user when time expires.
+        
+        Args:
+            update_database (bool): False when the session was already ended
+                elsewhere, so only the local logout happens
+        """
         try:
             # Stop the orders refresh timer
             # if self.orders_refresh_timer.isActive():
             #     self.orders_refresh_timer.stop()
             
-            # Update session status in database
-            if self.current_session:
-                # Check if session has an ID field or is a dictionary
-                if isinstance(self.current_session, dict) and 'id' in self.current_session:
-                    session_id = self.current_session['id']
-                    cursor = db.get_cursor()
-                    cursor.execute(
-                        "UPDATE sessions SET status = 'completed' WHERE id = %s",
-                        (session_id,)
-                    )
-                    db.commit()
-                    cursor.close()
-                elif hasattr(self.current_session, 'id') and hasattr(self.current_session, 'update_status'):
-                    # Use the method if available
-                    self.current_session.update_status('completed')
+            # Results still on their way belong to the ending session
+            for name in ('heartbeat', 'end_check', 'games', 'apps', 'menu', 'orders'):
+                self.cancel_db_call(name)
             
-            # Update PC status in database
-            if self.pc_number:
-                try:
-                    cursor = db.get_cursor()
-                    cursor.execute(
-                        "UPDATE pcs SET is_occupied = FALSE, status = 'available' WHERE pc_number = %s",
-                        (self.pc_number,)
-                    )
-                    db.commit()
-                    cursor.close()
-                except Exception as e:
-                    print(f"Error updating PC status: {str(e)}")
+            # Write the session and PC status back on a worker; logging out
+            # does not wait for it
+            if update_database:
+                self.run_db_call(
+                    'end_session', self.finish_session, self.current_session_id(), self.pc_number,
+                    on_error=lambda e: print(f"Error updating session and PC status: {str(e)}")
+                )
             
             # Stop the timer
             if self.timer.isActive():
@@ -1968,7 +2575,9 @@ class LauncherMainWindow(QMainWindow):
             # Clean up resources
             self.current_user = None
             self.current_session = None
-            self.remaining_time = None
+            self.menu_items_by_category = None
+            self.session_deadline = None
+            self.session_paused = False
             
             # Show session ended message
             self.show_message(
@@ -1999,6 +2608,15 @@ class LauncherMainWindow(QMainWindow):
             # Still try to lock the PC
             QTimer.singleShot(5000, self.lock_workstation)
             
+    @staticmethod
+    def finish_session(session_id, pc_number):
+        """Mark the session completed and free the PC (runs on a worker thread)."""
+        store = get_offline_store()
+        store.clear_session()
+        # Queued locally first and replayed by the heartbeat if MySQL is down
+        if not store.complete_session(session_id, pc_number):
+            print("Database unreachable; session completion queued for replay")
+    
     def lock_workstation(self):
         """Lock the Windows workstation."""
         try:
@@ -2070,7 +2688,7 @@ class LauncherMainWindow(QMainWindow):
             return
             
         # Check if a password is set in settings
-        stored_password = self.get_exit_password()
+        stored_password = self.exit_password
         if not stored_password:
             # No password set, allow exit
             event.accept()
@@ -2113,20 +2731,32 @@ class LauncherMainWindow(QMainWindow):
             # User canceled, don't exit
             event.ignore()
             
-    def get_exit_password(self):
-        """Get the exit password from settings table."""
+    @staticmethod
+    def fetch_exit_password():
+        """Get the exit password from settings table (runs on a worker thread)."""
+        cursor = db.get_cursor()
         try:
-            cursor = db.get_cursor()
             cursor.execute("SELECT value FROM settings WHERE category = 'security' AND name = 'launcher_exit_password'")
             result = cursor.fetchone()
-            cursor.close()
             
             if result and 'value' in result:
                 return result['value']
             return ""  # Return empty string if no password set
-        except Exception as e:
-            print(f"Error fetching exit password: {str(e)}")
-            return ""  # Return empty string on error
+        finally:
+            cursor.close()
+    
+    def load_exit_password(self):
+        """Refresh the cached exit password in the background."""
+        self.run_db_call('exit_password', self.fetch_exit_password,
+                         on_done=self.on_exit_password_loaded,
+                         on_error=self.on_exit_password_failed)
+    
+    def on_exit_password_loaded(self, password):
+        self.exit_password = password or ""
+    
+    def on_exit_password_failed(self, error):
+        # Keep the last password we fetched
+        print(f"Error fetching exit password: {str(error)}")
             
     def verify_exit_password(self, entered_password, stored_password):
         """Verify if the entered password matches the stored password."""
@@ -2146,57 +2776,40 @@ class LauncherMainWindow(QMainWindow):
         """Attempt to close the application."""
         self.close()
 
-    def load_games(self):
-        """Load games from the database and display them in the grid."""
+    @staticmethod
+    def fetch_games(apps=False):
+        """Fetch the available games, or the apps (runs on a worker thread)."""
+        # Adapt query to whichever availability column the schema has (probed once)
+        availability_column = schema_info.first_column('games', 'is_available', 'is_active')
+        
+        # Build the query based on schema
+        category_filter = "category = 'App'" if apps else "category != 'App'"
+        if availability_column:
+            query = f"SELECT * FROM games WHERE {category_filter} AND {availability_column} = TRUE ORDER BY name"
+        else:
+            query = f"SELECT * FROM games WHERE {category_filter} ORDER BY name"
+        
+        cursor = db.get_cursor()
         try:
-            cursor = db.get_cursor()
-            
-            # Check if is_available or is_active column exists
-            cursor.execute("DESCRIBE games")
-            columns = [column['Field'] for column in cursor.fetchall()]
-            
-            # Adapt query based on available columns
-            if 'is_available' in columns:
-                availability_column = 'is_available'
-            elif 'is_active' in columns:
-                availability_column = 'is_active'
-            else:
-                availability_column = None
-            
-            # Build the query based on schema
-            if availability_column:
-                query = f"SELECT * FROM games WHERE category != 'App' AND {availability_column} = TRUE ORDER BY name"
-            else:
-                query = "SELECT * FROM games WHERE category != 'App' ORDER BY name"
-                
             cursor.execute(query)
-            games = cursor.fetchall()
+            return cursor.fetchall()
+        finally:
             cursor.close()
-            
-            # Clear existing games
-            for i in reversed(range(self.games_layout.count())):
-                widget = self.games_layout.itemAt(i).widget()
-                if widget:
-                    widget.setParent(None)
-            
-            if games:
-                # Calculate grid dimensions
-                cols = 5  # Number of columns in the grid
-                for i, game in enumerate(games):
-                    row = i // cols
-                    col = i % cols
-                    game_card = GameCard(game, self)
-                    self.games_layout.addWidget(game_card, row, col)
-            else:
-                # No games found
-                no_games_label = QLabel("No games available")
-                no_games_label.setAlignment(Qt.AlignCenter)
-                no_games_label.setStyleSheet("color: white; font-size: 16px;")
-                self.games_layout.addWidget(no_games_label, 0, 0)
-        except Exception as e:
-            self.show_message("Error", f"Failed to load games: {str(e)}", QMessageBox.Critical)
-            import traceback
-            traceback.print_exc()
+    
+    def load_games(self):
+        """Load games in the background and display them in the grid."""
+        self.games_view.set_empty_text("Loading games...")
+        self.run_db_call('games', self.fetch_games,
+                         on_done=self.on_games_loaded, on_error=self.on_games_failed)
+    
+    def on_games_loaded(self, games):
+        # The view only builds visuals for the rows on screen
+        self.games_view.set_empty_text("No games available")
+        self.games_view.set_games(games)
+    
+    def on_games_failed(self, error):
+        self.games_view.set_empty_text("No games available")
+        self.show_message("Error", f"Failed to load games: {str(error)}", QMessageBox.Critical)
 
     def show_food_menu(self):
         """Show the food menu page and load menu items."""
@@ -2235,236 +2848,50 @@ class LauncherMainWindow(QMainWindow):
         # self.orders_refresh_timer.stop()
         self.stacked_widget.setCurrentWidget(self.main_page)
 
+    @staticmethod
+    def fetch_menu():
+        """Fetch the menu for all categories in one query (runs on a worker thread)."""
+        try:
+            return MenuItem.get_menu_by_category()
+        except Exception as e:
+            print(f"Error prefetching menu items: {str(e)}")
+            return {}
+    
+    def set_menu_items(self, menu_items_by_category):
+        """Replace the cached menu and forget rendered pages."""
+        self.menu_items_by_category = menu_items_by_category
+        self.rendered_menu_categories = set()
+    
+    def prefetch_menu_items(self):
+        """Fetch the menu in the background and show it once it arrives."""
+        self.run_db_call('menu', self.fetch_menu, on_done=self.on_menu_items_loaded)
+    
+    def on_menu_items_loaded(self, menu_items_by_category):
+        self.set_menu_items(menu_items_by_category)
+        if self.stacked_widget.currentWidget() is self.food_menu_page:
+            self.load_menu_items()
+    
     def load_menu_items(self):
-        """Load menu items from the database and display them."""
+        """Display the menu items of the current category."""
         try:
             # Get the target layout based on current category
             if not hasattr(self, 'category_layouts') or self.item_set not in self.category_layouts:
                 print(f"Error: Category '{self.item_set}' not found in layouts")
                 return
                 
-            target_layout = self.category_layouts[self.item_set]
-            
-            # Clear existing items from the target layout
-            for i in reversed(range(target_layout.count())): 
-                item = target_layout.itemAt(i)
-                if item and item.widget():
-                    item.widget().setParent(None)
-            
-            # Get menu items from database
-            cursor = db.get_cursor()
-            
-            # Check table structure for availability and image fields
-            cursor.execute("DESCRIBE menu_items")
-            columns = [column['Field'] for column in cursor.fetchall()]
-            
-            # Determine availability field
-            availability_field = None
-            if 'available' in columns:
-                availability_field = 'available = TRUE'
-            elif 'is_active' in columns:
-                availability_field = 'is_active = TRUE'
-            elif 'is_available' in columns:
-                availability_field = 'is_available = TRUE'
-            
-            # Determine image field
-            image_field = None
-            if 'image_path' in columns:
-                image_field = 'image_path'
-            elif 'image' in columns:
-                image_field = 'image'
-            
-            # Build query based on available fields
-            query = "SELECT id, name, price, description, category"
-            if image_field:
-                query += f", {image_field}"
-            
-            # Start WHERE clause
-            query += " FROM menu_items WHERE 1=1"
-            
-            # Add availability filter
-            if availability_field:
-                query += f" AND {availability_field}"
-                
-            # Order by name
-            query += " ORDER BY name"
-            
-            cursor.execute(query)
-            menu_items = cursor.fetchall()
-            cursor.close()
+            # Menu items for every category are prefetched in one query at login,
+            # so switching categories never touches the database
+            if self.menu_items_by_category is None:
+                # Shown by on_menu_items_loaded once the fetch completes
+                self.prefetch_menu_items()
+                return
+            if self.item_set in self.rendered_menu_categories:
+                return
             
-            if menu_items:
-                # Filter items for the current category (case-insensitive)
-                filtered_items = []
-                for item in menu_items:
-                    item_category = item.get('category', '').lower()
-                    
-                    # Match exact category name
-                    if self.item_set.lower() == item_category:
-                        filtered_items.append(item)
-                    # Handle variations like "drinks" vs "drink"
-                    elif (self.item_set == "food" and "food" in item_category) or \
-                         (self.item_set == "drink" and any(c in item_category for c in ["drink", "beverage"])) or \
-                         (self.item_set == "accessory" and any(c in item_category for c in ["accessory", "accessories"])) or \
-                         (self.item_set == "service" and any(c in item_category for c in ["service", "services"])):
-                        filtered_items.append(item)
-                        
-                # Add items to the grid
-                row = 0
-                cols = 5  # Number of columns in the grid
-                col = 0
-                
-                for item in filtered_items:
-                    # Create item card
-                    card = QFrame()
-                    card.setFixedSize(200, 260)  # Reduced from 250x320
-                    card.setStyleSheet("""
-                        QFrame {
-                            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                stop:0 rgba(30, 30, 50, 0.9),
-                                stop:1 rgba(20, 20, 35, 0.95));
-                            border: 2px solid rgba(255, 152, 0, 0.3);
-                            border-radius: 12px;
-                            padding: 8px;
-                        }
-                        QFrame:hover {
-                            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                stop:0 rgba(40, 40, 60, 0.95),
-                                stop:1 rgba(30, 30, 45, 0.98));
-                            border: 2px solid rgba(255, 152, 0, 0.8);
-                        }
-                    """)
-                    
-                    # Add shadow effect to the card
-                    shadow = QGraphicsDropShadowEffect()
-                    shadow.setBlurRadius(15)
-                    shadow.setColor(QColor(255, 152, 0, 100))
-                    shadow.setOffset(0, 4)
-                    card.setGraphicsEffect(shadow)
-                    
-                    # Create layout for the card
-                    card_layout = QVBoxLayout(card)
-                    card_layout.setContentsMargins(8, 8, 8, 8)
-                    card_layout.setSpacing(6)
-                    
-                    # Image container with rounded corners
-                    if image_field and item.get(image_field):
-                        image_container = QFrame()
-                        image_container.setFixedHeight(120)  # Reduced from 160
-                        image_container.setStyleSheet("""
-                            QFrame {
-                                background-color: rgba(40, 40, 60, 0.5);
-                                border-radius: 8px;
-                                border: 1px solid rgba(255, 152, 0, 0.3);
-                            }
-                        """)
-                        image_layout = QVBoxLayout(image_container)
-                        image_layout.setContentsMargins(4, 4, 4, 4)
-                        
-                        image_label = QLabel()
-                        pixmap = QPixmap(item[image_field])
-                        if not pixmap.isNull():
-                            scaled_pixmap = pixmap.scaled(160, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)  # Reduced from 200x140
-                            image_label.setPixmap(scaled_pixmap)
-                            image_label.setAlignment(Qt.AlignCenter)
-                            image_layout.addWidget(image_label)
-                        
-                        card_layout.addWidget(image_container)
-                    
-                    # Item name with modern styling
-                    name_label = QLabel(item['name'])
-                    name_label.setFont(QFont("Segoe UI", 12, QFont.Bold))  # Reduced from 14
-                    name_label.setStyleSheet("""
-                        color: #ff9800;
-                        letter-spacing: 1px;
-                    """)
-                    name_label.setAlignment(Qt.AlignCenter)
-                    card_layout.addWidget(name_label)
-                    
-                    # Item description with modern styling
-                    if item.get('description'):
-                        desc_label = QLabel(item['description'])
-                        desc_label.setWordWrap(True)
-                        desc_label.setFont(QFont("Segoe UI", 9))  # Reduced from 10
-                        desc_label.setStyleSheet("""
-                            color: #cccccc;
-                            background-color: rgba(40, 40, 60, 0.3);
-                            border-radius: 4px;
-                            padding: 4px;
-                        """)
-                        desc_label.setAlignment(Qt.AlignCenter)
-                        card_layout.addWidget(desc_label)
-                    
-                    # Price and order button container with modern styling
-                    price_container = QWidget()
-                    price_container.setStyleSheet("""
-                        QWidget {
-                            background-color: rgba(40, 40, 60, 0.5);
-                            border-radius: 8px;
-                            padding: 6px;
-                        }
-                    """)
-                    price_layout = QHBoxLayout(price_container)
-                    price_layout.setContentsMargins(6, 6, 6, 6)
-                    price_layout.setSpacing(8)
-                    
-                    # Price with modern styling
-                    price_label = QLabel(f"₹{float(item['price']):.2f}")
-                    price_label.setFont(QFont("Segoe UI", 14, QFont.Bold))  # Reduced from 16
-                    price_label.setStyleSheet("""
-                        color: #00c853;
-                    """)
-                    price_layout.addWidget(price_label)
-                    
-                    # Order button with modern styling
-                    order_button = QPushButton("ORDER NOW")
-                    order_button.setCursor(Qt.PointingHandCursor)
-                    order_button.setFixedWidth(80)  # Reduced from 100
-                    order_button.setStyleSheet("""
-                        QPushButton {
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                                stop:0 #ff9800, stop:1 #ff5722);
-                            color: white;
-                            border: none;
-                            border-radius: 6px;
-                            padding: 6px 6px;
-                            font-weight: bold;
-                            font-size: 10px;
-                            letter-spacing: 1px;
-                        }
-                        QPushButton:hover {
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                                stop:0 #ffa726, stop:1 #ff7043);
-                        }
-                        QPushButton:pressed {
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                                stop:0 #f57c00, stop:1 #f4511e);
-                        }
-                    """)
-                    order_button.clicked.connect(lambda checked, item_id=item['id'], name=item['name'], price=item['price']: 
-                        self.show_order_dialog(item_id, name, price))
-                    price_layout.addWidget(order_button)
-                    
-                    card_layout.addWidget(price_container)
-                    target_layout.addWidget(card, row, col)
-                    
-                    col += 1
-                    if col >= cols:
-                        col = 0
-                        row += 1
-                        
-                if not filtered_items:
-                    # No items found for this category
-                    no_items_label = QLabel(f"No items available for category: {self.item_set}")
-                    no_items_label.setAlignment(Qt.AlignCenter)
-                    no_items_label.setStyleSheet("color: white; font-size: 16px;")
-                    target_layout.addWidget(no_items_label, 0, 0)
-            else:
-                # No menu items found
-                no_items_label = QLabel(f"No items available for category: {self.item_set}")
-                no_items_label.setAlignment(Qt.AlignCenter)
-                no_items_label.setStyleSheet("color: white; font-size: 16px;")
-                target_layout.addWidget(no_items_label, 0, 0)
+            # Rebind the category's pooled cards to its items
+            menu_items = self.menu_items_by_category.get(self.item_set, [])
+            self.category_cards[self.item_set].show_items(menu_items)
+            self.rendered_menu_categories.add(self.item_set)
                 
         except Exception as e:
             print(f"Error in load_menu_items: {str(e)}")
@@ -2484,10 +2911,17 @@ class LauncherMainWindow(QMainWindow):
             self.orders_page = self.create_orders_page()
             self.stacked_widget.addWidget(self.orders_page)
             
+        session_id = self.current_session['id']
+        self.run_db_call('orders', Order.get_by_session, session_id,
+                         on_done=lambda orders: self.show_user_orders(session_id, orders))
+    
+    def show_user_orders(self, session_id, orders):
+        """Fill the orders table with the orders fetched for ``session_id``."""
+        if session_id != self.current_session_id():
+            return
+        
         # Now we can safely access the orders_table
         self.orders_table.setRowCount(0)
-        orders = Order.get_by_session(self.current_session['id'])
-
         for i, order in enumerate(orders):
             self.orders_table.insertRow(i)
             self.orders_table.setItem(i, 0, QTableWidgetItem(str(order.id)))
@@ -2517,54 +2951,90 @@ class LauncherMainWindow(QMainWindow):
                 """)
                 self.orders_table.setCellWidget(i, 3, cancel_button)
 
+    @staticmethod
+    def cancel_pending_order(order_id):
+        """Cancel an order if it is still pending (runs on a worker thread)."""
+        order = Order.get_by_id(order_id)
+        if order and order.status == 'pending':
+            order.update_status('cancelled')
+            return True
+        return False
+    
     def cancel_order(self, order_id):
         """Cancel a pending order."""
-        try:
-            order = Order.get_by_id(order_id)
-            if order and order.status == 'pending':
-                order.update_status('cancelled')
-                self.show_message("Success", "Order cancelled successfully.", QMessageBox.Information)
-                self.load_user_orders()  # Refresh orders
-            else:
-                self.show_message("Error", "Order cannot be cancelled.", QMessageBox.Warning)
-        except Exception as e:
-            self.show_message("Error", f"Failed to cancel order: {str(e)}", QMessageBox.Critical)
+        self.run_db_call('cancel_order', self.cancel_pending_order, order_id,
+                         on_done=self.on_order_cancelled, on_error=self.on_cancel_order_failed,
+                         loading="Cancelling order...")
+    
+    def on_order_cancelled(self, cancelled):
+        if cancelled:
+            self.show_message("Success", "Order cancelled successfully.", QMessageBox.Information)
+            self.load_user_orders()  # Refresh orders
+        else:
+            self.show_message("Error", "Order cannot be cancelled.", QMessageBox.Warning)
+    
+    def on_cancel_order_failed(self, error):
+        self.show_message("Error", f"Failed to cancel order: {str(error)}", QMessageBox.Critical)
 
     def show_order_dialog(self, item_id, name, price):
         """Show dialog to confirm order with quantity selection and extras/takeouts options."""
-        try:
-            # For non-PC users, create a temporary user if needed
-            if not self.current_user and self.current_session:
-                try:
-                    cursor = db.get_cursor()
+        # Check for active session
+        if not self.current_session:
+            self.show_message("Error", "No active session found.", QMessageBox.Warning)
+            return
+        
+        # For non-PC users, a temporary user is created along with the lookup
+        self.run_db_call('order_options', self.fetch_order_options, item_id, not self.current_user,
+                         on_done=lambda options: self.open_order_dialog(item_id, name, price, options),
+                         on_error=self.on_order_dialog_failed,
+                         loading="Loading item...")
+    
+    @staticmethod
+    def fetch_order_options(item_id, create_walk_in_user=False):
+        """
+        Fetch a menu item with its extras and takeouts (runs on a worker thread).
+        
+        Returns:
+            dict: menu_item (None if not found), extras, takeouts and the id
+                of the walk-in user created, if one was requested
+        """
+        options = {'walk_in_user_id': None, 'menu_item': None, 'extras': [], 'takeouts': []}
+        if create_walk_in_user:
+            try:
+                with db.transaction() as cursor:
                     cursor.execute("""
                         INSERT INTO users (name, civil_id, phone)
                         VALUES ('Walk-in Customer', 'WALK-IN', 'WALK-IN')
                     """)
-                    db.commit()
-                    self.current_user = {'id': cursor.lastrowid, 'name': 'Walk-in Customer'}
-                    cursor.close()
-                except Exception as e:
-                    print(f"Error creating temporary user: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+                    options['walk_in_user_id'] = cursor.lastrowid
+            except Exception as e:
+                print(f"Error creating temporary user: {str(e)}")
+                import traceback
+                traceback.print_exc()
+        
+        # Get menu item details
+        options['menu_item'] = MenuItem.get_by_id(item_id)
+        if options['menu_item']:
+            # Get extras and takeouts for this menu item
+            options['extras'] = MenuItemExtra.get_by_menu_item(item_id)
+            options['takeouts'] = MenuItemTakeout.get_by_menu_item(item_id)
+        return options
+    
+    def on_order_dialog_failed(self, error):
+        self.show_message("Error", f"Failed to show order dialog: {str(error)}", QMessageBox.Critical)
+    
+    def open_order_dialog(self, item_id, name, price, options):
+        """Show the order dialog for the item fetched by fetch_order_options."""
+        try:
+            if options['walk_in_user_id']:
+                self.current_user = {'id': options['walk_in_user_id'], 'name': 'Walk-in Customer'}
             
-            # Check for active session
-            if not self.current_session:
-                self.show_message("Error", "No active session found.", QMessageBox.Warning)
-                return
-                
-            # Get menu item details
-            menu_item = MenuItem.get_by_id(item_id)
+            menu_item = options['menu_item']
             if not menu_item:
                 self.show_message("Error", "Menu item not found.", QMessageBox.Warning)
                 return
-            
-            # Get extras for this menu item
-            extras = MenuItemExtra.get_by_menu_item(item_id)
-            
-            # Get takeouts for this menu item
-            takeouts = MenuItemTakeout.get_by_menu_item(item_id)
+            extras = options['extras']
+            takeouts = options['takeouts']
             
             dialog = QDialog(self)
             dialog.setWindowTitle("Place Order")
@@ -2766,109 +3236,117 @@ class LauncherMainWindow(QMainWindow):
                 extras_cost = float(extras_cost)
                 total_amount = (float(price) + extras_cost) * quantity
                 
-                # Create order in database
-                cursor = db.get_cursor()
-                try:
-                    # Create the order with extras and takeouts
-                    order_items = [{
-                        'menu_item_id': item_id, 
-                        'quantity': quantity,
-                        'extras': selected_extras,
-                        'takeouts': selected_takeouts
-                    }]
-                    
-                    Order.create(self.current_session['id'], order_items)
-                    
-                    # Build order description for message
-                    order_desc = f"{quantity} x {name}"
-                    
-                    # Add extras to description
-                    if selected_extras:
-                        extras_names = [extra.name for checkbox, extra in extras_checkboxes if checkbox.isChecked()]
-                        order_desc += f"\nExtras: {', '.join(extras_names)}"
-                    
-                    # Add takeouts to description
-                    if selected_takeouts:
-                        takeouts_names = [takeout.name for checkbox, takeout in takeouts_checkboxes if checkbox.isChecked()]
-                        order_desc += f"\nTakeouts: {', '.join(takeouts_names)}"
-                    
-                    # Show success message
-                    self.show_message(
-                        "Order Placed",
-                        f"Your order has been placed!\n\n"
-                        f"{order_desc}\n\n"
-                        f"Total: ₹{total_amount:.2f}\n"
-                        "Your order status is now 'pending'. Staff will deliver your order shortly.",
-                        QMessageBox.Information
-                    )
-                    
-                    # Refresh orders display
-                    self.load_user_orders()
-                    
-                except Exception as e:
-                    db.rollback()
-                    self.show_message("Error", f"Failed to place order: {str(e)}", QMessageBox.Critical)
-                    import traceback
-                    traceback.print_exc()
-                finally:
-                    cursor.close()
+                # Create the order with extras and takeouts
+                order_items = [{
+                    'menu_item_id': item_id, 
+                    'quantity': quantity,
+                    'extras': selected_extras,
+                    'takeouts': selected_takeouts
+                }]
+                
+                # Build order description for message
+                order_desc = f"{quantity} x {name}"
+                
+                # Add extras to description
+                if selected_extras:
+                    extras_names = [extra.name for checkbox, extra in extras_checkboxes if checkbox.isChecked()]
+                    order_desc += f"\nExtras: {', '.join(extras_names)}"
+                
+                # Add takeouts to description
+                if selected_takeouts:
+                    takeouts_names = [takeout.name for checkbox, takeout in takeouts_checkboxes if checkbox.isChecked()]
+                    order_desc += f"\nTakeouts: {', '.join(takeouts_names)}"
+                
+                # Create order in database (Order.create runs as one transaction),
+                # through the local queue so it is not lost while offline
+                session_id = self.current_session['id']
+                client_token = self.order_token(session_id, order_items)
+                self.run_db_call('place_order', self.offline_store.place_order,
+                                 session_id, order_items, client_token,
+                                 on_done=lambda sent: self.on_order_placed(order_desc, total_amount, sent,
+                                                                           client_token),
+                                 on_error=self.on_place_order_failed,
+                                 on_late=lambda sent: self.on_order_placed_late(order_desc, total_amount, sent,
+                                                                                client_token),
+                                 loading="Placing your order...")
                     
         except Exception as e:
             self.show_message("Error", f"Failed to show order dialog: {str(e)}", QMessageBox.Critical)
             import traceback
             traceback.print_exc()
 
+    def order_token(self, session_id, items):
+        """
+        Return the client token for an order the customer just confirmed.
+        
+        Retrying an order whose last attempt timed out or failed reuses that
+        attempt's token, so a late first insert and the retry cannot both
+        be charged.
+        """
+        if self.unconfirmed_order is not None:
+            pending_session, pending_items, token = self.unconfirmed_order
+            if pending_session == session_id and pending_items == items:
+                return token
+        token = str(uuid.uuid4())
+        self.unconfirmed_order = (session_id, items, token)
+        return token
+    
+    def forget_order_token(self, client_token):
+        """The order under ``client_token`` reached the server or the local queue."""
+        if self.unconfirmed_order is not None and self.unconfirmed_order[2] == client_token:
+            self.unconfirmed_order = None
+    
+    def on_order_placed_late(self, order_desc, total_amount, sent, client_token):
+        """An order finished after the launcher stopped waiting for it."""
+        self.forget_order_token(client_token)
+        if not sent:
+            # Queued locally; the replay sends it later
+            return
+        self.show_message(
+            "Order Placed",
+            f"Your earlier order went through after all.\n\n"
+            f"{order_desc}\n\n"
+            f"Total: ₹{total_amount:.2f}\n"
+            "You do not need to order it again.",
+            QMessageBox.Information
+        )
+        self.load_user_orders()
+    
+    def on_order_placed(self, order_desc, total_amount, sent=True, client_token=None):
+        self.forget_order_token(client_token)
+        if not sent:
+            self.show_message(
+                "Order Saved",
+                f"{order_desc}\n\n"
+                "The server is not reachable right now. Your order is saved on this PC "
+                "and will be sent to staff as soon as the connection is back.",
+                QMessageBox.Warning
+            )
+            return
+        
+        # Show success message
+        self.show_message(
+            "Order Placed",
+            f"Your order has been placed!\n\n"
+            f"{order_desc}\n\n"
+            f"Total: ₹{total_amount:.2f}\n"
+            "Your order status is now 'pending'. Staff will deliver your order shortly.",
+            QMessageBox.Information
+        )
+        
+        # Refresh orders display
+        self.load_user_orders()
+    
+    def on_place_order_failed(self, error):
+        self.show_message("Error", f"Failed to place order: {str(error)}", QMessageBox.Critical)
+    
     def load_apps(self):
-        """Load apps from the database and display them in the grid."""
-        try:
-            cursor = db.get_cursor()
-            
-            # Check if is_available or is_active column exists
-            cursor.execute("DESCRIBE games")
-            columns = [column['Field'] for column in cursor.fetchall()]
-            
-            # Adapt query based on available columns
-            if 'is_available' in columns:
-                availability_column = 'is_available'
-            elif 'is_active' in columns:
-                availability_column = 'is_active'
-            else:
-                availability_column = None
-            
-            # Build the query based on schema
-            if availability_column:
-                query = f"SELECT * FROM games WHERE category = 'App' AND {availability_column} = TRUE ORDER BY name"
-            else:
-                query = "SELECT * FROM games WHERE category = 'App' ORDER BY name"
-                
-            cursor.execute(query)
-            apps = cursor.fetchall()
-            cursor.close()
-            
-            # Clear existing apps
-            for i in reversed(range(self.apps_layout.count())):
-                widget = self.apps_layout.itemAt(i).widget()
-                if widget:
-                    widget.setParent(None)
-            
-            if apps:
-                # Calculate grid dimensions
-                cols = 5  # Number of columns in the grid
-                for i, app in enumerate(apps):
-                    row = i // cols
-                    col = i % cols
-                    game_card = GameCard(app, self)
-                    self.apps_layout.addWidget(game_card, row, col)
-            else:
-                # No apps found
-                no_apps_label = QLabel("No applications available")
-                no_apps_label.setAlignment(Qt.AlignCenter)
-                no_apps_label.setStyleSheet("color: white; font-size: 16px;")
-                self.apps_layout.addWidget(no_apps_label, 0, 0)
-        except Exception as e:
-            self.show_message("Error", f"Failed to load applications: {str(e)}", QMessageBox.Critical)
-            import traceback
-            traceback.print_exc()
+        """Load apps in the background and display them in the grid."""
+        self.run_db_call('apps', self.fetch_games, True,
+                         on_done=self.app_cards.show_items, on_error=self.on_apps_failed)
+    
+    def on_apps_failed(self, error):
+        self.show_message("Error", f"Failed to load applications: {str(error)}", QMessageBox.Critical)
 
     def show_apps_page(self):
         """Show the apps page and load applications."""
@@ -2879,7 +3357,8 @@ class LauncherMainWindow(QMainWindow):
         """Handle back button from food menu depending on user type."""
         # Check if the user is a walk-in (non-PC) customer
         if self.current_user and isinstance(self.current_user, dict) and self.current_user.get('name') == 'Walk-in Customer':
-            # Non-PC user - go back to pre-login page
+            # Non-PC user - close their session and go back to pre-login page
+            self.end_walk_in_session()
             self.stacked_widget.setCurrentWidget(self.pre_login_page)
         else:
             # PC user - go back to main page
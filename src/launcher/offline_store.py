@@ -0,0 +1,330 @@
+"""
+Local write-ahead queue and session cache for the launcher.
+
+Writes the launcher must not lose (completing a session, placing an order,
+marking the PC occupied or available) are kept in a local SQLite database
+whenever MySQL cannot be reached, and replayed, oldest first, once it
+answers again. Completing a session is recorded before it is even tried,
+since the launcher may be shut down right after; other writes are applied
+directly and only queued on a connection error. Every write is idempotent,
+so replaying one that already reached the server before the connection
+dropped is harmless:
+
+    - session completion only moves an active or paused session whose time
+      has run out (on the server clock) to completed, so a completion
+      replayed after staff extended the session does nothing
+    - PC status writes are keyed by PC, so only the latest one is kept, and a
+      PC is never freed while it has an active or paused session
+    - orders carry a client token that the server refuses to insert twice
+
+The same database keeps a copy of the signed-in user's active session, so a
+database blip while the launcher restarts does not lock the user out.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import mysql.connector
+from PyQt5.QtCore import QStandardPaths
+
+from ..database import db, Order, User, PC, Session, PoolTimeoutError
+from src.utils.db_worker import TaskTimeoutError
+
+
+def is_connection_error(error):
+    """Whether ``error`` means the database could not be reached (as opposed to a bad write)."""
+    return isinstance(error, (TaskTimeoutError, PoolTimeoutError,
+                              mysql.connector.errors.InterfaceError,
+                              mysql.connector.errors.OperationalError))
+
+
+def _default_path():
+    """Return the path of the launcher's local database."""
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.gaming_lounge')
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, 'launcher_offline.sqlite3')
+
+
+class OfflineStore:
+    """
+    SQLite-backed write-ahead queue and active-session cache.
+
+    Safe to use from the GUI thread and the database worker threads.
+    """
+
+    # A write that keeps failing for reasons other than connectivity is
+    # dropped after this many attempts instead of blocking the queue forever
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, path=None):
+        self.path = path or _default_path()
+        self._conn = None
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+
+    def _connection(self):
+        """Open the local database on first use. Caller holds the lock."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS pending_writes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                op_key TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+            """)
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS session_cache (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                login_ids TEXT NOT NULL,
+                data TEXT NOT NULL,
+                ends_at REAL NOT NULL
+            )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # Write-ahead queue
+
+    def enqueue(self, op_key, kind, payload):
+        """
+        Record a write to apply to MySQL.
+
+        A pending write with the same ``op_key`` is replaced and moves to the
+        back of the queue, so only the latest write per key is replayed.
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO pending_writes (op_key, kind, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (op_key, kind, json.dumps(payload, default=str), time.time())
+            )
+            conn.commit()
+
+    def pending_count(self):
+        """Number of writes still waiting for the database."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM pending_writes").fetchone()[0]
+
+    def submit(self, op_key, kind, payload):
+        """
+        Apply a write now, queueing it only if MySQL cannot be reached.
+
+        Returns:
+            bool: True if the write reached MySQL, False if it was queued
+
+        Raises:
+            Exception: Any failure other than a connection error, so the
+                caller can report it instead of claiming the write is queued
+        """
+        try:
+            getattr(self, f"_apply_{kind}")(payload)
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+            self.enqueue(op_key, kind, payload)
+            return False
+        # An older queued write with the same key must not replay over this one
+        self._remove_key(op_key)
+        return True
+
+    def replay(self):
+        """
+        Apply pending writes in order, stopping at the first connection failure.
+
+        Returns:
+            int: The number of writes applied
+        """
+        if not self._replay_lock.acquire(blocking=False):
+            # Another thread is already replaying
+            return 0
+        try:
+            with self._lock:
+                rows = self._connection().execute(
+                    "SELECT id, op_key, kind, payload, attempts FROM pending_writes ORDER BY id"
+                ).fetchall()
+
+            applied = 0
+            for row in rows:
+                try:
+                    apply = getattr(self, f"_apply_{row['kind']}")
+                    apply(json.loads(row['payload']))
+                except Exception as e:
+                    if is_connection_error(e):
+                        break
+                    self._record_failure(row, e)
+                    continue
+                self._remove(row['id'])
+                applied += 1
+            if applied:
+                print(f"Replayed {applied} queued launcher write(s)")
+            return applied
+        finally:
+            self._replay_lock.release()
+
+    def _remove_key(self, op_key):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM pending_writes WHERE op_key = ?", (op_key,))
+            conn.commit()
+
+    def _remove(self, write_id):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM pending_writes WHERE id = ?", (write_id,))
+            conn.commit()
+
+    def _record_failure(self, row, error):
+        attempts = row['attempts'] + 1
+        with self._lock:
+            conn = self._connection()
+            if attempts >= self.MAX_ATTEMPTS:
+                print(f"Dropping queued write {row['op_key']} after {attempts} attempts: {error}")
+                conn.execute("DELETE FROM pending_writes WHERE id = ?", (row['id'],))
+            else:
+                print(f"Error replaying queued write {row['op_key']}: {error}")
+                conn.execute(
+                    "UPDATE pending_writes SET attempts = ?, last_error = ? WHERE id = ?",
+                    (attempts, str(error), row['id'])
+                )
+            conn.commit()
+
+    # Writes the launcher queues
+
+    def complete_session(self, session_id, pc_number):
+        """Queue completing a session and freeing its PC; True if applied now."""
+        if session_id:
+            self.enqueue(f"complete_session:{session_id}", 'complete_session',
+                         {'session_id': session_id})
+        if pc_number:
+            self.enqueue(f"pc_status:{pc_number}", 'pc_status',
+                         {'pc_number': pc_number, 'status': 'available'})
+        self.replay()
+        return self.pending_count() == 0
+
+    def set_pc_status(self, pc_number, status):
+        """Apply a PC status change, queueing it while offline; True if applied now."""
+        return self.submit(f"pc_status:{pc_number}", 'pc_status',
+                           {'pc_number': pc_number, 'status': status})
+
+    def place_order(self, session_id, items, client_token):
+        """
+        Place an order, queueing it while offline; True if placed now.
+
+        ``client_token`` is chosen once per order by the caller, so retrying
+        after a timeout can never insert the order twice. The time it was
+        placed travels with it, so a replayed order keeps its original time.
+        """
+        return self.submit(f"order:{client_token}", 'order',
+                           {'session_id': session_id, 'items': items, 'client_token': client_token,
+                            'ordered_at': time.time()})
+
+    @staticmethod
+    def _apply_complete_session(payload):
+        with db.transaction() as cursor:
+            cursor.execute(f"""
+                UPDATE sessions
+                SET paused_seconds_total = paused_seconds_total + COALESCE(TIMESTAMPDIFF(SECOND, paused_at, NOW()), 0),
+                    paused_at = NULL,
+                    status = 'completed'
+                WHERE id = %s AND status IN ('active', 'paused')
+                AND {Session.remaining_seconds_sql()} <= 0
+            """, (payload['session_id'],))
+
+    @staticmethod
+    def _apply_pc_status(payload):
+        with db.transaction() as cursor:
+            if payload['status'] == 'available':
+                # A late replay must not free a PC someone has since signed in to
+                cursor.execute("""
+                    UPDATE pcs SET is_occupied = FALSE, status = 'available'
+                    WHERE pc_number = %s AND NOT EXISTS (
+                        SELECT 1 FROM sessions s WHERE s.pc_id = pcs.id AND s.status IN ('active', 'paused')
+                    )
+                """, (payload['pc_number'],))
+            else:
+                cursor.execute(
+                    "UPDATE pcs SET status = %s, is_occupied = %s WHERE pc_number = %s",
+                    (payload['status'], payload['status'] == 'occupied', payload['pc_number'])
+                )
+
+    @staticmethod
+    def _apply_order(payload):
+        ordered_at = payload.get('ordered_at')
+        Order.create(payload['session_id'], payload['items'], client_token=payload['client_token'],
+                     order_time=datetime.fromtimestamp(ordered_at) if ordered_at else None)
+
+    # Active session cache
+
+    def save_session(self, user, pc, session, remaining_seconds):
+        """Remember the signed-in user's session so they can sign in again while offline."""
+        login_ids = [value for value in (user.civil_id, user.phone) if value]
+        data = {
+            'user': {'id': user.id, 'name': user.name, 'civil_id': user.civil_id, 'phone': user.phone},
+            'pc': {'id': pc.id, 'pc_number': pc.pc_number},
+            'session': session,
+        }
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO session_cache (id, login_ids, data, ends_at) VALUES (1, ?, ?, ?)",
+                (json.dumps(login_ids), json.dumps(data, default=str), time.time() + remaining_seconds)
+            )
+            conn.commit()
+
+    def clear_session(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM session_cache")
+            conn.commit()
+
+    def cached_login(self, login_id):
+        """
+        Rebuild a login result from the cached session.
+
+        Returns:
+            dict: Shaped like LauncherMainWindow.fetch_login's result, or None
+                when ``login_id`` has no unexpired cached session
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT login_ids, data, ends_at FROM session_cache WHERE id = 1").fetchone()
+        if row is None or login_id not in json.loads(row['login_ids']):
+            return None
+        remaining = int(row['ends_at'] - time.time())
+        if remaining <= 0:
+            return None
+
+        data = json.loads(row['data'])
+        return {
+            'user': User(**data['user']),
+            'pc': PC(**data['pc']),
+            'session': data['session'],
+            'countdown': {'status': 'active', 'remaining_seconds': remaining},
+            'menu': None,
+        }
+
+
+_offline_store = None
+
+
+def get_offline_store():
+    """Return the launcher's offline store, creating it on first use."""
+    global _offline_store
+    if _offline_store is None:
+        _offline_store = OfflineStore()
+    return _offline_store
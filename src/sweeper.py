@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Headless session expiry sweeper.
+
+Completes sessions whose end time has passed and frees their PCs, so PCs
+whose launcher crashed or was powered off do not stay occupied forever.
+Each sweep is one set-based update (see Session.expire_overdue). Once an
+hour it also rebuilds the recent daily_stats rows from the raw tables (see
+DailyStats.catch_up). Run a single sweeper per database, for example on the
+server:
+
+    python -m src.sweeper                 # sweep every 5 seconds
+    python -m src.sweeper --interval 10
+    python -m src.sweeper --once          # one sweep, e.g. from cron
+"""
+import argparse
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from src.database import db, Session, DailyStats
+
+# Load environment variables
+load_dotenv()
+
+
+class ExpirySweeper:
+    """Runs Session.expire_overdue on a fixed interval and keeps reap metrics."""
+
+    # Print a metrics summary this often even when nothing was reaped (seconds)
+    REPORT_EVERY = 300
+    # Rebuild the recent daily_stats rows this often (seconds)
+    CATCH_UP_EVERY = 3600
+
+    def __init__(self, interval=5):
+        self.interval = interval
+        self.metrics = {
+            'sweeps': 0,
+            'reaped_total': 0,
+            'last_reaped': 0,
+            'last_sweep_ms': 0.0,
+            'max_sweep_ms': 0.0,
+            'errors': 0,
+        }
+        self._last_report = time.monotonic()
+        self._last_catch_up = None
+
+    def catch_up_stats(self):
+        """Rebuild the recent daily_stats rows, at most once per CATCH_UP_EVERY."""
+        now = time.monotonic()
+        if self._last_catch_up is not None and now - self._last_catch_up < self.CATCH_UP_EVERY:
+            return
+        self._last_catch_up = now
+        try:
+            DailyStats.catch_up()
+        except Exception as e:
+            self.metrics['errors'] += 1
+            print(f"Error catching up daily stats: {str(e)}")
+        finally:
+            db.release()
+
+    def sweep(self):
+        """Run one sweep and update the metrics."""
+        started = time.monotonic()
+        try:
+            reaped = Session.expire_overdue()
+        except Exception as e:
+            self.metrics['errors'] += 1
+            print(f"Error sweeping expired sessions: {str(e)}")
+            return 0
+        finally:
+            # Do not hold a pooled connection between sweeps
+            db.release()
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.metrics['sweeps'] += 1
+        self.metrics['reaped_total'] += reaped
+        self.metrics['last_reaped'] = reaped
+        self.metrics['last_sweep_ms'] = elapsed_ms
+        self.metrics['max_sweep_ms'] = max(self.metrics['max_sweep_ms'], elapsed_ms)
+        if reaped:
+            print(f"Completed {reaped} expired session(s) in {elapsed_ms:.1f} ms")
+        return reaped
+
+    def report(self):
+        """Print the metrics collected so far."""
+        m = self.metrics
+        print(f"Sweeper: {m['sweeps']} sweeps, {m['reaped_total']} sessions reaped, "
+              f"last {m['last_sweep_ms']:.1f} ms, max {m['max_sweep_ms']:.1f} ms, "
+              f"{m['errors']} errors")
+        self._last_report = time.monotonic()
+
+    def run_forever(self):
+        """Sweep every ``interval`` seconds until interrupted."""
+        print(f"Session expiry sweeper started (every {self.interval} s)")
+        next_sweep = time.monotonic()
+        try:
+            while True:
+                self.sweep()
+                self.catch_up_stats()
+                if time.monotonic() - self._last_report >= self.REPORT_EVERY:
+                    self.report()
+                # Keep a steady cadence regardless of how long a sweep took
+                next_sweep += self.interval
+                time.sleep(max(0, next_sweep - time.monotonic()))
+        except KeyboardInterrupt:
+            self.report()
+        finally:
+            db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Complete expired gaming sessions and free their PCs')
+    parser.add_argument('--interval', type=float, default=5, help='Seconds between sweeps (default 5)')
+    parser.add_argument('--once', action='store_true', help='Run a single sweep and exit')
+    args = parser.parse_args()
+
+    sweeper = ExpirySweeper(args.interval)
+    if args.once:
+        sweeper.sweep()
+        sweeper.catch_up_stats()
+        sweeper.report()
+        db.close()
+        return 0 if sweeper.metrics['errors'] == 0 else 1
+    sweeper.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
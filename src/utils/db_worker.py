@@ -0,0 +1,165 @@
+"""
+Database calls off the GUI thread.
+
+A slow or unreachable MySQL server must never freeze the fullscreen
+launcher, so its queries run on a small QThreadPool and report back to the
+GUI thread through signals. Every call can time out and be cancelled; in
+both cases its result is dropped when it eventually arrives, since a
+statement already sent to the server cannot be taken back. Calls whose
+function writes can pass ``on_late`` to undo a result nobody is waiting for.
+"""
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from src.database import db
+
+
+class TaskTimeoutError(Exception):
+    """Raised (passed to on_error) when a database call takes longer than its timeout."""
+
+
+class _TaskSignals(QObject):
+    """Signals of a database task; QRunnable itself cannot emit signals."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class _DbTask(QRunnable):
+    """Run one function on a pool thread."""
+
+    def __init__(self, fn, args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            # Pool threads are reused; hand the connection back between calls
+            db.release()
+
+
+class DbCall(QObject):
+    """A submitted database call, which can be cancelled until it reports back."""
+
+    def __init__(self, worker, task, on_done, on_error, timeout, on_late=None):
+        super().__init__()
+        self.worker = worker
+        self.task = task
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_late = on_late
+        self.done = False
+
+        task.signals.finished.connect(self._finished)
+        task.signals.failed.connect(self._failed)
+
+        self.timer = None
+        if timeout:
+            self.timer = QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self._timed_out)
+            self.timer.start(int(timeout * 1000))
+
+    def is_active(self):
+        """Whether the call is still waiting for its result."""
+        return not self.done
+
+    def cancel(self):
+        """Drop the call: it is taken off the queue if not started, and its result ignored."""
+        if self.done:
+            return
+        if self.worker._pool.tryTake(self.task):
+            # Never started, so it will never report back
+            self.worker._calls.discard(self)
+        self._close()
+
+    def _close(self):
+        self.done = True
+        if self.timer is not None:
+            self.timer.stop()
+
+    def _finished(self, result):
+        self.worker._calls.discard(self)
+        if self.done:
+            # Cancelled or timed out, but the function still ran to completion
+            if self.on_late is not None:
+                self.on_late(result)
+            return
+        self._close()
+        if self.on_done is not None:
+            self.on_done(result)
+
+    def _failed(self, error):
+        self.worker._calls.discard(self)
+        if self.done:
+            return
+        self._close()
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def _timed_out(self):
+        if self.done:
+            return
+        self.cancel()
+        if self.on_error is not None:
+            self.on_error(TaskTimeoutError("The server did not respond in time"))
+
+
+class DbWorker(QObject):
+    """
+    Runs database functions on worker threads.
+
+    Usage:
+        get_db_worker().run(User.get_by_phone, phone,
+                            on_done=self.on_user_loaded, on_error=self.on_load_failed)
+
+    ``on_done`` receives the function's return value and ``on_error`` the
+    exception (TaskTimeoutError on timeout), both on the GUI thread.
+    ``on_late`` receives the return value of a call that completed after it
+    was cancelled or timed out. The function itself must not touch any
+    widget.
+    """
+
+    DEFAULT_TIMEOUT = 15
+
+    def __init__(self, max_threads=2):
+        super().__init__()
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads)
+        self._calls = set()
+
+    def run(self, fn, *args, on_done=None, on_error=None, on_late=None, timeout=DEFAULT_TIMEOUT):
+        """
+        Call ``fn(*args)`` on a worker thread.
+
+        Returns:
+            DbCall: Handle to cancel the call or check whether it is pending
+        """
+        task = _DbTask(fn, args)
+        call = DbCall(self, task, on_done, on_error, timeout, on_late)
+        # Keep the call (and its task) alive until the task reports back,
+        # even when the call was cancelled or timed out meanwhile
+        self._calls.add(call)
+        self._pool.start(task)
+        return call
+
+
+_db_worker = None
+
+
+def get_db_worker():
+    """Return the process-wide database worker, creating it on first use."""
+    global _db_worker
+    if _db_worker is None:
+        _db_worker = DbWorker()
+    return _db_worker
@@ -1,11 +1,12 @@
 import os
 import bcrypt
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 # Import PyQt5 modules for the background image functionality
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPalette, QBrush, QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 def hash_password(password):
     """Hash a password for storing."""
@@ -50,6 +51,31 @@ def calculate_time_left(end_time):
     delta = end_time - now
     return int(delta.total_seconds() // 60)
 
+def day_range(start_date, end_date=None):
+    """
+    Convert an inclusive range of days into half-open datetime bounds.
+    
+    Filtering with ``col >= start AND col < end`` lets MySQL use an index on
+    ``col``, unlike ``DATE(col) BETWEEN start_date AND end_date``.
+    
+    Args:
+        start_date (date or str): First day of the range (ISO string accepted)
+        end_date (date or str, optional): Last day of the range, defaults to start_date
+        
+    Returns:
+        tuple: (start datetime, exclusive end datetime)
+    """
+    if end_date is None:
+        end_date = start_date
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+    
+    start = datetime.combine(start_date, datetime.min.time())
+    end = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
+    return start, end
+
 def format_time_left(end_time):
     """Format time left as a string."""
     minutes_left = calculate_time_left(end_time)
@@ -112,41 +138,70 @@ def resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
+# Decoded background image and its scaled copies, shared by every window
+_background_pixmap = None
+_scaled_backgrounds = OrderedDict()
+_SCALED_BACKGROUND_LIMIT = 4
+_BACKGROUND_RESIZE_DELAY_MS = 150
+
+def _background_pixmap_for_size(size):
+    """Return bg.jpg scaled to cover ``size``, scaling at most once per size."""
+    global _background_pixmap
+    key = (size.width(), size.height())
+    if key in _scaled_backgrounds:
+        _scaled_backgrounds.move_to_end(key)
+        return _scaled_backgrounds[key]
+    
+    if _background_pixmap is None:
+        root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+        bg_path = os.path.join(root_dir, 'src', 'assets', 'bg.jpg')
+        _background_pixmap = QPixmap(bg_path)
+        print(f"Background image loaded from: {bg_path}")
+    
+    scaled = _background_pixmap.scaled(
+        size,
+        Qt.KeepAspectRatioByExpanding,
+        Qt.SmoothTransformation
+    )
+    _scaled_backgrounds[key] = scaled
+    while len(_scaled_backgrounds) > _SCALED_BACKGROUND_LIMIT:
+        _scaled_backgrounds.popitem(last=False)
+    return scaled
+
+def _apply_background(widget):
+    palette = widget.palette()
+    palette.setBrush(QPalette.Background, QBrush(_background_pixmap_for_size(widget.size())))
+    widget.setPalette(palette)
+
 def set_background_image(widget):
     """
     Set the background image for a widget using bg.jpg from assets folder.
     
+    The image is decoded once per process and each scaled copy is cached by
+    size. While a widget is being resized the previous background stays in
+    place; it is rescaled once the size has settled.
+    
     Args:
         widget (QWidget): The widget to set the background for
     """
     try:
-        # Get the absolute path to the background image
-        root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
-        bg_path = os.path.join(root_dir, 'src', 'assets', 'bg.jpg')
-        
-        # Create a pixmap from the background image file
-        bg_pixmap = QPixmap(bg_path)
-        
-        # Set the background image using QPalette
-        palette = QPalette()
-        palette.setBrush(QPalette.Background, QBrush(bg_pixmap.scaled(
-            widget.size(),
-            Qt.KeepAspectRatioByExpanding,
-            Qt.SmoothTransformation
-        )))
         widget.setAutoFillBackground(True)
-        widget.setPalette(palette)
+        _apply_background(widget)
+        
+        # Rescale only after resizing settles
+        resize_timer = QTimer(widget)
+        resize_timer.setSingleShot(True)
+        resize_timer.setInterval(_BACKGROUND_RESIZE_DELAY_MS)
+        resize_timer.timeout.connect(lambda: _apply_background(widget))
+        widget.background_resize_timer = resize_timer
         
         # Add resize event handler to ensure background stays properly scaled
         def resize_event_handler(event):
-            new_pixmap = bg_pixmap.scaled(
-                widget.size(),
-                Qt.KeepAspectRatioByExpanding,
-                Qt.SmoothTransformation
-            )
-            new_palette = widget.palette()
-            new_palette.setBrush(QPalette.Background, QBrush(new_pixmap))
-            widget.setPalette(new_palette)
+            size = widget.size()
+            if (size.width(), size.height()) in _scaled_backgrounds:
+                _apply_background(widget)
+            else:
+                resize_timer.start()
             
             # Call original resize event if it exists
             if hasattr(widget, 'original_resize_event'):
@@ -159,9 +214,6 @@ def set_background_image(widget):
         # Set our custom resize event
         widget.resizeEvent = resize_event_handler
         
-        # Print a debug message
-        print(f"Background image set from: {bg_path}")
-        
         return True
     except Exception as e:
         print(f"Error setting background image: {e}")
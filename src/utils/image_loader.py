@@ -0,0 +1,185 @@
+"""
+Background loading of card thumbnails.
+
+Decoding and smooth-scaling full-size cover art on the GUI thread makes
+pages stutter, so images are decoded to QImage and scaled on a QThreadPool
+worker, then handed back to the GUI thread through a signal. Results are
+kept in an in-memory LRU of QPixmaps and in an on-disk thumbnail cache keyed
+by the source path, its modification time and size, and the target size, so
+repeat page opens never touch the original file.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QStandardPaths, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+
+def _thumbnail_dir():
+    """Return the directory that holds the on-disk thumbnail cache."""
+    base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache', 'gaming_lounge')
+    path = os.path.join(base, 'thumbnails')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class _LoaderSignals(QObject):
+    """Signals of a load task; QRunnable itself cannot emit signals."""
+    loaded = pyqtSignal(str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    """Decode and scale one image, reusing the on-disk thumbnail when present."""
+
+    def __init__(self, key, source_path, thumbnail_path, width, height):
+        super().__init__()
+        self.key = key
+        self.source_path = source_path
+        self.thumbnail_path = thumbnail_path
+        self.width = width
+        self.height = height
+        self.signals = _LoaderSignals()
+
+    def run(self):
+        image = QImage()
+        if os.path.exists(self.thumbnail_path):
+            image.load(self.thumbnail_path)
+
+        if image.isNull():
+            source = QImage(self.source_path)
+            if not source.isNull():
+                image = source.scaled(self.width, self.height,
+                                      Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                try:
+                    image.save(self.thumbnail_path, 'PNG')
+                except Exception as e:
+                    print(f"Error saving thumbnail for {self.source_path}: {e}")
+
+        self.signals.loaded.emit(self.key, image)
+
+
+class ImageLoader(QObject):
+    """
+    Loads scaled images off the GUI thread and caches them.
+
+    Usage:
+        get_image_loader().request(path, 120, 120, label.setPixmap)
+
+    The callback runs on the GUI thread with a QPixmap, immediately when the
+    thumbnail is already in memory, otherwise once a worker has produced it.
+    If the image cannot be decoded, the optional ``on_failed`` callback runs
+    instead. Callbacks whose widget has been deleted in the meantime are
+    skipped.
+    """
+
+    def __init__(self, max_entries=256):
+        super().__init__()
+        self.max_entries = max_entries
+        self._pixmaps = OrderedDict()
+        self._pending = {}
+        self._tasks = {}
+        self._pool = QThreadPool.globalInstance()
+        self._thumbnail_dir = None
+
+    def request(self, path, width, height, callback, on_failed=None):
+        """
+        Ask for ``path`` scaled to fit ``width`` x ``height``.
+
+        Returns:
+            bool: False if the file does not exist (neither callback runs)
+        """
+        key = self._key(path, width, height)
+        if key is None:
+            return False
+
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            self._deliver(callback, pixmap)
+            return True
+
+        self._pending.setdefault(key, []).append((callback, on_failed))
+        if key not in self._tasks:
+            if self._thumbnail_dir is None:
+                self._thumbnail_dir = _thumbnail_dir()
+            name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png'
+            task = _ThumbnailTask(key, path, os.path.join(self._thumbnail_dir, name),
+                                  width, height)
+            task.signals.loaded.connect(self._on_loaded)
+            # Keep the task (and its signals object) alive until it reports back
+            self._tasks[key] = task
+            self._pool.start(task)
+        return True
+
+    def cached(self, path, width, height):
+        """Return the in-memory thumbnail for ``path`` at this size, or None."""
+        key = self._key(path, width, height)
+        return self.lookup(key) if key is not None else None
+
+    def lookup(self, key):
+        """
+        Return the in-memory thumbnail stored under ``key``, or None.
+
+        Unlike cached(), this never touches the file system, so it is cheap
+        enough to call on every paint once the caller has kept the key.
+        """
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def key(self, path, width, height):
+        """Cache key of ``path`` at this size, or None if the file does not exist."""
+        return self._key(path, width, height)
+
+    def clear(self):
+        """Drop every in-memory thumbnail."""
+        self._pixmaps.clear()
+
+    def _on_loaded(self, key, image):
+        self._tasks.pop(key, None)
+        callbacks = self._pending.pop(key, [])
+        if image.isNull():
+            for _, on_failed in callbacks:
+                if on_failed is not None:
+                    self._deliver(on_failed, None)
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+
+        for callback, _ in callbacks:
+            self._deliver(callback, pixmap)
+
+    @staticmethod
+    def _key(path, width, height):
+        """Cache key of ``path`` at this size, or None if the file does not exist."""
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        return f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+
+    @staticmethod
+    def _deliver(callback, pixmap):
+        try:
+            callback(pixmap)
+        except RuntimeError:
+            # The receiving widget was deleted before the image arrived
+            pass
+
+
+_image_loader = None
+
+
+def get_image_loader():
+    """Return the process-wide image loader, creating it on first use."""
+    global _image_loader
+    if _image_loader is None:
+        _image_loader = ImageLoader()
+    return _image_loader
@@ -3,8 +3,12 @@
 Run database update scripts
 """
 from src.database.update_users_table import update_users_table
+from src.database.migrations import run_migrations
+from src.database.models import DailyStats
 
 if __name__ == "__main__":
     print("Running database updates...")
     update_users_table()
+    if run_migrations():
+        DailyStats.catch_up()
     print("Database updates completed.") 
\ No newline at end of file